@@ -204,6 +204,28 @@ INTER_EXCHANGES_BEGIN_OBSOLETE_MINUTES: int = 2  # The time in minutes since the
 ALLOWED_PERCENTAGE: int = int(os.getenv('ALLOWED_PERCENTAGE', '0'))  # The maximum margin percentage above which data is considered invalid. (Due to an error in the crypto exchange data)
 MINIMUM_PERCENTAGE: int = int(os.getenv('MINIMUM_PERCENTAGE', '-3'))
 COUNTRIES_NEAR_SERVER: List[str] = os.getenv('COUNTRIES_NEAR_SERVER', '0').split()
+CALCULATING_ENGINE: str = os.getenv('CALCULATING_ENGINE', 'loop')  # The way the transaction chains are enumerated during a full update: loop, vectorized or graph.
+CALCULATING_BEST_CHAINS: int = int(os.getenv('CALCULATING_BEST_CHAINS', '100'))  # The number of best chains for each pair of banks kept by the graph engine.
+UNIFIED_CALCULATING: bool = os.getenv('UNIFIED_CALCULATING', 'False') == 'True'  # If True, all chains of a crypto exchange are calculated in one task with a shared snapshot of the rates.
+CALCULATING_PROCESSES: int = int(os.getenv('CALCULATING_PROCESSES', '1'))  # The number of processes among which the output banks of a full update are sharded. 1 means serial calculation.
+PARSING_ASYNC_REQUESTS: bool = os.getenv('PARSING_ASYNC_REQUESTS', 'False') == 'True'  # If True, the parsers send all requests of a run concurrently with asyncio.
+PARSING_CONCURRENT_REQUESTS: int = int(os.getenv('PARSING_CONCURRENT_REQUESTS', '8'))  # The maximum number of simultaneous requests of a parser to one endpoint in the async mode.
+PARSING_REQUESTS_PER_SECOND: float = float(os.getenv('PARSING_REQUESTS_PER_SECOND', '10'))  # The maximum rate of requests to one API host, shared by all workers through Redis.
+PARSING_MAX_WORKERS: int = int(os.getenv('PARSING_MAX_WORKERS', '1'))  # The number of threads, each with its own connection, among which the requests of a parser run are spread. 1 means sequential requests.
+PARSING_POOL_MAXSIZE: int = int(os.getenv('PARSING_POOL_MAXSIZE', '10'))  # The maximum number of keep-alive connections of a parsing session to one host.
+TOR_POOL_SIZE: int = int(os.getenv('TOR_POOL_SIZE', '3'))  # The number of warm isolated Tor circuits kept by each TorPool connection.
+TOR_POOL_WARMUP_URL: str = os.getenv('TOR_POOL_WARMUP_URL', 'https://check.torproject.org/api/ip')  # The URL requested through a new Tor circuit to build it before it is used.
+PROXY_POOL_CANDIDATES: List[str] = os.getenv('PROXY_POOL_CANDIDATES', '').split()  # The proxies (host:port) probed by the proxy pool instead of the free proxy lists.
+PROXY_POOL_PROBE_URL: str = os.getenv('PROXY_POOL_PROBE_URL', 'https://www.google.com')  # The URL requested through a proxy to probe it.
+PROXY_POOL_REFRESH_INTERVAL: int = int(os.getenv('PROXY_POOL_REFRESH_INTERVAL', '300'))  # The interval in seconds at which the proxy pool refreshes and probes the proxies.
+PROXY_POOL_MAX_FAILURES: int = int(os.getenv('PROXY_POOL_MAX_FAILURES', '3'))  # The number of failures in a row after which a proxy is evicted from the pool.
+PARSING_COOKIES_TTL: int = int(os.getenv('PARSING_COOKIES_TTL', '1800'))  # The time in seconds for which the cookies obtained from an endpoint are reused, unless they expire earlier.
+PARSING_SHARED_COOKIES: bool = os.getenv('PARSING_SHARED_COOKIES', 'False') == 'True'  # If True, the cookies obtained from the endpoints are also stored in the cache, so that all workers reuse them.
+CRYPTO_EXCHANGES_BATCH_PRICES: bool = os.getenv('CRYPTO_EXCHANGES_BATCH_PRICES', 'False') == 'True'  # If True, the intra crypto exchange parsers fetch the prices of all symbols in one request instead of one request per symbol.
+P2P_MULTI_BANK_REQUESTS: bool = os.getenv('P2P_MULTI_BANK_REQUESTS', 'False') == 'True'  # If True, the Binance P2P rates of all banks are parsed in one task with requests for several payment methods at once.
+STREAM_FLUSH_INTERVAL: float = float(os.getenv('STREAM_FLUSH_INTERVAL', '1.5'))  # The interval in seconds at which the price streams write the changed prices to the database.
+STREAM_FULL_FLUSH_INTERVAL: int = int(os.getenv('STREAM_FULL_FLUSH_INTERVAL', '60'))  # The interval in seconds at which the price streams write all prices, so that the unchanged ones do not become out of date.
+PRICE_STREAMS: bool = os.getenv('PRICE_STREAMS', 'False') == 'True'  # If True, the intra crypto exchange rates of the crypto exchanges with a stream endpoint are written by the price-stream service instead of the polling tasks.
 
 # Update frequency
 UPDATE_RATE: tuple[int] = tuple(map(int, os.getenv('UPDATE_RATE', '0').replace(',', '').split()))  # Update frequency schedule.
@@ -239,6 +261,8 @@ API_BINANCE_LIST_FIAT_SELL: str = os.getenv('API_BINANCE_LIST_FIAT_SELL', '')
 API_BINANCE_LIST_FIAT_BUY: str = os.getenv('API_BINANCE_LIST_FIAT_BUY', '')
 API_BINANCE_CRYPTO: str = os.getenv('API_BINANCE_CRYPTO', '')
 API_BYBIT_CRYPTO: str = os.getenv('API_BYBIT_CRYPTO', '')
+STREAM_BINANCE_CRYPTO: str = os.getenv('STREAM_BINANCE_CRYPTO', '')
+STREAM_BYBIT_CRYPTO: str = os.getenv('STREAM_BYBIT_CRYPTO', '')
 API_WISE: str = os.getenv('API_WISE', '')
 API_RAIFFEISEN: str = os.getenv('API_RAIFFEISEN', '')
 API_TINKOFF: str = os.getenv('API_TINKOFF', '')
@@ -295,56 +319,75 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': timedelta(seconds=random.randint(45, 50)),
         'options': {'queue': 'calculating'}
     },
-    'get_simpl_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_simpl_inter_exchanges_calculating',
-        'schedule': timedelta(seconds=random.randint(20, 25)),
-        'options': {'queue': 'calculating'},
-        'args': (False,),
-    },
-    'get_simpl_international_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_simpl_international_inter_exchanges_calculating',
-        'schedule': timedelta(seconds=random.randint(20, 25)),
-        'options': {'queue': 'calculating'},
-        'args': (False,),
-    },
-    'get_complex_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_complex_inter_exchanges_calculating',
-        'schedule': timedelta(seconds=random.randint(30, 35)),
-        'options': {'queue': 'calculating'},
-        'args': (False,),
-    },
-    'get_complex_international_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_complex_international_inter_exchanges_calculating',
-        'schedule': timedelta(seconds=random.randint(30, 35)),
-        'options': {'queue': 'calculating'},
-        'args': (False,),
-    },
-    'get_simpl_full_update_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_simpl_inter_exchanges_calculating',
-        'schedule': timedelta(minutes=random.randint(10, 15)),
-        'options': {'queue': 'calculating'},
-        'args': (True,),
-    },
-    'get_simpl_full_update_international_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_simpl_international_inter_exchanges_calculating',
-        'schedule': timedelta(minutes=random.randint(10, 15)),
-        'options': {'queue': 'calculating'},
-        'args': (True,),
-    },
-    'get_complex_full_update_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_complex_inter_exchanges_calculating',
-        'schedule': timedelta(minutes=random.randint(15, 20)),
-        'options': {'queue': 'calculating'},
-        'args': (True,),
-    },
-    'get_complex_full_update_international_inter_exchanges_calculating': {
-        'task': 'core.tasks.get_complex_international_inter_exchanges_calculating',
-        'schedule': timedelta(minutes=random.randint(15, 20)),
-        'options': {'queue': 'calculating'},
-        'args': (True,),
-    },
 }
 
+if UNIFIED_CALCULATING:
+    CELERY_BEAT_SCHEDULE.update({
+        'get_crypto_exchanges_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_crypto_exchanges_inter_exchanges_calculating',
+            'schedule': timedelta(seconds=random.randint(20, 25)),
+            'options': {'queue': 'calculating'},
+            'args': (False,),
+        },
+        'get_crypto_exchanges_full_update_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_crypto_exchanges_inter_exchanges_calculating',
+            'schedule': timedelta(minutes=random.randint(10, 15)),
+            'options': {'queue': 'calculating'},
+            'args': (True,),
+        },
+    })
+else:
+    CELERY_BEAT_SCHEDULE.update({
+        'get_simpl_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_simpl_inter_exchanges_calculating',
+            'schedule': timedelta(seconds=random.randint(20, 25)),
+            'options': {'queue': 'calculating'},
+            'args': (False,),
+        },
+        'get_simpl_international_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_simpl_international_inter_exchanges_calculating',
+            'schedule': timedelta(seconds=random.randint(20, 25)),
+            'options': {'queue': 'calculating'},
+            'args': (False,),
+        },
+        'get_complex_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_complex_inter_exchanges_calculating',
+            'schedule': timedelta(seconds=random.randint(30, 35)),
+            'options': {'queue': 'calculating'},
+            'args': (False,),
+        },
+        'get_complex_international_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_complex_international_inter_exchanges_calculating',
+            'schedule': timedelta(seconds=random.randint(30, 35)),
+            'options': {'queue': 'calculating'},
+            'args': (False,),
+        },
+        'get_simpl_full_update_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_simpl_inter_exchanges_calculating',
+            'schedule': timedelta(minutes=random.randint(10, 15)),
+            'options': {'queue': 'calculating'},
+            'args': (True,),
+        },
+        'get_simpl_full_update_international_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_simpl_international_inter_exchanges_calculating',
+            'schedule': timedelta(minutes=random.randint(10, 15)),
+            'options': {'queue': 'calculating'},
+            'args': (True,),
+        },
+        'get_complex_full_update_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_complex_inter_exchanges_calculating',
+            'schedule': timedelta(minutes=random.randint(15, 20)),
+            'options': {'queue': 'calculating'},
+            'args': (True,),
+        },
+        'get_complex_full_update_international_inter_exchanges_calculating': {
+            'task': 'core.tasks.get_complex_international_inter_exchanges_calculating',
+            'schedule': timedelta(minutes=random.randint(15, 20)),
+            'options': {'queue': 'calculating'},
+            'args': (True,),
+        },
+    })
+
 # Tell select2 which cache configuration to use:
 
 CACHES = {
@@ -56,8 +56,7 @@ class RaiffeisenParser(BankParser):
         if not values:
             return
         for value_dict in values:
-            price = value_dict.pop('price')
-            self._add_to_bulk_update_or_create(value_dict, price)
+            self._add_rate(value_dict)
 
 
 class RaiffeisenBinanceP2PParser(BinanceP2PParser):
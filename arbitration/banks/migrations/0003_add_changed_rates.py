@@ -0,0 +1,18 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banks', '0002_add_bybit_crypto_exchange'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banksexchangeratesupdates',
+            name='changed_rates',
+            field=models.JSONField(default=list),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:19
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.utils.timezone
+
+
+def copy_update_date_to_updated_at(apps, schema_editor):
+    rates_updates = apps.get_model('banks', 'BanksExchangeRatesUpdates')
+    apps.get_model('banks', 'BanksExchangeRates').objects.update(
+        updated_at=Subquery(rates_updates.objects.filter(
+            pk=OuterRef('update')).values('updated')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banks', '0003_add_changed_rates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banksexchangerates',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Update date'),
+        ),
+        migrations.RunPython(
+            copy_update_date_to_updated_at, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='banksexchangerates',
+            index=models.Index(fields=['updated_at'], name='bank_exchange_rates_fresh'),
+        ),
+    ]
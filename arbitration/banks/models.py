@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from arbitration.settings import FIAT_LENGTH, NAME_LENGTH
 from core.models import UpdatesModel
@@ -34,7 +35,8 @@ class CurrencyMarkets(models.Model):
 
 class BanksExchangeRatesUpdates(UpdatesModel):
     """
-    Model to represent the last update time for bank exchange rates.
+    Model to represent the last update time for bank exchange rates and the
+    ids of the rates whose price has changed in the update.
     """
     bank = models.ForeignKey(
         Banks,
@@ -50,6 +52,7 @@ class BanksExchangeRatesUpdates(UpdatesModel):
         null=True,
         on_delete=models.CASCADE
     )
+    changed_rates = models.JSONField(default=list)
 
 
 class BanksExchangeRates(models.Model):
@@ -76,6 +79,10 @@ class BanksExchangeRates(models.Model):
         related_name='datas',
         on_delete=models.CASCADE
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Update date',
+        default=timezone.now
+    )
 
     class Meta:
         constraints = [
@@ -86,3 +93,8 @@ class BanksExchangeRates(models.Model):
                 name='unique_bank_exchanges'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('updated_at',), name='bank_exchange_rates_fresh'
+            )
+        ]
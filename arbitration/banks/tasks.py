@@ -25,6 +25,15 @@ from banks.banks_registration.yoomoney import (YoomoneyBinanceP2PParser,
                                                YoomoneyBybitP2PParser)
 from banks.currency_markets_registration.tinkoff_invest import (
     TinkoffCurrencyMarketParser)
+from crypto_exchanges.crypto_exchanges_registration.binance import (
+    BinanceMultiBankP2PParser)
+
+BINANCE_P2P_PARSERS = (
+    TinkoffBinanceP2PParser, SberbankBinanceP2PParser,
+    RaiffeisenBinanceP2PParser, QIWIBinanceP2PParser,
+    YoomoneyBinanceP2PParser, BOGBinanceP2PParser, TBCBinanceP2PParser,
+    CredoBinanceP2PParser, WiseBinanceP2PParser
+)
 
 
 # Banks internal rates
@@ -69,6 +78,19 @@ def parse_internal_wise_rates(self):
 
 # Banks P2P rates
 # Binance
+@app.task(
+    bind=True, max_retries=None, queue='parsing', autoretry_for=(Exception,),
+    retry_backoff=True
+)
+def get_all_p2p_binance_exchanges(self):
+    BinanceMultiBankP2PParser(BINANCE_P2P_PARSERS).main()
+    self.retry(
+        countdown=P2P_BINANCE_UPDATE_FREQUENCY * UPDATE_RATE[
+            datetime.now(timezone.utc).hour
+        ]
+    )
+
+
 @app.task(
     bind=True, max_retries=None, queue='parsing', autoretry_for=(Exception,),
     retry_backoff=True
@@ -8,7 +8,7 @@ from rest_framework.response import Response
 from arbitration.settings import INTER_EXCHANGES_OBSOLETE_IN_MINUTES
 from core.filters import ExchangesFilter
 from core.serializers import InterExchangesSerializer
-from crypto_exchanges.models import InterExchanges
+from crypto_exchanges.models import InterExchanges, InterExchangesUpdates
 
 
 class InterExchangesAPIView(ListAPIView, FilterView):
@@ -32,8 +32,8 @@ class InterExchangesAPIView(ListAPIView, FilterView):
             'interim_crypto_exchange', 'second_interim_crypto_exchange',
             'update'
         ).filter(
-            update__updated__gte=(
-                datetime.now(timezone.utc) - timedelta(
+            update__in=InterExchangesUpdates.objects.filter(
+                updated__gte=datetime.now(timezone.utc) - timedelta(
                     minutes=INTER_EXCHANGES_OBSOLETE_IN_MINUTES
                 )
             )
@@ -52,9 +52,7 @@ class InterExchangesAPIView(ListAPIView, FilterView):
             ordering = 'marginality_percentage'
         if ordering and ordering_direction == 'desc':
             ordering = f"-{ordering}"
-        if ordering:
-            return queryset.order_by(ordering)
-        return queryset
+        return queryset.order_by(ordering or '-marginality_percentage')
 
     def list(self, request, *args, **kwargs):
         draw = request.query_params.get('draw')
@@ -68,7 +68,7 @@ class IntraCryptoExchangesRatesSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = IntraCryptoExchangesRates
-        exclude = ('id', 'update', 'crypto_exchange')
+        exclude = ('id', 'update', 'updated_at', 'crypto_exchange')
 
 
 class CryptoExchangesRatesSerializer(serializers.ModelSerializer):
@@ -83,7 +83,8 @@ class CryptoExchangesRatesSerializer(serializers.ModelSerializer):
     class Meta:
         model = CryptoExchangesRates
         exclude = (
-            'id', 'update', 'trade_type', 'crypto_exchange', 'bank'
+            'id', 'update', 'updated_at', 'trade_type', 'crypto_exchange',
+            'bank'
         )
 
 
@@ -108,7 +109,7 @@ class BanksExchangeRatesSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = BanksExchangeRates
-        exclude = ('id', 'update')
+        exclude = ('id', 'update', 'updated_at')
 
 
 class UpdateSerializer(serializers.ModelSerializer):
@@ -4,9 +4,12 @@ from datetime import datetime, timezone
 from celery import group
 
 from arbitration.celery import app
-from arbitration.settings import PARSING_WORKER_NAME
+from arbitration.settings import (P2P_MULTI_BANK_REQUESTS, PARSING_WORKER_NAME,
+                                  PRICE_STREAMS, STREAM_BINANCE_CRYPTO,
+                                  STREAM_BYBIT_CRYPTO)
 from banks.banks_config import BANKS_CONFIG
-from banks.tasks import (get_bog_p2p_binance_exchanges,
+from banks.tasks import (get_all_p2p_binance_exchanges,
+                         get_bog_p2p_binance_exchanges,
                          get_bog_p2p_bybit_exchanges,
                          get_credo_p2p_binance_exchanges,
                          get_credo_p2p_bybit_exchanges,
@@ -38,7 +41,7 @@ from crypto_exchanges.tasks import (get_all_binance_crypto_exchanges,
 from parsers.calculations import (
     ComplexInterExchangesCalculating,
     ComplexInternationalInterExchangesCalculating,
-    SimplInterExchangesCalculating,
+    CryptoExchangeInterExchangesCalculating, SimplInterExchangesCalculating,
     SimplInternationalInterExchangesCalculating)
 
 logger = logging.getLogger(__name__)
@@ -94,18 +97,29 @@ def assets_loop_stop():
 
 @app.task(queue='parsing')
 def assets_loop():
+    crypto_exchanges_tasks = tuple(
+        task.s() for task, stream_endpoint in (
+            (get_all_binance_crypto_exchanges, STREAM_BINANCE_CRYPTO),
+            (get_all_bybit_crypto_exchanges, STREAM_BYBIT_CRYPTO)
+        ) if not (PRICE_STREAMS and stream_endpoint)
+    )
+    if P2P_MULTI_BANK_REQUESTS:
+        p2p_binance_tasks = (get_all_p2p_binance_exchanges.s(),)
+    else:
+        p2p_binance_tasks = (
+            get_tinkoff_p2p_binance_exchanges.s(),
+            get_sberbank_p2p_binance_exchanges.s(),
+            get_raiffeisen_p2p_binance_exchanges.s(),
+            get_qiwi_p2p_binance_exchanges.s(),
+            get_yoomoney_p2p_binance_exchanges.s(),
+            get_bog_p2p_binance_exchanges.s(),
+            get_tbc_p2p_binance_exchanges.s(),
+            get_credo_p2p_binance_exchanges.s(),
+            get_wise_p2p_binance_exchanges.s(),
+        )
     group(
-        get_all_binance_crypto_exchanges.s(),
-        get_all_bybit_crypto_exchanges.s(),
-        get_tinkoff_p2p_binance_exchanges.s(),
-        get_sberbank_p2p_binance_exchanges.s(),
-        get_raiffeisen_p2p_binance_exchanges.s(),
-        get_qiwi_p2p_binance_exchanges.s(),
-        get_yoomoney_p2p_binance_exchanges.s(),
-        get_bog_p2p_binance_exchanges.s(),
-        get_tbc_p2p_binance_exchanges.s(),
-        get_credo_p2p_binance_exchanges.s(),
-        get_wise_p2p_binance_exchanges.s(),
+        *crypto_exchanges_tasks,
+        *p2p_binance_tasks,
         get_tinkoff_p2p_bybit_exchanges.s(),
         get_sberbank_p2p_bybit_exchanges.s(),
         get_raiffeisen_p2p_bybit_exchanges.s(),
@@ -202,3 +216,21 @@ def get_complex_international_inter_exchanges_calculating(full_update):
         for bank_name, config in BANKS_CONFIG.items()
         if config['bank_parser']
     ).delay()
+
+
+@app.task(queue='calculating')
+def crypto_exchange_inter_exchanges_calculating(
+        crypto_exchange_name, full_update):
+    CryptoExchangeInterExchangesCalculating(
+        crypto_exchange_name, full_update).main()
+
+
+@app.task
+def get_crypto_exchanges_inter_exchanges_calculating(full_update):
+    from crypto_exchanges.crypto_exchanges_config import (
+        CRYPTO_EXCHANGES_CONFIG)
+    group(
+        crypto_exchange_inter_exchanges_calculating.s(
+            crypto_exchange_name, full_update
+        ) for crypto_exchange_name in CRYPTO_EXCHANGES_CONFIG.keys()
+    ).delay()
@@ -43,3 +43,6 @@ class InterExchangesListNew(FilterView):
     model = InterExchanges
     template_name = 'crypto_exchanges/main.html'
     filterset_class = ExchangesFilter
+
+    def get_queryset(self):
+        return self.model.objects.order_by('-marginality_percentage')
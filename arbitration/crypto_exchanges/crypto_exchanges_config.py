@@ -3,10 +3,11 @@ from collections import OrderedDict
 from banks.banks_config import BANKS_CONFIG
 from crypto_exchanges.crypto_exchanges_registration.binance import (
     BINANCE_ASSETS, BINANCE_ASSETS_FOR_FIAT, BINANCE_CRYPTO_FIATS,
-    BINANCE_DEPOSIT_FIATS, BINANCE_INVALID_PARAMS_LIST, BINANCE_WITHDRAW_FIATS)
+    BINANCE_DEPOSIT_FIATS, BINANCE_INVALID_PARAMS_LIST, BINANCE_WITHDRAW_FIATS,
+    BinancePriceStream)
 from crypto_exchanges.crypto_exchanges_registration.bybit import (
     BYBIT_ASSETS, BYBIT_ASSETS_FOR_FIAT, BYBIT_CRYPTO_FIATS,
-    BYBIT_INVALID_PARAMS_LIST)
+    BYBIT_INVALID_PARAMS_LIST, BybitPriceStream)
 
 TRADE_TYPES = ('BUY', 'SELL')
 
@@ -18,12 +19,14 @@ CRYPTO_EXCHANGES_CONFIG = {
         'crypto_fiats': BINANCE_CRYPTO_FIATS,
         'deposit_fiats': BINANCE_DEPOSIT_FIATS,
         'withdraw_fiats': BINANCE_WITHDRAW_FIATS,
+        'price_stream': BinancePriceStream,
     },
     'Bybit': {
         'assets': BYBIT_ASSETS,
         'assets_for_fiats': BYBIT_ASSETS_FOR_FIAT,
         'invalid_params_list': BYBIT_INVALID_PARAMS_LIST,
         'crypto_fiats': BYBIT_CRYPTO_FIATS,
+        'price_stream': BybitPriceStream,
 
     }
 }
@@ -3,7 +3,7 @@ from __future__ import annotations
 import os
 from abc import ABC
 from itertools import combinations
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 from arbitration.settings import (API_BINANCE_CARD_2_CRYPTO_BUY,
                                   API_BINANCE_CARD_2_CRYPTO_SELL,
@@ -13,10 +13,14 @@ from arbitration.settings import (API_BINANCE_CARD_2_CRYPTO_BUY,
                                   CONNECTION_TYPE_BINANCE_CARD_2_CRYPTO,
                                   CONNECTION_TYPE_BINANCE_CRYPTO,
                                   CONNECTION_TYPE_BINANCE_LIST_FIAT,
-                                  CONNECTION_TYPE_P2P_BINANCE)
+                                  CONNECTION_TYPE_P2P_BINANCE,
+                                  STREAM_BINANCE_CRYPTO)
+from banks.models import Banks
 from parsers.calculations import Card2Wallet2CryptoExchangesCalculating
 from parsers.parsers import (Card2CryptoExchangesParser, CryptoExchangesParser,
-                             ListsFiatCryptoParser, P2PParser)
+                             ListsFiatCryptoParser, MultiBankP2PParser,
+                             P2PParser)
+from parsers.streams import PriceStream
 
 CRYPTO_EXCHANGES_NAME = os.path.basename(__file__).split('.')[0].capitalize()
 
@@ -98,6 +102,45 @@ class BinanceP2PParser(P2PParser, ABC):
         return float(adv.get('price'))
 
 
+class BinanceMultiBankP2PParser(MultiBankP2PParser):
+    crypto_exchange_name: str = CRYPTO_EXCHANGES_NAME
+    endpoint: str = API_P2P_BINANCE
+    connection_type: str = CONNECTION_TYPE_P2P_BINANCE
+    need_cookies: bool = False
+    page: int = 1
+    rows: int = 20
+
+    def _create_body(self, asset: str, fiat: str, trade_type: str,
+                     banks: List[Banks]) -> dict:
+        return {
+            "page": self.page,
+            "rows": self.rows,
+            "publisherType": "merchant",
+            "asset": asset,
+            "tradeType": trade_type,
+            "fiat": fiat,
+            "payTypes": [self._get_pay_type(bank) for bank in banks]
+        }
+
+    @staticmethod
+    def _get_pay_type(bank: Banks) -> str:
+        return bank.binance_name
+
+    @staticmethod
+    def _extract_prices_from_json(json_data: dict) -> Dict[str, float]:
+        prices = {}
+        for internal_data in json_data.get('data'):
+            adv = internal_data.get('adv')
+            for trade_method in adv.get('tradeMethods'):
+                prices.setdefault(trade_method.get('identifier'),
+                                  float(adv.get('price')))
+        return prices
+
+    @staticmethod
+    def _extract_adverts_count(json_data: dict) -> int:
+        return len(json_data.get('data'))
+
+
 class BinanceCryptoParser(CryptoExchangesParser):
     crypto_exchange_name: str = CRYPTO_EXCHANGES_NAME
     endpoint: str = API_BINANCE_CRYPTO
@@ -115,6 +158,12 @@ class BinanceCryptoParser(CryptoExchangesParser):
     def _extract_price_from_json(json_data: dict) -> float:
         return float(json_data['price'])
 
+    @staticmethod
+    def _extract_prices_from_json(json_data: list) -> Dict[str, float]:
+        return {
+            ticker['symbol']: float(ticker['price']) for ticker in json_data
+        }
+
     def _generate_unique_params(self) -> List[dict[str, str]]:
         """
         Method that generates unique parameters for the cryptocurrency exchange
@@ -122,8 +171,6 @@ class BinanceCryptoParser(CryptoExchangesParser):
         """
         currencies_combinations = list(combinations(self.assets,
                                                     self.CURRENCY_PAIR))
-        invalid_params_list = self.crypto_exchanges_configs.get(
-            'invalid_params_list')
         for crypto_fiat in self.crypto_fiats:
             for asset in self.assets:
                 if asset in self.stablecoins and crypto_fiat in (
@@ -134,11 +181,48 @@ class BinanceCryptoParser(CryptoExchangesParser):
         currencies_combinations = tuple(
             currencies_combination for currencies_combination
             in currencies_combinations
-            if currencies_combination not in invalid_params_list
+            if currencies_combination not in self.invalid_params
         )
         return self._create_params(currencies_combinations)
 
 
+class BinanceCryptoStreamParser(BinanceCryptoParser):
+    connection_type: str = 'Direct'
+
+
+class BinancePriceStream(PriceStream):
+    parser = BinanceCryptoStreamParser
+    endpoint: str = STREAM_BINANCE_CRYPTO
+    stream_name: str = 'miniTicker'
+
+    @staticmethod
+    def _create_subscribe_messages(symbols: List[str]) -> List[dict]:
+        return [{
+            'method': 'SUBSCRIBE',
+            'params': [
+                f'{symbol.lower()}@{BinancePriceStream.stream_name}'
+                for symbol in symbols
+            ],
+            'id': 1
+        }]
+
+    @staticmethod
+    def _extract_prices_from_message(message: dict) -> Dict[str, float]:
+        if message.get('e') != '24hrMiniTicker':
+            return {}
+        return {message['s']: float(message['c'])}
+
+    @staticmethod
+    def _extract_symbols_from_subscribe_message(message: dict) -> List[str]:
+        if message.get('method') != 'SUBSCRIBE':
+            return []
+        return [stream.split('@')[0].upper() for stream in message['params']]
+
+    @staticmethod
+    def _create_fake_message(symbol: str, price: float) -> dict:
+        return {'e': '24hrMiniTicker', 's': symbol, 'c': str(price)}
+
+
 class BinanceCard2CryptoExchangesParser(Card2CryptoExchangesParser):
     crypto_exchange_name: str = CRYPTO_EXCHANGES_NAME
     endpoint_sell: str = API_BINANCE_CARD_2_CRYPTO_SELL
@@ -1,12 +1,14 @@
 import os
 from abc import ABC
-from typing import Tuple
+from typing import Dict, List, Tuple
 
 from arbitration.settings import (API_BYBIT_CRYPTO, API_P2P_BYBIT,
                                   CONNECTION_TYPE_BYBIT_CRYPTO,
-                                  CONNECTION_TYPE_P2P_BYBIT)
+                                  CONNECTION_TYPE_P2P_BYBIT,
+                                  STREAM_BYBIT_CRYPTO)
 from banks.models import BanksExchangeRates
 from parsers.parsers import CryptoExchangesParser, P2PParser
+from parsers.streams import PriceStream
 
 CRYPTO_EXCHANGES_NAME = os.path.basename(__file__).split('.')[0].capitalize()
 
@@ -103,3 +105,52 @@ class BybitCryptoParser(CryptoExchangesParser):
     def _extract_price_from_json(json_data: dict) -> float:
         result = json_data['result']
         return float(result['price'])
+
+    @staticmethod
+    def _extract_prices_from_json(json_data: dict) -> Dict[str, float]:
+        result = json_data['result']
+        return {
+            ticker['symbol']: float(ticker['price'])
+            for ticker in result['list']
+        }
+
+
+class BybitCryptoStreamParser(BybitCryptoParser):
+    connection_type: str = 'Direct'
+
+
+class BybitPriceStream(PriceStream):
+    parser = BybitCryptoStreamParser
+    endpoint: str = STREAM_BYBIT_CRYPTO
+    ping_message: dict = {'op': 'ping'}
+    # The exchange accepts at most 10 topics in one subscribe message.
+    topics_per_message: int = 10
+
+    @staticmethod
+    def _create_subscribe_messages(symbols: List[str]) -> List[dict]:
+        topics = [f'tickers.{symbol}' for symbol in symbols]
+        step = BybitPriceStream.topics_per_message
+        return [
+            {'op': 'subscribe', 'args': topics[index:index + step]}
+            for index in range(0, len(topics), step)
+        ]
+
+    @staticmethod
+    def _extract_prices_from_message(message: dict) -> Dict[str, float]:
+        if not message.get('topic', '').startswith('tickers.'):
+            return {}
+        data = message['data']
+        return {data['symbol']: float(data['lastPrice'])}
+
+    @staticmethod
+    def _extract_symbols_from_subscribe_message(message: dict) -> List[str]:
+        if message.get('op') != 'subscribe':
+            return []
+        return [topic.split('.')[1] for topic in message['args']]
+
+    @staticmethod
+    def _create_fake_message(symbol: str, price: float) -> dict:
+        return {
+            'topic': f'tickers.{symbol}',
+            'data': {'symbol': symbol, 'lastPrice': str(price)}
+        }
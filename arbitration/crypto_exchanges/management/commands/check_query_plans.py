@@ -0,0 +1,256 @@
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from itertools import combinations, permutations, product
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from arbitration.settings import (DATA_OBSOLETE_IN_MINUTES,
+                                  INTER_EXCHANGES_OBSOLETE_IN_MINUTES)
+from banks.models import Banks, BanksExchangeRates, BanksExchangeRatesUpdates
+from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
+                                     CryptoExchangesRatesUpdates,
+                                     InterExchanges, InterExchangesUpdates,
+                                     IntraCryptoExchangesRates,
+                                     IntraCryptoExchangesRatesUpdates)
+
+SEED_PREFIX = 'query_plan_'
+ASSETS = ('USDT', 'BTC', 'ETH', 'BNB', 'BUSD', 'SHIB', 'DOGE', 'ADA', 'XRP',
+          'SOL')
+FIATS = ('RUB', 'USD', 'EUR', 'GBP', 'KZT', 'TRY', 'UAH', 'GEL', 'AMD',
+         'BYN')
+TRADE_TYPES = ('BUY', 'SELL')
+PAYMENT_CHANNELS = ('P2P', 'Card2CryptoExchange',
+                    'Card2Wallet2CryptoExchange')
+FULL_SCAN_PATTERNS = {
+    'postgresql': r'Seq Scan on "?{table}"?\b',
+    'sqlite': r'\bSCAN "?{table}"?(?! USING)\b',
+}
+
+
+class Command(BaseCommand):
+    help = ('Seeds the rate tables in a transaction that is rolled back and '
+            'fails if the plan of a hot query of the calculations, parsers or '
+            'API scans a whole table.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--crypto-exchanges', type=int, default=4,
+            help='The number of seeded crypto exchanges.'
+        )
+        parser.add_argument(
+            '--banks', type=int, default=10,
+            help='The number of seeded banks.'
+        )
+        parser.add_argument(
+            '--inter-exchanges', type=int, default=20000,
+            help='The number of seeded chains.'
+        )
+        parser.add_argument(
+            '--fresh-share', type=float, default=0.1,
+            help='The share of the seeded rates and chains that are fresh.'
+        )
+
+    def handle(self, *args, **options):
+        full_scan_pattern = FULL_SCAN_PATTERNS.get(connection.vendor)
+        if full_scan_pattern is None:
+            raise CommandError(
+                f'The query plans of {connection.vendor} are not supported.')
+        failures = []
+        with transaction.atomic():
+            seed = self.__seed(options)
+            self.__analyze()
+            for name, queryset in self.__get_hot_queries(*seed):
+                plan = queryset.explain()
+                pattern = full_scan_pattern.format(
+                    table=re.escape(queryset.model._meta.db_table))
+                if re.search(pattern, plan):
+                    failures.append(name)
+                    message = f'{name}: sequential scan\n{plan}'
+                    self.stderr.write(message)
+                else:
+                    self.stdout.write(f'{name}: OK')
+            transaction.set_rollback(True)
+        if failures:
+            raise CommandError(
+                f'Sequential scans in: {", ".join(failures)}.')
+
+    @staticmethod
+    def __analyze():
+        """
+        Updates the planner statistics of the seeded tables.
+        """
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+                return
+            for model in (CryptoExchangesRates, IntraCryptoExchangesRates,
+                          BanksExchangeRates, InterExchanges,
+                          InterExchangesUpdates):
+                cursor.execute(f'ANALYZE "{model._meta.db_table}"')
+
+    @staticmethod
+    def __create_partly_stale(model, objects, fresh_share, stale_time,
+                              stale_field):
+        """
+        Creates the objects and moves the stale_field of all but the
+        fresh_share of them to the stale time.
+        """
+        objects = model.objects.bulk_create(objects, batch_size=1000)
+        for obj in objects:
+            if random.random() >= fresh_share:
+                setattr(obj, stale_field, stale_time - timedelta(
+                    seconds=random.randrange(3600)))
+        model.objects.bulk_update(objects, [stale_field], batch_size=1000)
+        return objects
+
+    def __seed(self, options):
+        """
+        Creates the crypto exchanges, banks, rates and chains of the check.
+        Only the fresh_share of the rates and of the updates of the chains is
+        up to date, the rest are older.
+        """
+        stale_time = datetime.now(timezone.utc) - timedelta(days=1)
+        fresh_share = options['fresh_share']
+        crypto_exchanges = CryptoExchanges.objects.bulk_create(
+            CryptoExchanges(name=f'{SEED_PREFIX}{index}')
+            for index in range(options['crypto_exchanges'])
+        )
+        banks = Banks.objects.bulk_create(
+            Banks(name=f'{SEED_PREFIX}{index}')
+            for index in range(options['banks'])
+        )
+        rates_updates = CryptoExchangesRatesUpdates.objects.bulk_create(
+            CryptoExchangesRatesUpdates(
+                crypto_exchange=crypto_exchange, bank=bank,
+                payment_channel=payment_channel
+            )
+            for crypto_exchange, bank, payment_channel in product(
+                crypto_exchanges, banks, PAYMENT_CHANNELS)
+        )
+        rates, intra_rates, banks_rates = [], [], []
+        for rates_update, asset, trade_type, fiat in product(
+                rates_updates, ASSETS, TRADE_TYPES, FIATS):
+            rates.append(CryptoExchangesRates(
+                crypto_exchange_id=rates_update.crypto_exchange_id,
+                bank_id=rates_update.bank_id, asset=asset,
+                trade_type=trade_type, fiat=fiat,
+                payment_channel=rates_update.payment_channel,
+                price=random.random(), update=rates_update
+            ))
+        for crypto_exchange in crypto_exchanges:
+            intra_update = IntraCryptoExchangesRatesUpdates.objects.create(
+                crypto_exchange=crypto_exchange)
+            for from_asset, to_asset in combinations(ASSETS + FIATS, 2):
+                intra_rates.append(IntraCryptoExchangesRates(
+                    crypto_exchange=crypto_exchange, from_asset=from_asset,
+                    to_asset=to_asset, price=random.random(), spot_fee=0,
+                    update=intra_update
+                ))
+        for bank in banks:
+            bank_update = BanksExchangeRatesUpdates.objects.create(bank=bank)
+            for from_fiat, to_fiat in permutations(FIATS, 2):
+                banks_rates.append(BanksExchangeRates(
+                    bank=bank, from_fiat=from_fiat, to_fiat=to_fiat,
+                    price=random.random(), update=bank_update
+                ))
+        rates = self.__create_partly_stale(
+            CryptoExchangesRates, rates, fresh_share, stale_time,
+            'updated_at'
+        )
+        self.__create_partly_stale(
+            IntraCryptoExchangesRates, intra_rates, fresh_share, stale_time,
+            'updated_at'
+        )
+        self.__create_partly_stale(
+            BanksExchangeRates, banks_rates, fresh_share, stale_time,
+            'updated_at'
+        )
+        inter_exchanges_updates = self.__create_partly_stale(
+            InterExchangesUpdates, (
+                InterExchangesUpdates(
+                    crypto_exchange=crypto_exchange, bank=bank)
+                for crypto_exchange, bank in product(crypto_exchanges, banks)
+            ), fresh_share, stale_time, 'updated'
+        )
+        inter_exchanges = {}
+        while len(inter_exchanges) < options['inter_exchanges']:
+            update = random.choice(inter_exchanges_updates)
+            input_rate, output_rate = random.sample(rates, 2)
+            output_bank = random.choice(banks)
+            inter_exchanges[
+                update.id, output_bank.id, input_rate.id, output_rate.id
+            ] = InterExchanges(
+                crypto_exchange_id=update.crypto_exchange_id,
+                input_bank_id=update.bank_id, output_bank=output_bank,
+                input_crypto_exchange=input_rate,
+                output_crypto_exchange=output_rate,
+                marginality_percentage=random.uniform(-3, 3), update=update
+            )
+        InterExchanges.objects.bulk_create(
+            inter_exchanges.values(), batch_size=1000)
+        return crypto_exchanges, banks
+
+    @staticmethod
+    def __get_hot_queries(crypto_exchanges, banks):
+        """
+        Returns the hot queries of the calculations, parsers and API with
+        their names, in the shape in which they are sent.
+        """
+        crypto_exchange, bank = crypto_exchanges[0], banks[0]
+        update_time = datetime.now(timezone.utc) - timedelta(
+            minutes=DATA_OBSOLETE_IN_MINUTES)
+        return (
+            ('RateSnapshot crypto exchange rates',
+             CryptoExchangesRates.objects.filter(
+                 crypto_exchange=crypto_exchange, price__isnull=False,
+                 updated_at__gte=update_time
+             ).order_by('id')),
+            ('RateSnapshot intra crypto exchange rates',
+             IntraCryptoExchangesRates.objects.filter(
+                 crypto_exchange=crypto_exchange, updated_at__gte=update_time
+             )),
+            ('RateSnapshot bank exchange rates',
+             BanksExchangeRates.objects.filter(
+                 price__isnull=False, updated_at__gte=update_time
+             )),
+            ('Card2Wallet2 intra crypto exchange rate',
+             IntraCryptoExchangesRates.objects.filter(
+                 crypto_exchange=crypto_exchange, from_asset=FIATS[0],
+                 to_asset=ASSETS[0], updated_at__gte=update_time
+             )),
+            ('P2P exchange is better check',
+             CryptoExchangesRates.objects.filter(
+                 crypto_exchange=crypto_exchange, bank=bank,
+                 asset=ASSETS[0], trade_type=TRADE_TYPES[0], fiat=FIATS[0],
+                 payment_channel='P2P', price__isnull=False,
+                 updated_at__gte=update_time
+             )),
+            ('P2P existing rates',
+             CryptoExchangesRates.objects.filter(
+                 crypto_exchange=crypto_exchange, bank=bank,
+                 payment_channel='P2P'
+             )),
+            ('Stored chains of the input bank',
+             InterExchanges.objects.filter(
+                 bank_exchange__isnull=True,
+                 input_crypto_exchange__price__isnull=False,
+                 output_crypto_exchange__price__isnull=False,
+                 input_crypto_exchange__updated_at__gte=update_time,
+                 output_crypto_exchange__updated_at__gte=update_time,
+                 input_bank=bank, crypto_exchange=crypto_exchange,
+                 marginality_percentage__gte=0
+             )),
+            ('InterExchangesWriter stored chains',
+             InterExchanges.objects.filter(
+                 crypto_exchange=crypto_exchange, input_bank=bank
+             )),
+            ('API chains',
+             InterExchanges.objects.filter(
+                 update__in=InterExchangesUpdates.objects.filter(
+                     updated__gte=datetime.now(timezone.utc) - timedelta(
+                         minutes=INTER_EXCHANGES_OBSOLETE_IN_MINUTES)
+                 )
+             ).order_by('-marginality_percentage')[:10]),
+        )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from crypto_exchanges.crypto_exchanges_config import CRYPTO_EXCHANGES_CONFIG
+from parsers.streams import FakePriceStreamServer
+
+
+class Command(BaseCommand):
+    help = ('Runs a local WebSocket server that imitates the ticker stream of '
+            'a crypto exchange with random prices.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'crypto_exchange', help='The name of the crypto exchange.'
+        )
+        parser.add_argument('--host', default='localhost')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument(
+            '--interval', type=float, default=0.5,
+            help='The interval in seconds between the prices of a symbol.'
+        )
+
+    def handle(self, *args, **options):
+        price_stream = CRYPTO_EXCHANGES_CONFIG.get(
+            options['crypto_exchange'], {}).get('price_stream')
+        if price_stream is None:
+            raise CommandError(
+                f'{options["crypto_exchange"]} has no price stream.')
+        FakePriceStreamServer(
+            price_stream, interval=options['interval']
+        ).run(host=options['host'], port=options['port'])
@@ -0,0 +1,48 @@
+import asyncio
+
+from django.core.management.base import BaseCommand, CommandError
+
+from crypto_exchanges.crypto_exchanges_config import CRYPTO_EXCHANGES_CONFIG
+
+
+class Command(BaseCommand):
+    help = ('Streams the spot prices of the crypto exchanges over WebSockets '
+            'and writes the changed ones to the intra crypto exchange rates.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'crypto_exchanges', nargs='*',
+            help='The names of the crypto exchanges, all by default.'
+        )
+        parser.add_argument(
+            '--endpoint',
+            help='The WebSocket URL to use instead of the configured one, '
+                 'for example of fake_price_stream.'
+        )
+
+    def handle(self, *args, **options):
+        names = options['crypto_exchanges'] or [
+            name for name, crypto_exchange_info
+            in CRYPTO_EXCHANGES_CONFIG.items()
+            if 'price_stream' in crypto_exchange_info
+        ]
+        price_streams = []
+        for name in names:
+            price_stream = CRYPTO_EXCHANGES_CONFIG.get(name, {}).get(
+                'price_stream')
+            if price_stream is None:
+                raise CommandError(f'{name} has no price stream.')
+            endpoint = options['endpoint'] or price_stream.endpoint
+            if not endpoint:
+                message = f'The stream endpoint of {name} is not set.'
+                self.stderr.write(message)
+                continue
+            price_streams.append(price_stream(endpoint))
+        if not price_streams:
+            raise CommandError('There are no price streams to run.')
+        asyncio.run(self.__run(price_streams))
+
+    @staticmethod
+    async def __run(price_streams):
+        await asyncio.gather(
+            *(price_stream.run() for price_stream in price_streams))
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.7 on 2026-10-18 07:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto_exchanges', '0006_update_inter_exchanges_updates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cryptoexchangesratesupdates',
+            name='changed_rates',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='intracryptoexchangesratesupdates',
+            name='changed_rates',
+            field=models.JSONField(default=list),
+        ),
+    ]
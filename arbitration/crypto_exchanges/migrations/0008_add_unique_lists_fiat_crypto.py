@@ -0,0 +1,29 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:14
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def delete_duplicate_lists_fiat_crypto(apps, schema_editor):
+    lists_fiat_crypto = apps.get_model('crypto_exchanges', 'ListsFiatCrypto')
+    latest_ids = lists_fiat_crypto.objects.values(
+        'crypto_exchange', 'trade_type'
+    ).annotate(latest_id=Max('id')).values_list('latest_id', flat=True)
+    lists_fiat_crypto.objects.exclude(id__in=list(latest_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto_exchanges', '0007_add_changed_rates'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            delete_duplicate_lists_fiat_crypto, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name='listsfiatcrypto',
+            constraint=models.UniqueConstraint(fields=('crypto_exchange', 'trade_type'), name='unique_lists_fiat_crypto'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:19
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.utils.timezone
+
+
+def copy_update_date_to_updated_at(apps, schema_editor):
+    for model_name in ('CryptoExchangesRates', 'IntraCryptoExchangesRates'):
+        rates = apps.get_model('crypto_exchanges', model_name)
+        rates_updates = rates._meta.get_field('update').related_model
+        rates.objects.update(
+            updated_at=Subquery(rates_updates.objects.filter(
+                pk=OuterRef('update')).values('updated')[:1])
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto_exchanges', '0008_add_unique_lists_fiat_crypto'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cryptoexchangesrates',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Update date'),
+        ),
+        migrations.AddField(
+            model_name='intracryptoexchangesrates',
+            name='updated_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, verbose_name='Update date'),
+        ),
+        migrations.RunPython(
+            copy_update_date_to_updated_at, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.7 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crypto_exchanges', '0009_add_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='interexchanges',
+            options={},
+        ),
+        migrations.AddIndex(
+            model_name='cryptoexchangesrates',
+            index=models.Index(condition=models.Q(('price__isnull', False)), fields=['crypto_exchange', 'bank', 'trade_type', 'fiat', 'updated_at'], name='crypto_exchange_rates_fresh'),
+        ),
+        migrations.AddIndex(
+            model_name='intracryptoexchangesrates',
+            index=models.Index(fields=['crypto_exchange', 'updated_at'], name='intra_crypto_rates_fresh'),
+        ),
+        migrations.AddIndex(
+            model_name='interexchanges',
+            index=models.Index(fields=['input_bank', 'crypto_exchange', 'marginality_percentage'], name='inter_exchanges_by_bank'),
+        ),
+        migrations.AddIndex(
+            model_name='interexchanges',
+            index=models.Index(fields=['update', '-marginality_percentage'], name='inter_exchanges_by_update'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 from arbitration.settings import (ASSET_LENGTH, CHANNEL_LENGTH, DIAGRAM_LENGTH,
                                   FIAT_LENGTH, NAME_LENGTH, TRADE_TYPE_LENGTH)
@@ -15,13 +16,15 @@ class CryptoExchanges(models.Model):
 
 class IntraCryptoExchangesRatesUpdates(UpdatesModel):
     """
-    Model to store the last update date of intra crypto exchange rates.
+    Model to store the last update date of intra crypto exchange rates and
+    the ids of the rates whose price has changed in the update.
     """
     crypto_exchange = models.ForeignKey(
         CryptoExchanges,
         related_name='crypto_exchanges_update',
         on_delete=models.CASCADE
     )
+    changed_rates = models.JSONField(default=list)
 
 
 class IntraCryptoExchangesRates(models.Model):
@@ -42,6 +45,10 @@ class IntraCryptoExchangesRates(models.Model):
         on_delete=models.CASCADE
     )
     spot_fee = models.FloatField(default=None)
+    updated_at = models.DateTimeField(
+        verbose_name='Update date',
+        default=timezone.now
+    )
 
     class Meta:
         constraints = [
@@ -51,11 +58,18 @@ class IntraCryptoExchangesRates(models.Model):
                 ), name='unique_intra_crypto_exchanges'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=('crypto_exchange', 'updated_at'),
+                name='intra_crypto_rates_fresh'
+            )
+        ]
 
 
 class CryptoExchangesRatesUpdates(UpdatesModel):
     """
-    Model to store the last update date of crypto exchange rates.
+    Model to store the last update date of crypto exchange rates and the ids
+    of the rates whose price has changed in the update.
     """
     crypto_exchange = models.ForeignKey(
         CryptoExchanges,
@@ -74,6 +88,7 @@ class CryptoExchangesRatesUpdates(UpdatesModel):
         null=True,
         blank=True
     )
+    changed_rates = models.JSONField(default=list)
 
 
 class CryptoExchangesRates(models.Model):
@@ -129,6 +144,10 @@ class CryptoExchangesRates(models.Model):
         related_name='datas',
         on_delete=models.CASCADE
     )
+    updated_at = models.DateTimeField(
+        verbose_name='Update date',
+        default=timezone.now
+    )
 
     class Meta:
         constraints = [
@@ -139,6 +158,15 @@ class CryptoExchangesRates(models.Model):
                 ), name='unique_crypto_exchange_rates'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=(
+                    'crypto_exchange', 'bank', 'trade_type', 'fiat',
+                    'updated_at'
+                ), name='crypto_exchange_rates_fresh',
+                condition=models.Q(price__isnull=False)
+            )
+        ]
 
 
 class ListsFiatCryptoUpdates(UpdatesModel):
@@ -169,6 +197,14 @@ class ListsFiatCrypto(models.Model):
         on_delete=models.CASCADE
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('crypto_exchange', 'trade_type'),
+                name='unique_lists_fiat_crypto'
+            )
+        ]
+
 
 class InterExchangesUpdates(UpdatesModel):
     """
@@ -264,7 +300,6 @@ class InterExchanges(models.Model):
     )
 
     class Meta:
-        ordering = ['-marginality_percentage']
         constraints = [
             models.UniqueConstraint(
                 fields=(
@@ -275,6 +310,17 @@ class InterExchanges(models.Model):
                 ), name='unique_inter_exchanges'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=(
+                    'input_bank', 'crypto_exchange', 'marginality_percentage'
+                ), name='inter_exchanges_by_bank'
+            ),
+            models.Index(
+                fields=('update', '-marginality_percentage'),
+                name='inter_exchanges_by_update'
+            )
+        ]
 
 
 class RelatedMarginalityPercentages(models.Model):
@@ -1,22 +1,56 @@
 import logging
+import multiprocessing
 from abc import ABC
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
 from functools import reduce
-from itertools import product
-from typing import Any, List, Tuple
+from itertools import product, repeat
+from math import isnan
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from django.db.models import Q
+import numpy as np
+from django.db.models import (Case, DateTimeField, ExpressionWrapper, F, Q,
+                              QuerySet, Value, When)
 
 from arbitration.settings import (ALLOWED_PERCENTAGE, BASE_ASSET,
+                                  CALCULATING_BEST_CHAINS, CALCULATING_ENGINE,
+                                  CALCULATING_PROCESSES,
                                   DATA_OBSOLETE_IN_MINUTES,
                                   INTER_EXCHANGES_BEGIN_OBSOLETE_MINUTES,
                                   MINIMUM_PERCENTAGE)
-from banks.models import Banks, BanksExchangeRates
+from banks.models import Banks, BanksExchangeRates, BanksExchangeRatesUpdates
 from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
                                      CryptoExchangesRatesUpdates,
                                      InterExchanges, InterExchangesUpdates,
-                                     IntraCryptoExchangesRates)
+                                     IntraCryptoExchangesRates,
+                                     IntraCryptoExchangesRatesUpdates)
+from parsers.changes import ChangedRatesRecorder
+from parsers.graphs import ArbitrageGraph
 from parsers.loggers import CalculatingLogger
+from parsers.snapshots import CryptoExchangeRate, RateSnapshot
+from parsers.writers import InterExchangesCollector, InterExchangesWriter
+
+
+def calculate_shard(calculator_class: type, state: Dict[str, Any],
+                    output_bank_names: List[str]
+                    ) -> Tuple[list, Dict[str, int]]:
+    """
+    This function runs in a worker process. It calculates the chains of the
+    given output banks against the snapshot in the state and returns them
+    together with the counts of pruned candidates instead of writing them. The
+    calculator is built from the plain state without its __init__, so the
+    worker does not touch the database.
+    """
+    calculator = calculator_class.__new__(calculator_class)
+    calculator.__dict__.update(state)
+    calculator.logger = logging.getLogger(calculator_class.__name__)
+    calculator.banks = output_bank_names
+    calculator.writer = InterExchangesCollector(
+        calculator.crypto_exchange, calculator.bank
+    )
+    calculator._get_inter_exchanges()
+    return calculator.writer.chains, calculator.pruned_candidates
 
 
 class BaseCalculating(ABC):
@@ -72,13 +106,36 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         output_bank (Banks): A Django model of all banks.
         output_transaction_methods (tuple): Transaction methods supported by
             output banks.
-        input_crypto_exchanges: A Django model of fiat inputs to crypto
-            exchanges.
-        output_crypto_exchanges: A Django model of fiat output to crypto
-            exchanges.
+        input_crypto_exchanges: Records of fiat inputs to crypto exchanges.
+        output_crypto_exchanges: Records of fiat output to crypto exchanges.
         allowed_percentage (int): The maximum margin percentage above which
             data is considered invalid. Due to an error in the crypto exchange
             data.
+        snapshot (RateSnapshot): In-memory snapshot of all fresh rates of the
+            crypto exchange, against which the chains are enumerated.
+        engine (str): The way the chains are enumerated during a full update.
+            'loop' checks every chain one by one, 'vectorized' calculates the
+            margin percentages of all chains at once with NumPy, 'graph'
+            searches the best chains through any interim assets in the graph
+            of the snapshot.
+        graph (ArbitrageGraph): The graph of the snapshot, built on the first
+            use of the 'graph' engine.
+        best_chains (int): The number of best chains the 'graph' engine keeps
+            for each pair of input and output banks.
+        rate_fields (tuple): The fields of a chain that refer to rates, with
+            the models of these rates.
+        affected_inter_exchanges (set): The ids of the stored chains that use
+            the rates changed since the previous calculation. If None, all
+            stored chains are recomputed.
+        writer (InterExchangesWriter): Writes the chains found during a full
+            update in batches.
+        minimum_factor (float): The product of the prices of a chain below
+            which it cannot reach the minimum percentage. The tolerance covers
+            the rounding of the percentage.
+        processes (int): The number of processes among which the output banks
+            of a full update are sharded. If 1, the full update is serial.
+        shard_attributes (tuple): The attributes copied to the worker
+            processes of a sharded full update.
     """
     model = InterExchanges
     model_update = InterExchangesUpdates
@@ -92,17 +149,42 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
     base_asset: str = BASE_ASSET
     output_bank: Banks
     output_transaction_methods: Tuple[str]
-    input_crypto_exchanges: CryptoExchangesRates
-    output_crypto_exchanges: CryptoExchangesRates
+    input_crypto_exchanges: List[CryptoExchangeRate]
+    output_crypto_exchanges: List[CryptoExchangeRate]
     allowed_percentage: int = ALLOWED_PERCENTAGE
+    snapshot: RateSnapshot = None
+    engine: str = CALCULATING_ENGINE
+    graph: ArbitrageGraph = None
+    best_chains: int = CALCULATING_BEST_CHAINS
+    rate_fields: Tuple[Tuple[str, Any]] = (
+        ('input_crypto_exchange', CryptoExchangesRates),
+        ('interim_crypto_exchange', IntraCryptoExchangesRates),
+        ('second_interim_crypto_exchange', IntraCryptoExchangesRates),
+        ('output_crypto_exchange', CryptoExchangesRates),
+        ('bank_exchange', BanksExchangeRates)
+    )
+    affected_inter_exchanges: Optional[Set[int]] = None
+    writer: InterExchangesWriter = None
+    minimum_factor: float = 1 + (MINIMUM_PERCENTAGE - 0.01) / 100
+    processes: int = CALCULATING_PROCESSES
+    shard_attributes: Tuple[str] = (
+        'crypto_exchange', 'crypto_exchange_name', 'bank', 'bank_name',
+        'banks_config', 'full_update', 'input_transaction_methods',
+        'all_input_fiats', 'snapshot', 'graph'
+    )
 
     def __init__(self, crypto_exchange_name: str, bank_name: str,
-                 full_update: bool) -> None:
+                 full_update: bool, snapshot: RateSnapshot = None,
+                 graph: ArbitrageGraph = None) -> None:
         super().__init__()
         self.crypto_exchange_name = crypto_exchange_name
         self.crypto_exchange = CryptoExchanges.objects.get(
             name=self.crypto_exchange_name
         )
+        if snapshot is not None:
+            self.snapshot = snapshot
+        if graph is not None:
+            self.graph = graph
         self.bank_name = bank_name
         self.bank = Banks.objects.get(name=self.bank_name)
         self.banks = self.banks_config.keys()
@@ -118,19 +200,27 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         self.input_transaction_methods = self.input_bank_config[
             'transaction_methods']
         self.all_input_fiats = self.input_bank_config.get('currencies')
-        self.created_objects = 0
+        self.bumped_objects = 0
+        self.pruned_candidates = {
+            'input crypto exchanges': 0, 'output crypto exchanges': 0,
+            'bank exchanges': 0
+        }
 
     def _get_count_created_objects(self) -> None:
         """
         Sets the count of created objects to the count of records to create.
         """
-        self.count_created_objects = self.created_objects
+        self.count_created_objects = (
+            0 if self.writer is None else self.writer.created_objects)
 
     def _get_count_updated_objects(self) -> None:
         """
         Sets the count of updated objects to the count of records to update.
         """
-        self.count_updated_objects = len(self.records_to_update)
+        self.count_updated_objects = (
+            len(self.records_to_update) + self.bumped_objects)
+        if self.writer is not None:
+            self.count_updated_objects += self.writer.updated_objects
 
     def __check_is_no_queue(self) -> None:
         """
@@ -167,12 +257,8 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         A method that filters input crypto exchanges based on the given fiat.
         """
         self.input_crypto_exchanges = (
-            CryptoExchangesRates.objects.select_related('update').filter(
-                Q(transaction_method__in=self.input_transaction_methods) | Q(
-                    transaction_method__isnull=True),
-                crypto_exchange=self.crypto_exchange, bank=self.bank,
-                trade_type='BUY', fiat=input_fiat, price__isnull=False,
-                update__updated__gte=self.update_time
+            self.snapshot.get_crypto_exchanges_rates(
+                self.bank, 'BUY', input_fiat, self.input_transaction_methods
             )
         )
 
@@ -181,12 +267,9 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         A method that filters output crypto exchanges based on the given fiat.
         """
         self.output_crypto_exchanges = (
-            CryptoExchangesRates.objects.select_related('update').filter(
-                Q(transaction_method__in=self.output_transaction_methods) | Q(
-                    transaction_method__isnull=True),
-                crypto_exchange=self.crypto_exchange, bank=self.output_bank,
-                trade_type='SELL', fiat=output_fiat, price__isnull=False,
-                update__updated__gte=self.update_time
+            self.snapshot.get_crypto_exchanges_rates(
+                self.output_bank, 'SELL', output_fiat,
+                self.output_transaction_methods
             )
         )
 
@@ -220,8 +303,8 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         """
         message = (
             f'{self.__class__.__name__}, input bank: {self.bank_name}, '
-            f'output bank: {output_crypto_exchange.bank.name}, crypto '
-            f'exchange: {input_crypto_exchange.crypto_exchange.name}. '
+            f'output bank: {self.output_bank.name}, crypto '
+            f'exchange: {self.crypto_exchange_name}. '
         )
         if interim_exchange is None and interim_second_exchange is None:
             if input_crypto_exchange.asset != output_crypto_exchange.asset:
@@ -308,88 +391,175 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         return False
 
     def _get_two_interim_exchanges(
-            self, input_crypto_exchange: CryptoExchangesRates,
-            output_crypto_exchange: CryptoExchangesRates
+            self, input_crypto_exchange: CryptoExchangeRate,
+            output_crypto_exchange: CryptoExchangeRate
     ) -> tuple[Any, Any]:
         """
         A method that gets two or one interim exchanges based on input and
         output crypto exchanges.
         """
-        target_interim_exchange = (
-            IntraCryptoExchangesRates.objects.select_related(
-                'update').filter(
-                crypto_exchange=self.crypto_exchange,
-                from_asset=input_crypto_exchange.asset,
-                to_asset=output_crypto_exchange.asset,
-                update__updated__gte=self.update_time
-            )
-        )
-        if target_interim_exchange.exists():
-            return target_interim_exchange.get(), None
-        target_interim_exchange = (
-            IntraCryptoExchangesRates.objects.select_related(
-                'update').filter(
-                crypto_exchange=self.crypto_exchange,
-                from_asset=input_crypto_exchange.asset,
-                to_asset=self.base_asset,
-                update__updated__gte=self.update_time
-            )
-        )
-        target_second_interim_exchange = (
-            IntraCryptoExchangesRates.objects.select_related('update').filter(
-                crypto_exchange=self.crypto_exchange,
-                from_asset=self.base_asset,
-                to_asset=output_crypto_exchange.asset,
-                update__updated__gte=self.update_time
-            )
+        return self.snapshot.get_two_interim_exchanges(
+            input_crypto_exchange.asset, output_crypto_exchange.asset
         )
-        if target_interim_exchange.exists(
-        ) and target_second_interim_exchange.exists():
-            return (target_interim_exchange.get(),
-                    target_second_interim_exchange.get())
-        return None, None
 
-    def _update_complex_inter_exchanges(self) -> None:
+    def _filter_stored_inter_exchanges(self) -> QuerySet:
         """
-        This method is responsible for updating inter-exchange rates for a
-        given bank and crypto-exchange, with an exchange within the bank. It
-        filters inbound and outbound crypto exchanges based on certain
-        criteria, updates bank exchange rates for inbound and outbound fiat,
-        and then calculates the margin percentage for each exchange.
-        """
-        complex_exchanges = self.model.objects.prefetch_related(
-            'input_bank', 'output_bank', 'bank_exchange',
-            'input_crypto_exchange', 'output_crypto_exchange',
-            'interim_crypto_exchange', 'second_interim_crypto_exchange',
-            'update'
-        ).filter(
-            Q(input_crypto_exchange__transaction_method__in=(
-                self.input_transaction_methods)) | Q(
-                input_crypto_exchange__transaction_method__isnull=True),
-            Q(output_crypto_exchange__transaction_method__in=(
-                self.output_transaction_methods)) | Q(
-                output_crypto_exchange__transaction_method__isnull=True),
-            bank_exchange__isnull=False,
+        A method that filters the stored chains of the input bank whose input
+        and output crypto exchanges and bank exchange are up to date.
+        """
+        inter_exchanges = self.model.objects.filter(
+            bank_exchange__isnull=self.simpl,
             input_crypto_exchange__price__isnull=False,
             output_crypto_exchange__price__isnull=False,
-            input_crypto_exchange__update__updated__gte=self.update_time,
-            output_crypto_exchange__update__updated__gte=self.update_time,
-            bank_exchange__update__updated__gte=self.update_time,
+            input_crypto_exchange__updated_at__gte=self.update_time,
+            output_crypto_exchange__updated_at__gte=self.update_time,
             input_bank=self.bank, output_bank__name__in=self.banks,
             crypto_exchange=self.crypto_exchange,
             marginality_percentage__gte=(MINIMUM_PERCENTAGE - 1),
         )
-        if complex_exchanges.count() == 0:
-            self.full_update = True
-            self.main()
-            return
+        if self.simpl:
+            return inter_exchanges
+        return inter_exchanges.filter(
+            bank_exchange__updated_at__gte=self.update_time
+        )
+
+    def _get_changed_rates(self) -> Optional[Dict[Any, Set[int]]]:
+        """
+        A method that collects the ids of the rates whose price has changed
+        in the updates that ended after the start of the previous calculation
+        of the same chains. Returns None if there was no such calculation.
+        """
+        previous_update = self.model_update.objects.filter(
+            bank=self.bank, crypto_exchange=self.crypto_exchange,
+            international=self.international, simpl=self.simpl, ended=True
+        ).exclude(id=self.new_update.id).order_by('-updated').first()
+        if previous_update is None:
+            return None
+        previous_start_time = (
+            previous_update.updated - previous_update.duration)
+        ended = ExpressionWrapper(
+            F('updated') + F('duration'), output_field=DateTimeField()
+        )
+        rates_updates = (
+            (CryptoExchangesRates, CryptoExchangesRatesUpdates.objects.filter(
+                crypto_exchange=self.crypto_exchange)),
+            (IntraCryptoExchangesRates,
+             IntraCryptoExchangesRatesUpdates.objects.filter(
+                 crypto_exchange=self.crypto_exchange)),
+            (BanksExchangeRates, BanksExchangeRatesUpdates.objects.all())
+        )
+        changed_rates = {}
+        for model, updates in rates_updates:
+            changed_rates[model] = set()
+            for rate_ids in updates.alias(ended=ended).filter(
+                    ended__gte=previous_start_time
+            ).values_list('changed_rates', flat=True):
+                changed_rates[model].update(rate_ids)
+        return changed_rates
+
+    def _get_affected_inter_exchanges(self, inter_exchanges: QuerySet
+                                      ) -> Optional[Set[int]]:
+        """
+        A method that builds a reverse index from the rate ids to the ids of
+        the given chains that use them and returns the ids of the chains that
+        use any of the changed rates. Returns None if the changed rates are
+        unknown.
+        """
+        changed_rates = self._get_changed_rates()
+        if changed_rates is None:
+            return None
+        reverse_index = defaultdict(set)
+        for inter_exchange_id, *rate_ids in inter_exchanges.values_list(
+                'id', *(f'{field}_id' for field, _ in self.rate_fields)
+        ):
+            for (_, model), rate_id in zip(self.rate_fields, rate_ids):
+                if rate_id is not None:
+                    reverse_index[model, rate_id].add(inter_exchange_id)
+        affected_inter_exchanges = set()
+        for model, rate_ids in changed_rates.items():
+            for rate_id in rate_ids:
+                affected_inter_exchanges.update(
+                    reverse_index.get((model, rate_id), ()))
+        return affected_inter_exchanges
+
+    def _filter_changed_inter_exchanges(self, inter_exchanges: QuerySet
+                                        ) -> QuerySet:
+        """
+        A method that leaves only the chains affected by the changed rates to
+        be recomputed. The margin percentage of the other chains is still
+        valid, so they are moved to the new update in a single statement if
+        all their rates are up to date. The given chains are already filtered
+        by the freshness of their input, output and bank rates, so only the
+        freshness of the interim rates is checked here. The chains with a
+        stale rate are left in their update until they become obsolete, like
+        the recomputed chains whose rates are missing from the snapshot.
+        """
+        if self.affected_inter_exchanges is None:
+            return inter_exchanges
+        obsolete_updates = self.model_update.objects.filter(
+            updated__lt=self.start_time - timedelta(
+                minutes=INTER_EXCHANGES_BEGIN_OBSOLETE_MINUTES)
+        )
+        self.bumped_objects += inter_exchanges.exclude(
+            id__in=self.affected_inter_exchanges
+        ).filter(
+            Q(interim_crypto_exchange__isnull=True) | Q(
+                interim_crypto_exchange__updated_at__gte=self.update_time),
+            Q(second_interim_crypto_exchange__isnull=True) | Q(
+                second_interim_crypto_exchange__updated_at__gte=(
+                    self.update_time)),
+            marginality_percentage__gte=MINIMUM_PERCENTAGE
+        ).update(
+            dynamics=None, new=Case(
+                When(update__in=obsolete_updates, then=Value(True)),
+                default=Value(False)
+            ), update=self.new_update
+        )
+        return inter_exchanges.filter(id__in=self.affected_inter_exchanges)
+
+    def _get_chain_rates(self, inter_exchange: InterExchanges
+                         ) -> Optional[tuple]:
+        """
+        A method that returns the records of the rates of a stored chain from
+        the snapshot, in the order of rate_fields, or None if any of them is
+        no longer fresh.
+        """
+        rates = []
+        for field, model in self.rate_fields:
+            rate_id = getattr(inter_exchange, f'{field}_id')
+            if rate_id is None:
+                rates.append(None)
+                continue
+            rate = self.snapshot.rates_by_id[model].get(rate_id)
+            if rate is None:
+                return None
+            rates.append(rate)
+        return tuple(rates)
+
+    def _update_complex_inter_exchanges(self) -> None:
+        """
+        This method is responsible for updating inter-exchange rates for a
+        given bank and crypto-exchange, with an exchange within the bank. It
+        filters the stored chains of the output bank affected by the changed
+        rates and recalculates the margin percentage for each of them.
+        """
+        complex_exchanges = self._filter_changed_inter_exchanges(
+            self._filter_stored_inter_exchanges().filter(
+                Q(input_crypto_exchange__transaction_method__in=(
+                    self.input_transaction_methods)) | Q(
+                    input_crypto_exchange__transaction_method__isnull=True),
+                Q(output_crypto_exchange__transaction_method__in=(
+                    self.output_transaction_methods)) | Q(
+                    output_crypto_exchange__transaction_method__isnull=True),
+                output_bank=self.output_bank
+            )
+        ).select_related('update')
         for complex_exchange in complex_exchanges:
-            input_crypto_exchange = complex_exchange.input_crypto_exchange
-            interim_exchange = complex_exchange.interim_crypto_exchange
-            interim_second_exchange = (
-                complex_exchange.second_interim_crypto_exchange)
-            output_crypto_exchange = complex_exchange.output_crypto_exchange
-            bank_exchange = complex_exchange.bank_exchange
+            rates = self._get_chain_rates(complex_exchange)
+            if rates is None:
+                continue
+            (input_crypto_exchange, interim_exchange, interim_second_exchange,
+             output_crypto_exchange, bank_exchange) = rates
             marginality_percentage = (
                 self._calculate_marginality_percentage(
                     input_crypto_exchange, interim_exchange,
@@ -421,112 +591,175 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         upgrade or create.
         """
         for output_bank_name in self.banks:
-            self.output_bank = Banks.objects.get(name=output_bank_name)
+            self.output_bank = self.snapshot.banks[output_bank_name]
             output_bank_config = self.banks_config.get(output_bank_name)
             self.output_transaction_methods = output_bank_config[
                 'transaction_methods']
             if not self.full_update:
                 self._update_complex_inter_exchanges()
                 continue
+            if self.engine == 'graph':
+                self._get_graph_inter_exchanges()
+                continue
             all_output_fiats = output_bank_config.get('currencies')
             for input_fiat, output_fiat in product(
                     self.all_input_fiats, all_output_fiats
             ):
                 if input_fiat == output_fiat:
                     continue
-                bank_exchanges = BanksExchangeRates.objects.filter(
-                    bank__in=[self.bank, self.output_bank],
-                    from_fiat=output_fiat, to_fiat=input_fiat,
-                    price__isnull=False, update__updated__gte=self.update_time
+                bank_exchanges = self.snapshot.get_banks_exchange_rates(
+                    (self.bank, self.output_bank), output_fiat, input_fiat
                 )
                 self._filter_input_crypto_exchanges(input_fiat)
                 self._filter_output_crypto_exchanges(output_fiat)
-                for input_crypto_exchange, output_crypto_exchange in product(
-                        self.input_crypto_exchanges,
-                        self.output_crypto_exchanges
-                ):
-                    input_asset = input_crypto_exchange.asset
-                    output_asset = output_crypto_exchange.asset
-                    if input_asset != output_asset:
-                        interim_exchange, interim_second_exchange = (
-                            self._get_two_interim_exchanges(
-                                input_crypto_exchange, output_crypto_exchange
-                            )
-                        )
-                    else:
-                        interim_exchange = None
-                        interim_second_exchange = None
-                    for bank_exchange in bank_exchanges:
-                        marginality_percentage = (
-                            self._calculate_marginality_percentage(
-                                input_crypto_exchange, interim_exchange,
-                                interim_second_exchange,
-                                output_crypto_exchange, bank_exchange
-                            )
+                if self.engine == 'vectorized':
+                    self._get_vectorized_inter_exchanges(bank_exchanges)
+                else:
+                    self._get_complex_chains(bank_exchanges)
+
+    def _get_conversion_factors(self) -> np.ndarray:
+        """
+        Returns the matrix of the factors by which an amount of the asset of
+        each filtered input crypto exchange is multiplied when it is converted
+        to the asset of each filtered output crypto exchange inside the crypto
+        exchange. The factor is NaN if there is no way to convert it.
+        """
+        return self.snapshot.get_conversion_factors(
+            (input_crypto_exchange.asset
+             for input_crypto_exchange in self.input_crypto_exchanges),
+            (output_crypto_exchange.asset
+             for output_crypto_exchange in self.output_crypto_exchanges)
+        )
+
+    def _get_best_downstream_factors(self, conversion_factors: np.ndarray,
+                                     best_bank_exchange_price: float
+                                     ) -> List[float]:
+        """
+        Returns, for each filtered input crypto exchange, the best factor the
+        rest of the chain can achieve: the best conversion to the asset of an
+        output crypto exchange times its price times the price of the best
+        bank exchange.
+        """
+        output_prices = np.array([
+            output_crypto_exchange.price
+            for output_crypto_exchange in self.output_crypto_exchanges
+        ], dtype=float)
+        downstream_factors = np.nan_to_num(
+            conversion_factors * output_prices, nan=0)
+        best_factors = downstream_factors.max(axis=1, initial=0)
+        return (best_factors * best_bank_exchange_price).tolist()
+
+    def _get_complex_chains(self, bank_exchanges) -> None:
+        """
+        This method iterates over the combinations of the filtered input and
+        output crypto exchanges and the given bank exchanges, calculates the
+        margin percentage of each chain and adds the profitable ones to a bulk
+        list to upgrade or create. Partial chains whose upper bound can no
+        longer reach the minimum percentage are pruned at each level.
+        """
+        if not bank_exchanges:
+            return
+        bank_exchanges = sorted(
+            bank_exchanges, key=lambda bank_exchange: bank_exchange.price,
+            reverse=True
+        )
+        best_bank_exchange_price = bank_exchanges[0].price
+        conversion_factors = self._get_conversion_factors()
+        best_downstream_factors = self._get_best_downstream_factors(
+            conversion_factors, best_bank_exchange_price)
+        for input_crypto_exchange, best_downstream_factor, factors in zip(
+                self.input_crypto_exchanges, best_downstream_factors,
+                conversion_factors.tolist()
+        ):
+            if input_crypto_exchange.price * best_downstream_factor < (
+                    self.minimum_factor):
+                self.pruned_candidates['input crypto exchanges'] += 1
+                continue
+            for output_crypto_exchange, factor in zip(
+                    self.output_crypto_exchanges, factors):
+                input_asset = input_crypto_exchange.asset
+                output_asset = output_crypto_exchange.asset
+                if isnan(factor):
+                    self.pruned_candidates['output crypto exchanges'] += 1
+                    continue
+                partial_factor = reduce(lambda x, y: x * y, (
+                    input_crypto_exchange.price, factor,
+                    output_crypto_exchange.price
+                ))
+                if partial_factor * best_bank_exchange_price < (
+                        self.minimum_factor):
+                    self.pruned_candidates['output crypto exchanges'] += 1
+                    continue
+                if input_asset != output_asset:
+                    interim_exchange, interim_second_exchange = (
+                        self._get_two_interim_exchanges(
+                            input_crypto_exchange, output_crypto_exchange
                         )
-                        if self.__check_invalid_fiat_chain(
-                                input_crypto_exchange, output_crypto_exchange,
-                                bank_exchange
-                        ):
-                            continue
-                        if self.__check_invalid_asset_chain(
-                                input_crypto_exchange, interim_exchange,
-                                interim_second_exchange, output_crypto_exchange
-                        ):
-                            continue
-                        if marginality_percentage < MINIMUM_PERCENTAGE:
-                            continue
-                        if self.__crypto_exchange_bug_handler(
-                                marginality_percentage,
-                                input_crypto_exchange, interim_exchange,
-                                interim_second_exchange,
-                                output_crypto_exchange, bank_exchange
-                        ):
-                            continue
-                        self._add_to_bulk_update_or_create_and_bulk_create(
+                    )
+                else:
+                    interim_exchange = None
+                    interim_second_exchange = None
+                for index, bank_exchange in enumerate(bank_exchanges):
+                    if partial_factor * bank_exchange.price < (
+                            self.minimum_factor):
+                        self.pruned_candidates['bank exchanges'] += (
+                            len(bank_exchanges) - index)
+                        break
+                    marginality_percentage = (
+                        self._calculate_marginality_percentage(
                             input_crypto_exchange, interim_exchange,
                             interim_second_exchange, output_crypto_exchange,
-                            marginality_percentage, bank_exchange
+                            bank_exchange
                         )
+                    )
+                    if self.__check_invalid_fiat_chain(
+                            input_crypto_exchange, output_crypto_exchange,
+                            bank_exchange
+                    ):
+                        continue
+                    if self.__check_invalid_asset_chain(
+                            input_crypto_exchange, interim_exchange,
+                            interim_second_exchange, output_crypto_exchange
+                    ):
+                        continue
+                    if marginality_percentage < MINIMUM_PERCENTAGE:
+                        continue
+                    if self.__crypto_exchange_bug_handler(
+                            marginality_percentage, input_crypto_exchange,
+                            interim_exchange, interim_second_exchange,
+                            output_crypto_exchange, bank_exchange
+                    ):
+                        continue
+                    self._add_to_bulk_update_or_create_and_bulk_create(
+                        input_crypto_exchange, interim_exchange,
+                        interim_second_exchange, output_crypto_exchange,
+                        marginality_percentage, bank_exchange
+                    )
 
     def _update_simpl_inter_exchanges(self) -> None:
         """
         This method is responsible for updating inter-exchange rates for a
         given bank and crypto-exchange, without an exchange within the bank.
-        It filters inbound and outbound crypto exchanges based on certain
-        criteria, updates bank exchange rates for inbound and outbound fiat,
-        and then calculates the margin percentage for each exchange.
-        """
-        complex_exchanges = self.model.objects.prefetch_related(
-            'input_bank', 'output_bank', 'input_crypto_exchange',
-            'output_crypto_exchange', 'interim_crypto_exchange',
-            'second_interim_crypto_exchange', 'update'
-        ).filter(
-            Q(input_crypto_exchange__transaction_method__in=(
-                self.input_transaction_methods)) | Q(
-                input_crypto_exchange__transaction_method__isnull=True),
-            Q(output_crypto_exchange__transaction_method__in=(
-                self.output_transaction_methods)) | Q(
-                output_crypto_exchange__transaction_method__isnull=True),
-            bank_exchange__isnull=True,
-            input_crypto_exchange__price__isnull=False,
-            output_crypto_exchange__price__isnull=False,
-            input_crypto_exchange__update__updated__gte=self.update_time,
-            output_crypto_exchange__update__updated__gte=self.update_time,
-            input_bank=self.bank, output_bank__name__in=self.banks,
-            crypto_exchange=self.crypto_exchange,
-            marginality_percentage__gte=(MINIMUM_PERCENTAGE - 1),
-        )
-        if complex_exchanges.count() == 0:
-            self.full_update = True
-            self.main()
-            return
+        It filters the stored chains of the output bank affected by the
+        changed rates and recalculates the margin percentage for each of them.
+        """
+        complex_exchanges = self._filter_changed_inter_exchanges(
+            self._filter_stored_inter_exchanges().filter(
+                Q(input_crypto_exchange__transaction_method__in=(
+                    self.input_transaction_methods)) | Q(
+                    input_crypto_exchange__transaction_method__isnull=True),
+                Q(output_crypto_exchange__transaction_method__in=(
+                    self.output_transaction_methods)) | Q(
+                    output_crypto_exchange__transaction_method__isnull=True),
+                output_bank=self.output_bank
+            )
+        ).select_related('update')
         for complex_exchange in complex_exchanges:
-            input_crypto_exchange = complex_exchange.input_crypto_exchange
-            interim_exchange = complex_exchange.interim_crypto_exchange
-            interim_second_exchange = (
-                complex_exchange.second_interim_crypto_exchange)
-            output_crypto_exchange = complex_exchange.output_crypto_exchange
+            rates = self._get_chain_rates(complex_exchange)
+            if rates is None:
+                continue
+            (input_crypto_exchange, interim_exchange, interim_second_exchange,
+             output_crypto_exchange, _) = rates
             marginality_percentage = (
                 self._calculate_marginality_percentage(
                     input_crypto_exchange, interim_exchange,
@@ -556,64 +789,231 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         exchanges and generates profits into a bulk list to upgrade or create.
         """
         for output_bank_name in self.banks:
-            self.output_bank = Banks.objects.get(name=output_bank_name)
+            self.output_bank = self.snapshot.banks[output_bank_name]
             output_bank_config = self.banks_config.get(output_bank_name)
             self.output_transaction_methods = output_bank_config[
                 'transaction_methods']
             if not self.full_update:
                 self._update_simpl_inter_exchanges()
                 continue
+            if self.engine == 'graph':
+                self._get_graph_inter_exchanges()
+                continue
             all_output_fiats = output_bank_config.get('currencies')
             for fiat in self.all_input_fiats:
                 if fiat not in all_output_fiats:
                     continue
                 self._filter_input_crypto_exchanges(fiat)
                 self._filter_output_crypto_exchanges(fiat)
-                for input_crypto_exchange, output_crypto_exchange in product(
-                        self.input_crypto_exchanges,
-                        self.output_crypto_exchanges
-                ):
-                    input_asset = input_crypto_exchange.asset
-                    output_asset = output_crypto_exchange.asset
-                    if input_asset != output_asset:
-                        interim_exchange, interim_second_exchange = (
-                            self._get_two_interim_exchanges(
-                                input_crypto_exchange, output_crypto_exchange
-                            )
-                        )
-                        if interim_exchange is None:
-                            continue
-                    else:
-                        interim_exchange = None
-                        interim_second_exchange = None
-                    marginality_percentage = (
-                        self._calculate_marginality_percentage(
-                            input_crypto_exchange, interim_exchange,
-                            interim_second_exchange, output_crypto_exchange
+                if self.engine == 'vectorized':
+                    self._get_vectorized_inter_exchanges()
+                else:
+                    self._get_simpl_chains()
+
+    def _get_simpl_chains(self) -> None:
+        """
+        This method iterates over the combinations of the filtered input and
+        output crypto exchanges, calculates the margin percentage of each
+        chain and adds the profitable ones to a bulk list to upgrade or
+        create. Input crypto exchanges whose upper bound can no longer reach
+        the minimum percentage are pruned before their output crypto exchanges
+        are iterated.
+        """
+        conversion_factors = self._get_conversion_factors()
+        best_downstream_factors = self._get_best_downstream_factors(
+            conversion_factors, 1)
+        for input_crypto_exchange, best_downstream_factor, factors in zip(
+                self.input_crypto_exchanges, best_downstream_factors,
+                conversion_factors.tolist()
+        ):
+            if input_crypto_exchange.price * best_downstream_factor < (
+                    self.minimum_factor):
+                self.pruned_candidates['input crypto exchanges'] += 1
+                continue
+            for output_crypto_exchange, factor in zip(
+                    self.output_crypto_exchanges, factors):
+                input_asset = input_crypto_exchange.asset
+                output_asset = output_crypto_exchange.asset
+                if isnan(factor) or reduce(lambda x, y: x * y, (
+                        input_crypto_exchange.price, factor,
+                        output_crypto_exchange.price
+                )) < self.minimum_factor:
+                    self.pruned_candidates['output crypto exchanges'] += 1
+                    continue
+                if input_asset != output_asset:
+                    interim_exchange, interim_second_exchange = (
+                        self._get_two_interim_exchanges(
+                            input_crypto_exchange, output_crypto_exchange
                         )
                     )
-                    if self.__check_invalid_fiat_chain(
-                            input_crypto_exchange, output_crypto_exchange
-                    ):
-                        continue
-                    if self.__check_invalid_asset_chain(
-                            input_crypto_exchange, interim_exchange,
-                            interim_second_exchange, output_crypto_exchange
-                    ):
-                        continue
-                    if marginality_percentage < MINIMUM_PERCENTAGE:
-                        continue
-                    if self.__crypto_exchange_bug_handler(
-                            marginality_percentage, input_crypto_exchange,
-                            interim_exchange, interim_second_exchange,
-                            output_crypto_exchange
-                    ):
-                        continue
-                    self._add_to_bulk_update_or_create_and_bulk_create(
+                else:
+                    interim_exchange = None
+                    interim_second_exchange = None
+                marginality_percentage = (
+                    self._calculate_marginality_percentage(
                         input_crypto_exchange, interim_exchange,
-                        interim_second_exchange, output_crypto_exchange,
-                        marginality_percentage
+                        interim_second_exchange, output_crypto_exchange
                     )
+                )
+                if self.__check_invalid_fiat_chain(
+                        input_crypto_exchange, output_crypto_exchange
+                ):
+                    continue
+                if self.__check_invalid_asset_chain(
+                        input_crypto_exchange, interim_exchange,
+                        interim_second_exchange, output_crypto_exchange
+                ):
+                    continue
+                if marginality_percentage < MINIMUM_PERCENTAGE:
+                    continue
+                if self.__crypto_exchange_bug_handler(
+                        marginality_percentage, input_crypto_exchange,
+                        interim_exchange, interim_second_exchange,
+                        output_crypto_exchange
+                ):
+                    continue
+                self._add_to_bulk_update_or_create_and_bulk_create(
+                    input_crypto_exchange, interim_exchange,
+                    interim_second_exchange, output_crypto_exchange,
+                    marginality_percentage
+                )
+
+    def _get_interim_exchanges_factors(self) -> tuple[np.ndarray, list]:
+        """
+        Returns the matrix of conversion factors between the assets of the
+        filtered input and output crypto exchanges and the matrix of interim
+        exchanges used for each conversion. The factor is NaN if there is no
+        way to convert one asset to another.
+        """
+        input_assets = [input_crypto_exchange.asset for input_crypto_exchange
+                        in self.input_crypto_exchanges]
+        output_assets = [
+            output_crypto_exchange.asset
+            for output_crypto_exchange in self.output_crypto_exchanges
+        ]
+        asset_interim_exchanges = {}
+        for input_asset, output_asset in product(
+                set(input_assets), set(output_assets)
+        ):
+            asset_interim_exchanges[input_asset, output_asset] = (
+                (None, None) if input_asset == output_asset
+                else self.snapshot.get_two_interim_exchanges(
+                    input_asset, output_asset)
+            )
+        interim_exchanges = [
+            [asset_interim_exchanges[input_asset, output_asset]
+             for output_asset in output_assets]
+            for input_asset in input_assets
+        ]
+        return self._get_conversion_factors(), interim_exchanges
+
+    def _get_vectorized_inter_exchanges(self, bank_exchanges=None) -> None:
+        """
+        This method calculates the margin percentage of every combination of
+        the filtered input and output crypto exchanges and the given bank
+        exchanges at once, as an outer product of their price arrays. The
+        minimum and allowed percentage masks are applied to the whole tensor,
+        and only the surviving chains are added to a bulk list to upgrade or
+        create.
+        """
+        if bank_exchanges is None:
+            bank_exchanges = [None]
+        if not self.input_crypto_exchanges or not (
+                self.output_crypto_exchanges):
+            return
+        input_prices = np.array([
+            input_crypto_exchange.price
+            for input_crypto_exchange in self.input_crypto_exchanges
+        ], dtype=float)
+        output_prices = np.array([
+            output_crypto_exchange.price
+            for output_crypto_exchange in self.output_crypto_exchanges
+        ], dtype=float)
+        bank_prices = np.array([
+            1 if bank_exchange is None else bank_exchange.price
+            for bank_exchange in bank_exchanges
+        ], dtype=float)
+        factors, interim_exchanges = self._get_interim_exchanges_factors()
+        with np.errstate(invalid='ignore'):
+            marginality_percentages = (np.einsum(
+                'i,ij,j,k->ijk', input_prices, factors, output_prices,
+                bank_prices
+            ) - 1) * 100
+            # The tolerance covers the rounding of the exact percentage.
+            mask = marginality_percentages >= MINIMUM_PERCENTAGE - 0.01
+            if not self.no_crypto_exchange_bug_handler:
+                bug_mask = mask & (
+                    marginality_percentages > self.allowed_percentage + 0.01
+                )
+                mask &= ~bug_mask
+        for input_index, output_index, bank_index in np.argwhere(mask):
+            input_crypto_exchange = self.input_crypto_exchanges[input_index]
+            output_crypto_exchange = self.output_crypto_exchanges[
+                output_index]
+            bank_exchange = bank_exchanges[bank_index]
+            interim_exchange, interim_second_exchange = interim_exchanges[
+                input_index][output_index]
+            marginality_percentage = self._calculate_marginality_percentage(
+                input_crypto_exchange, interim_exchange,
+                interim_second_exchange, output_crypto_exchange, bank_exchange
+            )
+            if marginality_percentage < MINIMUM_PERCENTAGE:
+                continue
+            if self.__crypto_exchange_bug_handler(
+                    marginality_percentage, input_crypto_exchange,
+                    interim_exchange, interim_second_exchange,
+                    output_crypto_exchange, bank_exchange
+            ):
+                continue
+            self._add_to_bulk_update_or_create_and_bulk_create(
+                input_crypto_exchange, interim_exchange,
+                interim_second_exchange, output_crypto_exchange,
+                marginality_percentage, bank_exchange
+            )
+        if not self.no_crypto_exchange_bug_handler:
+            for input_index, output_index, bank_index in np.argwhere(
+                    bug_mask):
+                interim_exchange, interim_second_exchange = interim_exchanges[
+                    input_index][output_index]
+                self.__crypto_exchange_bug_handler(
+                    round(float(marginality_percentages[
+                        input_index, output_index, bank_index]), 2),
+                    self.input_crypto_exchanges[input_index],
+                    interim_exchange, interim_second_exchange,
+                    self.output_crypto_exchanges[output_index],
+                    bank_exchanges[bank_index]
+                )
+
+    def _get_graph_inter_exchanges(self) -> None:
+        """
+        This method searches the best chains from the input bank to the output
+        bank in the graph of the snapshot, including chains through any
+        interim assets, and adds them to a bulk list to upgrade or create.
+        """
+        if self.graph is None:
+            self.graph = ArbitrageGraph(self.snapshot, self.banks_config)
+        max_percentage = (None if self.no_crypto_exchange_bug_handler
+                          else self.allowed_percentage + 0.01)
+        # The tolerance covers the rounding of the exact percentage.
+        chains, rejected_chains = self.graph.get_best_chains(
+            self.bank, self.output_bank, self.simpl, self.best_chains,
+            MINIMUM_PERCENTAGE - 0.01, max_percentage
+        )
+        for chain in chains + rejected_chains:
+            marginality_percentage = self._calculate_marginality_percentage(
+                *chain)
+            if marginality_percentage < MINIMUM_PERCENTAGE:
+                continue
+            if self.__crypto_exchange_bug_handler(
+                    marginality_percentage, *chain
+            ):
+                continue
+            self._add_to_bulk_update_or_create_and_bulk_create(
+                chain.input_crypto_exchange, chain.interim_crypto_exchange,
+                chain.second_interim_crypto_exchange,
+                chain.output_crypto_exchange, marginality_percentage,
+                chain.bank_exchange
+            )
 
     def __marginality_percentage_handler(self, *args: Any) -> None:
         """
@@ -665,9 +1065,9 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         different exchanges that occur in the process.
         """
         diagram = ''
-        if bank_exchange and self.bank == bank_exchange.bank:
-            if bank_exchange.currency_market:
-                diagram += f'{bank_exchange.currency_market.name} '
+        if bank_exchange and self.bank.id == bank_exchange.bank_id:
+            if bank_exchange.currency_market_name:
+                diagram += f'{bank_exchange.currency_market_name} '
             else:
                 diagram += f'{self.bank.name} '
             diagram += f'{bank_exchange.from_fiat} ⇨ '
@@ -679,14 +1079,75 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
                 diagram += f'{interim_second_exchange.to_asset} ⇨ '
         diagram += f'{output_bank.name} {output_crypto_exchange.fiat}'
         if_one_bank = self.bank != output_bank
-        if bank_exchange and output_bank == bank_exchange.bank and if_one_bank:
-            if bank_exchange.currency_market:
-                diagram += f' ⇨ {bank_exchange.currency_market.name} '
+        if bank_exchange and output_bank.id == bank_exchange.bank_id and (
+                if_one_bank):
+            if bank_exchange.currency_market_name:
+                diagram += f' ⇨ {bank_exchange.currency_market_name} '
             else:
                 diagram += f' ⇨ {output_bank.name} '
             diagram += f'{bank_exchange.to_fiat}'
         return diagram
 
+    def _get_inter_exchanges(self) -> None:
+        """
+        This method calls the _get_simpl_inter_exchanges method or the
+        _get_complex_inter_exchanges method depending on the class settings.
+        """
+        if self.simpl:
+            self._get_simpl_inter_exchanges()
+        else:
+            self._get_complex_inter_exchanges()
+
+    def _get_shard_state(self) -> Dict[str, Any]:
+        """
+        This method returns the state that a worker process needs to
+        calculate the chains of a shard: the snapshot and the plain settings
+        of the chains, without the update, the writer and the connection to
+        the database of the parent.
+        """
+        state = {
+            attribute: getattr(self, attribute)
+            for attribute in self.shard_attributes
+        }
+        state['pruned_candidates'] = dict.fromkeys(self.pruned_candidates, 0)
+        return state
+
+    def _get_sharded_inter_exchanges(self) -> None:
+        """
+        This method splits the output banks into shards and calculates each
+        of them in a separate process over a copy of the snapshot. The chains
+        returned by the processes are written by the writer of the parent. If
+        the processes fail for any reason, for example because they cannot be
+        started inside a daemonic worker, the calculation falls back to serial
+        execution.
+        """
+        shards = [
+            self.banks[index::self.processes]
+            for index in range(min(self.processes, len(self.banks)))
+        ]
+        state = self._get_shard_state()
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=len(shards),
+                    mp_context=multiprocessing.get_context('fork')
+            ) as executor:
+                results = list(executor.map(
+                    calculate_shard, repeat(self.__class__), repeat(state),
+                    shards
+                ))
+        except Exception as error:
+            self.logger.warning(
+                f'Sharded calculation failed, the calculation is serial. '
+                f'{error}'
+            )
+            self._get_inter_exchanges()
+            return
+        for chains, pruned_candidates in results:
+            for key, marginality_percentage, diagram in chains:
+                self.writer.add_by_key(key, marginality_percentage, diagram)
+            for level, count in pruned_candidates.items():
+                self.pruned_candidates[level] += count
+
     def _add_to_bulk_update_or_create_and_bulk_create(
             self, input_crypto_exchange, interim_exchange,
             interim_second_exchange, output_crypto_exchange,
@@ -697,36 +1158,17 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
         for update or creation.
         """
         if self.full_update:
-            target_object = self.model.objects.filter(
-                crypto_exchange=self.crypto_exchange, input_bank=self.bank,
-                output_bank=self.output_bank,
-                input_crypto_exchange=input_crypto_exchange,
-                interim_crypto_exchange=interim_exchange,
-                second_interim_crypto_exchange=interim_second_exchange,
-                output_crypto_exchange=output_crypto_exchange,
-                bank_exchange=bank_exchange
-            )
-            if not target_object.exists():
-                self.model.objects.create(
-                    crypto_exchange=self.crypto_exchange, input_bank=self.bank,
-                    output_bank=self.output_bank,
-                    input_crypto_exchange=input_crypto_exchange,
-                    interim_crypto_exchange=interim_exchange,
-                    second_interim_crypto_exchange=interim_second_exchange,
-                    output_crypto_exchange=output_crypto_exchange,
-                    bank_exchange=bank_exchange,
-                    marginality_percentage=marginality_percentage,
-                    diagram=self._create_diagram(
-                        input_crypto_exchange, interim_exchange,
-                        interim_second_exchange, self.output_bank,
-                        output_crypto_exchange, bank_exchange
-                    ), dynamics=None, new=True, update=self.new_update
+            self.writer.add(
+                self.output_bank, input_crypto_exchange, interim_exchange,
+                interim_second_exchange, output_crypto_exchange,
+                bank_exchange, marginality_percentage, self._create_diagram(
+                    input_crypto_exchange, interim_exchange,
+                    interim_second_exchange, self.output_bank,
+                    output_crypto_exchange, bank_exchange
                 )
-                self.created_objects += 1
-                return
-            inter_exchange = target_object.get()
-        else:
-            inter_exchange = complex_exchange
+            )
+            return
+        inter_exchange = complex_exchange
         if inter_exchange.marginality_percentage > marginality_percentage:
             inter_exchange.dynamics = 'fall'
         elif (
@@ -761,10 +1203,30 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
                 self._logger_queue_overflowing()
                 return
             self._logger_start()
-            if self.simpl:
-                self._get_simpl_inter_exchanges()
+            if self.snapshot is None:
+                self.snapshot = RateSnapshot(
+                    self.crypto_exchange, self.update_time
+                )
+            if not self.full_update:
+                stored_inter_exchanges = self._filter_stored_inter_exchanges()
+                if stored_inter_exchanges.exists():
+                    self.affected_inter_exchanges = (
+                        self._get_affected_inter_exchanges(
+                            stored_inter_exchanges)
+                    )
+                else:
+                    self.full_update = True
+            if self.full_update:
+                self.writer = InterExchangesWriter(
+                    self.crypto_exchange, self.bank, self.new_update,
+                    self.start_time
+                )
+            if self.full_update and self.processes > 1:
+                self._get_sharded_inter_exchanges()
             else:
-                self._get_complex_inter_exchanges()
+                self._get_inter_exchanges()
+            if self.writer is not None:
+                self.writer.flush()
             self.model.objects.bulk_update(
                 self.records_to_update, self.updated_fields
             )
@@ -783,12 +1245,15 @@ class InterExchangesCalculating(BaseCalculating, CalculatingLogger, ABC):
 
 
 class Card2Wallet2CryptoExchangesCalculating(BaseCalculating,
-                                             CalculatingLogger, ABC):
+                                             CalculatingLogger,
+                                             ChangedRatesRecorder, ABC):
     model = CryptoExchangesRates
     model_update = CryptoExchangesRatesUpdates
     crypto_exchange_name: str
     payment_channel = 'Card2Wallet2CryptoExchange'
-    updated_fields: List[str] = ['price', 'update', 'transaction_fee']
+    updated_fields: List[str] = [
+        'price', 'update', 'transaction_fee', 'updated_at'
+    ]
     data_obsolete_in_minutes: int = DATA_OBSOLETE_IN_MINUTES
 
     def __init__(self, trade_type: str) -> None:
@@ -839,20 +1304,18 @@ class Card2Wallet2CryptoExchangesCalculating(BaseCalculating,
         fiat_price = 1 - transaction_fee / 100
         if self.trade_type == 'BUY':
             target_intra_crypto_exchange = (
-                IntraCryptoExchangesRates.objects.select_related(
-                    'update').filter(
+                IntraCryptoExchangesRates.objects.filter(
                     crypto_exchange=self.crypto_exchange,
                     from_asset=fiat, to_asset=asset,
-                    update__updated__gte=self.update_time
+                    updated_at__gte=self.update_time
                 )
             )
         else:  # SELL
             target_intra_crypto_exchange = (
-                IntraCryptoExchangesRates.objects.select_related(
-                    'update').filter(
+                IntraCryptoExchangesRates.objects.filter(
                     crypto_exchange=self.crypto_exchange,
                     from_asset=asset, to_asset=fiat,
-                    update__updated__gte=self.update_time
+                    updated_at__gte=self.update_time
                 )
             )
         if target_intra_crypto_exchange.exists():
@@ -881,11 +1344,11 @@ class Card2Wallet2CryptoExchangesCalculating(BaseCalculating,
         Checks if a P2P exchange offers a better price than the current
         exchange.
         """
-        p2p_exchange = self.model.objects.select_related('update').filter(
+        p2p_exchange = self.model.objects.filter(
             crypto_exchange=self.crypto_exchange, bank=bank,
             asset=value_dict['asset'], trade_type=value_dict['trade_type'],
             fiat=value_dict['fiat'], payment_channel='P2P',
-            price__isnull=False, update__updated__gte=self.update_time
+            price__isnull=False, updated_at__gte=self.update_time
         )
         if p2p_exchange.exists():
             p2p_price = p2p_exchange.get().price
@@ -926,6 +1389,7 @@ class Card2Wallet2CryptoExchangesCalculating(BaseCalculating,
                 updated_object.price = price
                 updated_object.transaction_fee = value_dict['transaction_fee']
                 updated_object.update = self.new_update
+                updated_object.updated_at = datetime.now(timezone.utc)
                 self.records_to_update.append(updated_object)
             else:
                 created_object = self.model(
@@ -984,6 +1448,7 @@ class Card2Wallet2CryptoExchangesCalculating(BaseCalculating,
         try:
             self._logger_start()
             self._get_all_datas()
+            self._record_changed_rates()
             self.model.objects.bulk_create(self.records_to_create)
             self.model.objects.bulk_update(
                 self.records_to_update, self.updated_fields
@@ -1036,3 +1501,99 @@ class ComplexInternationalInterExchangesCalculating(InterExchangesCalculating):
     """
     simpl: bool = False
     international: bool = True
+
+
+class CryptoExchangeInterExchangesCalculating(BaseCalculating,
+                                              CalculatingLogger):
+    """
+    Calculates the simple, complex, local and international chains of all
+    input banks of one crypto exchange in a single pass. The rates are loaded
+    into one snapshot, which is shared by the calculations of every bank, and
+    each of them still writes its own InterExchangesUpdates record.
+
+    Attributes:
+        calculating_classes (tuple): The calculation classes run for each
+            input bank.
+    """
+    calculating_classes: Tuple[type] = (
+        SimplInterExchangesCalculating,
+        SimplInternationalInterExchangesCalculating,
+        ComplexInterExchangesCalculating,
+        ComplexInternationalInterExchangesCalculating
+    )
+
+    def __init__(self, crypto_exchange_name: str, full_update: bool) -> None:
+        super().__init__()
+        self.crypto_exchange_name = crypto_exchange_name
+        self.crypto_exchange = CryptoExchanges.objects.get(
+            name=self.crypto_exchange_name
+        )
+        self.full_update = full_update
+        self.calculations = []
+
+    def _get_count_created_objects(self) -> None:
+        """
+        Sets the count of created objects to the sum of the counts of all
+        calculations.
+        """
+        self.count_created_objects = sum(
+            getattr(calculation, 'count_created_objects', 0)
+            for calculation in self.calculations
+        )
+
+    def _get_count_updated_objects(self) -> None:
+        """
+        Sets the count of updated objects to the sum of the counts of all
+        calculations.
+        """
+        self.count_updated_objects = sum(
+            getattr(calculation, 'count_updated_objects', 0)
+            for calculation in self.calculations
+        )
+
+    def _get_bank_names(self, calculating_class: type) -> List[str]:
+        """
+        Returns the names of the input banks for which the calculation class
+        is run.
+        """
+        if calculating_class.simpl:
+            return [
+                bank_name for bank_name, config in self.banks_config.items()
+                if 'Binance' in config['crypto_exchanges']
+            ]
+        return [bank_name for bank_name, config in self.banks_config.items()
+                if config['bank_parser']]
+
+    def main(self) -> None:
+        """
+        This method is the main method of the class and is responsible for
+        running the entire process. It loads the snapshot of the crypto
+        exchange once and runs the calculations of all input banks against it.
+        An error in the calculation of one bank is logged by that calculation
+        and does not stop the others.
+        """
+        try:
+            self._logger_start()
+            snapshot = RateSnapshot(self.crypto_exchange, self.update_time)
+            graph = None
+            for calculating_class in self.calculating_classes:
+                for bank_name in self._get_bank_names(calculating_class):
+                    calculation = calculating_class(
+                        self.crypto_exchange_name, bank_name,
+                        self.full_update, snapshot, graph
+                    )
+                    self.calculations.append(calculation)
+                    try:
+                        calculation.main()
+                    except Exception:
+                        continue
+                    graph = calculation.graph
+            self.pruned_candidates = defaultdict(int)
+            for calculation in self.calculations:
+                for level, count in calculation.pruned_candidates.items():
+                    self.pruned_candidates[level] += count
+            self.duration = datetime.now(timezone.utc) - self.start_time
+            self._logger_end()
+        except Exception as error:
+            self._logger_error(error)
+            raise Exception
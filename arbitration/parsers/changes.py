@@ -0,0 +1,38 @@
+from abc import ABC
+from typing import Iterable, List, Tuple
+
+
+class ChangedRatesRecorder(ABC):
+    """
+    A mixin for the classes that update rates. Before the updated records are
+    saved, it compares their prices with the ones in the database and stores
+    the ids of the records whose price has changed in the update, so that the
+    calculations can recompute only the chains that use them. An update
+    written by several runs keeps the changed rates of all of them.
+    """
+    def _get_stored_prices(self, rate_ids: List[int]
+                           ) -> Iterable[Tuple[int, float]]:
+        """
+        Returns the ids and the saved prices of the rates with the given ids.
+        """
+        return self.model.objects.filter(
+            id__in=rate_ids
+        ).values_list('id', 'price')
+
+    def _record_changed_rates(self) -> None:
+        """
+        Adds the ids of the records to update whose price differs from the
+        saved one to the changed_rates field of the update.
+        """
+        if not hasattr(self.new_update, 'changed_rates'):
+            return
+        new_prices = {
+            record.id: record.price for record in self.records_to_update
+        }
+        old_prices = self._get_stored_prices(list(new_prices))
+        self.new_update.changed_rates = sorted(
+            set(self.new_update.changed_rates).union(
+                rate_id for rate_id, price in old_prices
+                if price != new_prices[rate_id]
+            )
+        )
@@ -1,7 +1,7 @@
-import time
-
 import requests
 
+from parsers.connection_types.session import create_session
+
 
 class Direct:
     """
@@ -24,10 +24,12 @@ class Direct:
         Static method that creates and returns a session object for the Direct
         object.
         """
-        return requests.session()
+        return create_session()
 
     def renew_connection(self) -> None:
         """
-        Placeholder method that will be used to renew the HTTP connection.
+        Replaces the session, closing its kept-alive connections. The wait
+        before the next request is left to the rate limiter of the parser.
         """
-        time.sleep(2)
+        self.session.close()
+        self.session = self.__set_direct_session()
@@ -1,50 +1,46 @@
-from typing import List
-
 import requests
-from fp.fp import FreeProxy
 
-from arbitration.settings import COUNTRIES_NEAR_SERVER
+from parsers.connection_types.proxy_pool import get_proxy_pool
+from parsers.connection_types.session import create_session
 
 
 class Proxy:
     """
-    A class to manage proxy connections for making HTTP requests.
+    A class to manage proxy connections for making HTTP requests. The proxies
+    are taken from the proxy pool of the worker process.
 
     Attributes:
         request_timeout (int): The timeout value for HTTP requests.
-        country_id (List[str]): A list of country codes to limit proxy
-            selection to.
     """
     request_timeout: int = 4
-    country_id: List[str] = COUNTRIES_NEAR_SERVER
 
     def __init__(self) -> None:
         """
-        Initializes the Proxy class and sets up a new session with a proxy.
+        Initializes the Proxy class and sets up a new session with the best
+        proxy of the pool. It fails at once if the pool has no live proxy
+        yet, instead of waiting for it.
         """
-        self.proxy_list = FreeProxy(country_id=self.country_id, elite=True)
-        self.proxy_url: str = self.__set_proxy_url()
+        self.proxy_pool = get_proxy_pool()
+        self.proxy_url: str = self.proxy_pool.get()
         self.session: requests.sessions.Session = self.__set_proxy_session()
 
     def __set_proxy_session(self) -> requests.sessions.Session:
         """
         Private method to set up a new requests session with the currently
-        selected proxy.
-        """
-        with requests.session() as session:
-            session.proxies = {'http': self.proxy_url}
-            return session
-
-    def __set_proxy_url(self) -> str:
-        """
-        Private method to get a new proxy URL from the proxy list.
+        selected proxy for http and https.
         """
-        return self.proxy_list.get()
+        session = create_session()
+        session.proxies = {'http': self.proxy_url, 'https': self.proxy_url}
+        return session
 
     def renew_connection(self) -> None:
         """
-        Public method to renew the proxy connection by getting a new proxy URL
-        and setting up a new session.
+        Public method to renew the proxy connection by reporting the failure
+        of the current proxy to the pool, taking the best other one and
+        setting up a new session. The old session is closed with its
+        kept-alive connections.
         """
-        self.proxy_url = self.__set_proxy_url()
+        self.proxy_pool.report_failure(self.proxy_url)
+        self.proxy_url = self.proxy_pool.get(exclude=self.proxy_url)
+        self.session.close()
         self.session = self.__set_proxy_session()
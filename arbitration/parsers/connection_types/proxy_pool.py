@@ -0,0 +1,226 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import requests
+from fp.fp import FreeProxy
+
+from arbitration.settings import (COUNTRIES_NEAR_SERVER, PROXY_POOL_CANDIDATES,
+                                  PROXY_POOL_MAX_FAILURES,
+                                  PROXY_POOL_PROBE_URL,
+                                  PROXY_POOL_REFRESH_INTERVAL)
+
+
+class ProxyStats:
+    """
+    The health of a proxy, collected from the probes of the pool and the
+    failures reported by the connections.
+
+    Attributes:
+        successes (int): The number of successful probes.
+        failures (int): The number of failed probes and requests.
+        consecutive_failures (int): The number of failures since the last
+            success.
+        latency (float): The exponential moving average of the latency of
+            the successful probes in seconds.
+        LATENCY_WEIGHT (float): The weight of the last latency in the average.
+    """
+    LATENCY_WEIGHT: float = 0.3
+
+    def __init__(self) -> None:
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.latency = None
+
+    def add_success(self, latency: float) -> None:
+        """
+        Records a successful probe with its latency.
+        """
+        self.successes += 1
+        self.consecutive_failures = 0
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.LATENCY_WEIGHT * (latency - self.latency)
+
+    def add_failure(self) -> None:
+        """
+        Records a failed probe or request.
+        """
+        self.failures += 1
+        self.consecutive_failures += 1
+
+    def get_score(self) -> Tuple[float, float]:
+        """
+        Returns the sort key of the proxy: the higher the success rate and
+        then the lower the latency, the better.
+        """
+        success_rate = self.successes / (self.successes + self.failures)
+        return -success_rate, self.latency
+
+
+class ProxyPool:
+    """
+    A pool of vetted proxies shared by the Proxy connections of a worker
+    process. A background thread periodically refreshes the candidates, from
+    the free proxy lists or from the configured ones, and probes them and the
+    known proxies concurrently. The live proxies are ranked by success rate
+    and latency, so that the best one is handed out without waiting, and a
+    proxy is evicted after max_failures failures in a row. The pool never
+    blocks the caller: if there is no live proxy yet, get fails at once and
+    asks the background thread to refresh the pool.
+
+    Attributes:
+        country_id (List[str]): A list of country codes to limit proxy
+            selection to.
+        candidates (List[str]): The proxies to probe instead of the free
+            proxy lists, if set.
+        probe_url (str): The URL requested through a proxy to probe it.
+        probe_timeout (int): The timeout of a probe.
+        probe_workers (int): The number of proxies probed at once.
+        refresh_interval (int): The interval in seconds between refreshes.
+        max_failures (int): The number of failures in a row after which a
+            proxy is evicted.
+        stats (dict): The ProxyStats of the live proxies keyed by proxy URL.
+        ranking (list): The URLs of the live proxies from best to worst.
+    """
+    country_id: List[str] = COUNTRIES_NEAR_SERVER
+    candidates: List[str] = PROXY_POOL_CANDIDATES
+    probe_url: str = PROXY_POOL_PROBE_URL
+    probe_timeout: int = 4
+    probe_workers: int = 20
+    refresh_interval: int = PROXY_POOL_REFRESH_INTERVAL
+    max_failures: int = PROXY_POOL_MAX_FAILURES
+
+    def __init__(self) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.stats: Dict[str, ProxyStats] = {}
+        self.ranking: List[str] = []
+        self.lock = threading.Lock()
+        self.refresh_requested = threading.Event()
+        self.refresh_thread = None
+
+    def __start(self) -> None:
+        """
+        Starts the background refresh if it is not running yet.
+        """
+        with self.lock:
+            if self.refresh_thread is not None:
+                return
+            self.refresh_thread = threading.Thread(
+                target=self.__refresh_periodically, daemon=True
+            )
+            self.refresh_thread.start()
+
+    def __refresh_periodically(self) -> None:
+        """
+        Refreshes the pool every refresh_interval, or earlier if a refresh
+        is requested.
+        """
+        while True:
+            self.refresh_requested.clear()
+            self.refresh()
+            self.refresh_requested.wait(self.refresh_interval)
+
+    def __get_candidates(self) -> List[str]:
+        """
+        Returns the URLs of the candidate proxies.
+        """
+        if self.candidates:
+            candidates = self.candidates
+        else:
+            candidates = FreeProxy(
+                country_id=self.country_id, elite=True
+            ).get_proxy_list(repeat=False)
+        return [
+            candidate if '://' in candidate else f'http://{candidate}'
+            for candidate in candidates
+        ]
+
+    def __probe(self, proxy_url: str) -> None:
+        """
+        Requests the probe URL through the proxy and records the result.
+        """
+        start_time = time.monotonic()
+        try:
+            response = requests.get(
+                self.probe_url, timeout=self.probe_timeout,
+                proxies={'http': proxy_url, 'https': proxy_url}
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            self.report_failure(proxy_url)
+            return
+        self.report_success(proxy_url, time.monotonic() - start_time)
+
+    def __rank(self) -> None:
+        """
+        Sorts the live proxies from best to worst.
+        """
+        self.ranking = sorted(
+            self.stats, key=lambda proxy_url: self.stats[proxy_url].get_score()
+        )
+
+    def refresh(self) -> None:
+        """
+        Probes the new candidates and the live proxies.
+        """
+        try:
+            candidates = self.__get_candidates()
+        except Exception as error:
+            message = f'Failed to get the candidate proxies: {error}'
+            self.logger.error(message)
+            candidates = []
+        proxy_urls = set(candidates) | set(self.stats)
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as executor:
+            list(executor.map(self.__probe, proxy_urls))
+
+    def report_success(self, proxy_url: str, latency: float) -> None:
+        """
+        Records a successful probe of the proxy, adding it to the live ones.
+        """
+        with self.lock:
+            self.stats.setdefault(proxy_url, ProxyStats()).add_success(latency)
+            self.__rank()
+
+    def report_failure(self, proxy_url: str) -> None:
+        """
+        Records a failure of a live proxy and evicts it after max_failures
+        failures in a row.
+        """
+        with self.lock:
+            stats = self.stats.get(proxy_url)
+            if stats is None:
+                return
+            stats.add_failure()
+            if stats.consecutive_failures >= self.max_failures:
+                del self.stats[proxy_url]
+            self.__rank()
+
+    def get(self, exclude: str = None) -> str:
+        """
+        Returns the best live proxy other than the excluded one, unless it is
+        the only one. It does not wait: if there are no live proxies, for
+        example before the end of the first refresh, it requests a refresh in
+        the background and raises RuntimeError.
+        """
+        self.__start()
+        ranking = self.ranking
+        if not ranking:
+            self.refresh_requested.set()
+            raise RuntimeError('There are no live proxies at this time.')
+        if ranking[0] == exclude and len(ranking) > 1:
+            return ranking[1]
+        return ranking[0]
+
+
+@lru_cache(maxsize=None)
+def get_proxy_pool() -> ProxyPool:
+    """
+    Returns the proxy pool shared by the worker process.
+    """
+    return ProxyPool()
@@ -0,0 +1,82 @@
+import threading
+from functools import lru_cache
+from typing import Dict, Tuple, Union
+from urllib.parse import urlparse
+
+from fake_useragent import UserAgent
+from requests.utils import default_headers
+
+from parsers.connection_types.direct import Direct
+from parsers.connection_types.proxy import Proxy
+from parsers.connection_types.tor import Tor
+from parsers.connection_types.tor_pool import TorPool
+
+Connection = Union[Tor, TorPool, Proxy, Direct]
+
+
+class ConnectionRegistry:
+    """
+    A registry of the warm connections of a worker process. The connections
+    are keyed by the connection type, the host of the endpoint and the index
+    of the thread that uses them, and are reused by all parser runs of the
+    process, so that the keep-alive sessions, the address of the Tor host
+    and the selected proxy are not created again for each parser.
+
+    Attributes:
+        connection_classes (dict): The connection classes by connection type.
+        connections (dict): The connections keyed by (connection_type, host,
+            index).
+    """
+    connection_classes: Dict[str, type] = {
+        'Tor': Tor, 'TorPool': TorPool, 'Proxy': Proxy, 'Direct': Direct
+    }
+
+    def __init__(self) -> None:
+        self.connections: Dict[Tuple[str, str, int], Connection] = {}
+        self.lock = threading.Lock()
+
+    def get(self, connection_type: str, endpoint: str, index: int = 0
+            ) -> Connection:
+        """
+        Returns the connection of the given type to the host of the endpoint,
+        creating it if needed. The headers left in its session by the
+        previous parser are reset.
+        """
+        if connection_type not in self.connection_classes:
+            raise ValueError(f'Invalid connection type: {connection_type}')
+        key = (connection_type, urlparse(endpoint).netloc, index)
+        with self.lock:
+            if key not in self.connections:
+                self.connections[key] = self.connection_classes[
+                    connection_type]()
+            connection = self.connections[key]
+        connection.session.headers = default_headers()
+        return connection
+
+    def invalidate(self, connection: Connection) -> None:
+        """
+        Removes the connection from the registry, so that a new one is
+        created the next time it is requested. It is used when the
+        connection could not be renewed.
+        """
+        with self.lock:
+            for key, registered_connection in list(self.connections.items()):
+                if registered_connection is connection:
+                    del self.connections[key]
+
+
+@lru_cache(maxsize=None)
+def get_connection_registry() -> ConnectionRegistry:
+    """
+    Returns the connection registry shared by the worker process.
+    """
+    return ConnectionRegistry()
+
+
+@lru_cache(maxsize=None)
+def get_user_agent() -> UserAgent:
+    """
+    Returns the fake user agent shared by the worker process, whose browsers
+    data is loaded only once.
+    """
+    return UserAgent()
@@ -0,0 +1,18 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from arbitration.settings import PARSING_POOL_MAXSIZE
+
+
+def create_session() -> requests.sessions.Session:
+    """
+    Creates a requests session whose adapters keep up to PARSING_POOL_MAXSIZE
+    keep-alive connections to each host, so that the connections and their
+    TLS state are reused by the following requests.
+    """
+    session = requests.session()
+    adapter = HTTPAdapter(pool_connections=PARSING_POOL_MAXSIZE,
+                          pool_maxsize=PARSING_POOL_MAXSIZE)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
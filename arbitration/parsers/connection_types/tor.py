@@ -1,12 +1,15 @@
 import re
 import subprocess
+from functools import lru_cache
 from time import sleep
 
 import requests
-from stem import Signal
+from stem import Signal, SocketError
 from stem.control import Controller
 from stem.util import log
 
+from parsers.connection_types.session import create_session
+
 
 class Tor:
     """
@@ -26,7 +29,7 @@ class Tor:
         creating a new Tor session.
         """
         log.get_logger().propagate = False  # Disable Tor's redundant logging.
-        self.container_ip: str = self.__get_tor_ip()
+        self.container_ip: str = self.__get_tor_ip(self.TOR_HOSTNAME)
         self.session: requests.sessions.Session = self.__set_tor_session()
 
     def __set_tor_session(self) -> requests.sessions.Session:
@@ -34,16 +37,19 @@ class Tor:
         Set up a proxy for http and https on the running Tor host: port 9050
         and initialize the request session.
         """
-        with requests.session() as session:
-            session.proxies = {'http': f'socks5h://{self.TOR_HOSTNAME}:9050',
-                               'https': f'socks5h://{self.TOR_HOSTNAME}:9050'}
-            return session
+        session = create_session()
+        session.proxies = {'http': f'socks5h://{self.TOR_HOSTNAME}:9050',
+                           'https': f'socks5h://{self.TOR_HOSTNAME}:9050'}
+        return session
 
-    def __get_tor_ip(self) -> str:
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def __get_tor_ip(hostname: str) -> str:
         """
-        Retrieves the IP address of the running Tor host.
+        Retrieves the IP address of the running Tor host. It is cached for
+        the worker process.
         """
-        cmd = f'ping -c 1 {self.TOR_HOSTNAME}'
+        cmd = f'ping -c 1 {hostname}'
         output = subprocess.check_output(cmd, shell=True).decode().strip()
         return re.findall(r'\(.*?\)', output)[0][1:-1]
 
@@ -51,10 +57,20 @@ class Tor:
         """
         Renews the connection with the running Tor host by sending a signal to
         the Tor control port and creating a new Tor session with a new IP
-        address.
+        address. The old session is closed, so that its kept-alive
+        connections through the old circuit are not reused. If the control
+        port is unreachable, the cached IP address of the Tor host is
+        resolved again.
         """
-        with Controller.from_port(address=self.container_ip) as controller:
+        try:
+            controller = Controller.from_port(address=self.container_ip)
+        except SocketError:
+            self.__get_tor_ip.cache_clear()
+            self.container_ip = self.__get_tor_ip(self.TOR_HOSTNAME)
+            controller = Controller.from_port(address=self.container_ip)
+        with controller:
             controller.authenticate()
             controller.signal(Signal.NEWNYM)
             sleep(controller.get_newnym_wait())
+            self.session.close()
             self.session = self.__set_tor_session()
@@ -0,0 +1,89 @@
+import logging
+import secrets
+from concurrent.futures import ThreadPoolExecutor
+from queue import Empty, SimpleQueue
+
+import requests
+
+from arbitration.settings import TOR_POOL_SIZE, TOR_POOL_WARMUP_URL
+from parsers.connection_types.session import create_session
+
+
+class TorPool:
+    """
+    This class connects through the running Tor host with a pool of warm
+    isolated circuits. Each session uses its own SOCKS credentials, for which
+    Tor builds a separate circuit, because IsolateSOCKSAuth is enabled on the
+    SOCKS port by default. Renewing the connection swaps to a warm session
+    instantly instead of sending NEWNYM to the whole Tor host and waiting,
+    and a replacement circuit is built in the background.
+
+    Attributes:
+        request_timeout (int): The timeout value for HTTP requests.
+        pool_size (int): The number of warm sessions kept in the pool.
+        warmup_url (str): The URL requested through a new session to build
+            its circuit before it is used.
+        warmup_timeout (int): The timeout of the warm-up request.
+        TOR_HOSTNAME (str): Hostname docker container Tor.
+    """
+    request_timeout: int = None
+    pool_size: int = TOR_POOL_SIZE
+    warmup_url: str = TOR_POOL_WARMUP_URL
+    warmup_timeout: int = 30
+    TOR_HOSTNAME: str = 'tor_proxy'
+
+    def __init__(self) -> None:
+        """
+        Initializes the pool with a new session and starts building the warm
+        ones in the background.
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.warm_sessions: SimpleQueue = SimpleQueue()
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.pool_size, thread_name_prefix='tor_pool'
+        )
+        self.session: requests.sessions.Session = self.__set_tor_session()
+        for _ in range(self.pool_size):
+            self.executor.submit(self.__warm_up_session)
+
+    def __set_tor_session(self) -> requests.sessions.Session:
+        """
+        Sets up a session whose proxy for http and https on the running Tor
+        host: port 9050 has new random credentials, so that it gets its own
+        circuit.
+        """
+        credentials = secrets.token_hex(8)
+        proxy = (f'socks5h://{credentials}:{credentials}@'
+                 f'{self.TOR_HOSTNAME}:9050')
+        session = create_session()
+        session.proxies = {'http': proxy, 'https': proxy}
+        return session
+
+    def __warm_up_session(self) -> None:
+        """
+        Builds the circuit of a new session with a request to the warm-up URL
+        and adds the session to the pool. Sessions whose circuit failed are
+        discarded.
+        """
+        session = self.__set_tor_session()
+        try:
+            session.head(self.warmup_url, timeout=self.warmup_timeout)
+        except requests.RequestException as error:
+            message = f'Failed to warm up a Tor circuit: {error}'
+            self.logger.error(message)
+            session.close()
+            return
+        self.warm_sessions.put(session)
+
+    def renew_connection(self) -> None:
+        """
+        Renews the connection by closing the current session and swapping to
+        a warm one, or to a new one if the pool is empty, and starts building
+        a replacement in the background.
+        """
+        self.session.close()
+        try:
+            self.session = self.warm_sessions.get_nowait()
+        except Empty:
+            self.session = self.__set_tor_session()
+        self.executor.submit(self.__warm_up_session)
@@ -1,12 +1,123 @@
-from typing import Any, Dict
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
+from django.core.cache import cache
+
+from arbitration.settings import PARSING_COOKIES_TTL, PARSING_SHARED_COOKIES
+
+
+class CookieStore:
+    """
+    A store of the cookies obtained from the endpoints, so that they are
+    reused by the parsers and their runs until they expire or are rejected
+    by the endpoint. The cookies are keyed by the host of the endpoint and
+    the identity of the connection, which is the proxy of its session or
+    direct, since the endpoint may bind them to the address of the client.
+    They are kept in the memory of the worker process and, if shared is set,
+    in the cache, so that the other processes also reuse them.
+
+    Attributes:
+        ttl (int): The lifetime in seconds of the cookies without an expiry
+            date, and the maximum lifetime of the other ones.
+        shared (bool): If True, the cookies are also stored in the cache.
+        cookies (dict): The cookies and the time at which they expire, keyed
+            by the host and the identity of the connection.
+        CACHE_KEY_PREFIX (str): The prefix of the cache keys.
+    """
+    ttl: int = PARSING_COOKIES_TTL
+    shared: bool = PARSING_SHARED_COOKIES
+    CACHE_KEY_PREFIX: str = 'parsing_cookies'
+
+    def __init__(self) -> None:
+        self.cookies: Dict[Tuple[str, str], Tuple[Dict[str, Any], float]] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(endpoint: str, session: requests.sessions.Session
+                 ) -> Tuple[str, str]:
+        """
+        Returns the host of the endpoint and the identity of the connection
+        whose session is given.
+        """
+        url = urlparse(endpoint)
+        identity = (session.proxies or {}).get(url.scheme) or 'direct'
+        return url.netloc, identity
+
+    def __get_cache_key(self, key: Tuple[str, str]) -> str:
+        """
+        Returns the cache key of the cookies.
+        """
+        return ':'.join((self.CACHE_KEY_PREFIX, *key))
+
+    def get(self, endpoint: str, session: requests.sessions.Session
+            ) -> Optional[Dict[str, Any]]:
+        """
+        Returns the unexpired cookies of the endpoint for the connection, or
+        None if there are none.
+        """
+        key = self._get_key(endpoint, session)
+        with self.lock:
+            cookies, expires_at = self.cookies.get(key, (None, 0))
+        if expires_at > time.time():
+            return cookies
+        if self.shared:
+            value = cache.get(self.__get_cache_key(key))
+            if value is not None:
+                with self.lock:
+                    self.cookies[key] = value
+                return value[0]
+        return None
+
+    def set(self, endpoint: str, session: requests.sessions.Session,
+            cookies: Dict[str, Any], expires_at: float) -> None:
+        """
+        Stores the cookies of the endpoint for the connection until the given
+        time, removing the expired cookies of the other connections.
+        """
+        now = time.time()
+        expires_at = min(expires_at, now + self.ttl)
+        key = self._get_key(endpoint, session)
+        with self.lock:
+            self.cookies = {
+                other_key: value for other_key, value in self.cookies.items()
+                if value[1] > now
+            }
+            self.cookies[key] = cookies, expires_at
+        if self.shared:
+            cache.set(self.__get_cache_key(key), (cookies, expires_at),
+                      timeout=max(1, int(expires_at - now)))
+
+    def invalidate(self, endpoint: str, session: requests.sessions.Session
+                   ) -> None:
+        """
+        Removes the cookies of the endpoint for the connection, when the
+        endpoint has rejected them.
+        """
+        key = self._get_key(endpoint, session)
+        with self.lock:
+            self.cookies.pop(key, None)
+        if self.shared:
+            cache.delete(self.__get_cache_key(key))
+
+
+@lru_cache(maxsize=None)
+def get_cookie_store() -> CookieStore:
+    """
+    Returns the cookie store shared by the worker process.
+    """
+    return CookieStore()
 
 
 class Cookie:
     """
     This class represents a set of cookies that can be added to the headers of
-    HTTP requests made using a requests session object.
+    HTTP requests made using a requests session object. The cookies are taken
+    from the cookie store and are only obtained from the endpoint if there
+    are no unexpired ones for the connection.
 
     Attributes:
         endpoint (str): The URL of the endpoint that will be requested to
@@ -21,22 +132,36 @@ class Cookie:
     def __init__(self, endpoint: str, session: requests.sessions.Session,
                  cookies_names=None) -> None:
         """
-        Initializes a new Cookie instance by obtaining the cookies from the
-        specified endpoint using the provided session object. If cookies_names
-        is not provided, all cookies obtained will be used.
+        Initializes a new Cookie instance with the stored cookies or by
+        obtaining the cookies from the specified endpoint using the provided
+        session object. If cookies_names is not provided, all cookies obtained
+        will be used.
         """
         self.endpoint: str = endpoint
         self.session: requests.sessions.Session = session
-        self.cookies: Dict[str, Any] = self.__get_cookies()
+        self.cookies: Dict[str, Any] = get_cookie_store().get(
+            endpoint, session) or self.__get_cookies()
         self.cookies_names: str = cookies_names or self.cookies.keys()
 
     def __get_cookies(self) -> Dict[str, Any]:
         """
         Private method that obtains the cookies from the endpoint using the
-        session object and returns them as a dictionary.
+        session object, stores them until the earliest expiry date among them
+        and returns them as a dictionary. The Content-Length header of the
+        request body is not sent with the request without a body, so that
+        the kept-alive connection is not broken.
         """
-        self.session.get(self.endpoint)
-        return self.session.cookies.get_dict()
+        self.session.get(self.endpoint, headers={'Content-Length': None})
+        cookies = self.session.cookies.get_dict()
+        expiry_dates = [
+            cookie.expires for cookie in self.session.cookies
+            if cookie.expires is not None
+        ]
+        get_cookie_store().set(
+            self.endpoint, self.session, cookies,
+            min(expiry_dates, default=float('inf'))
+        )
+        return cookies
 
     def add_cookies_to_headers(self) -> None:
         """
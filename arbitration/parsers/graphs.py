@@ -0,0 +1,226 @@
+import heapq
+from collections import defaultdict, namedtuple
+from itertools import count
+from math import inf, log
+from typing import Dict, List, Optional, Tuple
+
+from banks.models import Banks
+from parsers.snapshots import RateSnapshot
+
+Chain = namedtuple('Chain', (
+    'input_crypto_exchange', 'interim_crypto_exchange',
+    'second_interim_crypto_exchange', 'output_crypto_exchange',
+    'bank_exchange'
+))
+
+
+class ArbitrageGraph:
+    """
+    A weighted graph of a crypto exchange built from a rate snapshot. Fiats
+    held in banks and crypto assets are the nodes, and every fresh rate is an
+    edge with the weight -log(price), so the most profitable chain is the
+    path with the smallest total weight. Deposits lead from a bank fiat to an
+    asset, intra crypto exchanges lead from one asset to another, withdrawals
+    lead from an asset to a bank fiat, and bank exchanges close the chain
+    back to the input fiat.
+
+    Attributes:
+        max_interim_exchanges (int): The maximum number of intra crypto
+            exchanges in a chain. InterExchanges can store up to two.
+    """
+    max_interim_exchanges: int = 2
+
+    def __init__(self, snapshot: RateSnapshot, banks_config: dict) -> None:
+        self.snapshot = snapshot
+        self.banks_config = banks_config
+        self.buy_edges: Dict[Tuple[int, str], List[tuple]] = defaultdict(list)
+        self.sell_edges: Dict[Tuple[int, str], List[tuple]] = defaultdict(
+            list)
+        self.intra_edges: Dict[str, List[tuple]] = defaultdict(list)
+        self.bank_edges: Dict[Tuple[str, str], List[tuple]] = defaultdict(
+            list)
+        self.__add_crypto_exchanges_edges()
+        self.__add_intra_crypto_exchanges_edges()
+        self.__add_banks_exchanges_edges()
+
+    @staticmethod
+    def _get_weight(price: float) -> float:
+        """
+        Converts a price into the weight of an edge.
+        """
+        return -log(price) if price and price > 0 else inf
+
+    def __add_crypto_exchanges_edges(self) -> None:
+        """
+        Adds deposit and withdrawal edges, keeping only the transaction
+        methods supported by the bank.
+        """
+        transaction_methods = {
+            bank.id: self.banks_config[name]['transaction_methods']
+            for name, bank in self.snapshot.banks.items()
+            if name in self.banks_config
+        }
+        for (bank_id, trade_type, fiat), rates in (
+                self.snapshot.crypto_exchanges_rates.items()
+        ):
+            for rate in rates:
+                if rate.transaction_method is not None and (
+                        rate.transaction_method not in
+                        transaction_methods.get(bank_id, ())):
+                    continue
+                weight = self._get_weight(rate.price)
+                if trade_type == 'BUY':
+                    self.buy_edges[bank_id, fiat].append(
+                        (weight, rate.asset, rate))
+                else:  # SELL
+                    self.sell_edges[bank_id, rate.asset].append(
+                        (weight, fiat, rate))
+
+    def __add_intra_crypto_exchanges_edges(self) -> None:
+        """
+        Adds the edges of the exchanges between assets inside the crypto
+        exchange.
+        """
+        for (from_asset, to_asset), rate in (
+                self.snapshot.intra_crypto_exchanges_rates.items()
+        ):
+            self.intra_edges[from_asset].append(
+                (self._get_weight(rate.price), to_asset, rate))
+
+    def __add_banks_exchanges_edges(self) -> None:
+        """
+        Adds the edges of the exchanges between fiats inside the banks.
+        """
+        for (bank_id, from_fiat, to_fiat), rates in (
+                self.snapshot.banks_exchange_rates.items()
+        ):
+            for rate in rates:
+                self.bank_edges[from_fiat, to_fiat].append(
+                    (self._get_weight(rate.price), bank_id, rate))
+
+    def __get_finishes(self, input_bank: Banks, output_bank: Banks,
+                       input_fiat: str, simpl: bool) -> Dict[str, list]:
+        """
+        Returns, for each asset, all the ways to withdraw it to the output
+        bank and get back to the input fiat, sorted by weight.
+        """
+        output_fiats = self.banks_config[output_bank.name]['currencies']
+        finishes = defaultdict(list)
+        for (bank_id, asset), edges in self.sell_edges.items():
+            if bank_id != output_bank.id:
+                continue
+            for weight, output_fiat, output_rate in edges:
+                if output_fiat not in output_fiats:
+                    continue
+                if simpl:
+                    if output_fiat == input_fiat:
+                        finishes[asset].append((weight, output_rate, None))
+                    continue
+                if output_fiat == input_fiat:
+                    continue
+                for bank_weight, bank_id_exchange, bank_rate in (
+                        self.bank_edges.get((output_fiat, input_fiat), ())
+                ):
+                    if bank_id_exchange not in (input_bank.id, output_bank.id):
+                        continue
+                    finishes[asset].append(
+                        (weight + bank_weight, output_rate, bank_rate))
+        for asset_finishes in finishes.values():
+            asset_finishes.sort(key=lambda finish: finish[0])
+        return finishes
+
+    def __get_lower_bounds(self, finishes: Dict[str, list]
+                           ) -> List[Dict[str, float]]:
+        """
+        Returns the smallest weight with which a chain can be completed from
+        each asset when there are 0, 1 or more intra crypto exchanges left.
+        It is used to discard partial chains that cannot become good enough.
+        """
+        lower_bounds = [{
+            asset: asset_finishes[0][0]
+            for asset, asset_finishes in finishes.items()
+        }]
+        for _ in range(self.max_interim_exchanges):
+            previous_bounds = lower_bounds[-1]
+            bounds = dict(previous_bounds)
+            for from_asset, edges in self.intra_edges.items():
+                for weight, to_asset, _ in edges:
+                    bound = weight + previous_bounds.get(to_asset, inf)
+                    if bound < bounds.get(from_asset, inf):
+                        bounds[from_asset] = bound
+            lower_bounds.append(bounds)
+        return lower_bounds
+
+    def get_best_chains(
+            self, input_bank: Banks, output_bank: Banks, simpl: bool,
+            best_chains: int, min_percentage: float,
+            max_percentage: Optional[float] = None
+    ) -> Tuple[List[Chain], List[Chain]]:
+        """
+        Finds the best chains from the input bank to the output bank with a
+        depth-first search bounded by the number of intra crypto exchanges.
+        Partial chains are pruned as soon as their weight plus the lower
+        bound of their completion exceeds either the minimum percentage or
+        the worst of the best chains found so far. Returns the best chains
+        and the chains rejected for exceeding the maximum percentage.
+        """
+        max_weight = -log(1 + min_percentage / 100)
+        min_weight = (-log(1 + max_percentage / 100)
+                      if max_percentage is not None else -inf)
+        best = []
+        rejected = []
+        counter = count()
+
+        def get_bound() -> float:
+            if len(best) < best_chains:
+                return max_weight
+            return min(max_weight, -best[0][0])
+
+        def add_chain(weight: float, chain: Chain) -> None:
+            if weight < min_weight:
+                rejected.append(chain)
+                return
+            item = (-weight, next(counter), chain)
+            if len(best) < best_chains:
+                heapq.heappush(best, item)
+            else:
+                heapq.heappushpop(best, item)
+
+        def visit(input_rate, asset: str, weight: float, interims: tuple,
+                  visited: tuple) -> None:
+            hops_left = self.max_interim_exchanges - len(interims)
+            if weight + lower_bounds[hops_left].get(asset, inf) > get_bound():
+                return
+            for finish_weight, output_rate, bank_rate in finishes.get(
+                    asset, ()):
+                total_weight = weight + finish_weight
+                if total_weight > get_bound():
+                    break
+                interim, second_interim = (interims + (None, None))[:2]
+                add_chain(total_weight, Chain(
+                    input_rate, interim, second_interim, output_rate,
+                    bank_rate
+                ))
+            if not hops_left:
+                return
+            for intra_weight, to_asset, intra_rate in self.intra_edges.get(
+                    asset, ()):
+                if to_asset in visited:
+                    continue
+                visit(input_rate, to_asset, weight + intra_weight,
+                      interims + (intra_rate,), visited + (to_asset,))
+
+        input_fiats = self.banks_config[input_bank.name]['currencies']
+        for input_fiat in input_fiats:
+            buy_edges = self.buy_edges.get((input_bank.id, input_fiat))
+            if not buy_edges:
+                continue
+            finishes = self.__get_finishes(input_bank, output_bank,
+                                           input_fiat, simpl)
+            if not finishes:
+                continue
+            lower_bounds = self.__get_lower_bounds(finishes)
+            for weight, asset, input_rate in buy_edges:
+                visit(input_rate, asset, weight, (), (asset,))
+        chains = [chain for _, _, chain in sorted(best, reverse=True)]
+        return chains, rejected
@@ -0,0 +1,256 @@
+import logging
+import random
+import threading
+import time
+from functools import lru_cache
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple
+
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+
+ACQUIRE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated', 'rate',
+                         'backoff_until')
+local now = tonumber(ARGV[1])
+local rate = tonumber(state[3]) or tonumber(ARGV[2])
+local capacity = math.max(1, rate)
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+local backoff_until = tonumber(state[4]) or 0
+tokens = math.min(capacity, tokens + (now - updated) * rate)
+local wait = math.max(0, (1 - tokens) / rate, backoff_until - now)
+if wait == 0 then
+    tokens = tokens - 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return tostring(wait)
+"""
+SUCCESS_SCRIPT = """
+local rate = tonumber(redis.call('HGET', KEYS[1], 'rate')) or tonumber(ARGV[1])
+rate = math.min(tonumber(ARGV[1]), rate + tonumber(ARGV[2]))
+redis.call('HSET', KEYS[1], 'rate', rate, 'failures', 0)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+"""
+FAILURE_SCRIPT = """
+local state = redis.call('HMGET', KEYS[1], 'rate', 'failures',
+                         'backoff_until')
+local now = tonumber(ARGV[1])
+if now < (tonumber(state[3]) or 0) then
+    return
+end
+local rate = tonumber(state[1]) or tonumber(ARGV[2])
+local failures = (tonumber(state[2]) or 0) + 1
+if ARGV[3] == '1' then
+    rate = math.max(tonumber(ARGV[4]), rate * tonumber(ARGV[5]))
+end
+local backoff = tonumber(ARGV[6]) * math.min(
+    tonumber(ARGV[8]), tonumber(ARGV[7]) * 2 ^ (failures - 1))
+redis.call('HSET', KEYS[1], 'rate', rate, 'failures', failures,
+           'backoff_until', now + backoff)
+redis.call('EXPIRE', KEYS[1], ARGV[9])
+"""
+
+
+class LocalRateLimitStore:
+    """
+    The in-process store of the rate limiter state, used when the cache is
+    not Redis or Redis is unavailable. It runs the same algorithm as the Lua
+    scripts of RedisRateLimitStore, but is only shared by the threads of one
+    process.
+
+    Attributes:
+        states (dict): The state of each API keyed by the Redis key.
+    """
+    def __init__(self) -> None:
+        self.states: Dict[str, Dict[str, float]] = {}
+        self.lock = threading.Lock()
+
+    def try_acquire(self, key: str, now: float, max_rate: float, expire: int
+                    ) -> float:
+        with self.lock:
+            state = self.states.setdefault(key, {})
+            rate = state.get('rate', max_rate)
+            capacity = max(1, rate)
+            tokens = state.get('tokens', capacity)
+            updated = state.get('updated', now)
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            wait = max(0, (1 - tokens) / rate,
+                       state.get('backoff_until', 0) - now)
+            if wait == 0:
+                tokens -= 1
+            state.update(tokens=tokens, updated=now)
+            return wait
+
+    def report_success(self, key: str, max_rate: float, rate_increase: float,
+                       expire: int) -> None:
+        with self.lock:
+            state = self.states.setdefault(key, {})
+            state['rate'] = min(
+                max_rate, state.get('rate', max_rate) + rate_increase)
+            state['failures'] = 0
+
+    def report_failure(self, key: str, now: float, max_rate: float,
+                       throttled: bool, min_rate: float,
+                       rate_decrease: float, jitter: float,
+                       base_backoff: float, max_backoff: float, expire: int
+                       ) -> None:
+        with self.lock:
+            state = self.states.setdefault(key, {})
+            if now < state.get('backoff_until', 0):
+                return
+            rate = state.get('rate', max_rate)
+            failures = state.get('failures', 0) + 1
+            if throttled:
+                rate = max(min_rate, rate * rate_decrease)
+            backoff = jitter * min(
+                max_backoff, base_backoff * 2 ** (failures - 1))
+            state.update(rate=rate, failures=failures,
+                         backoff_until=now + backoff)
+
+
+class RedisRateLimitStore:
+    """
+    The store of the rate limiter state in Redis, shared by all worker
+    processes. Each operation is one atomic Lua script.
+    """
+    def __init__(self) -> None:
+        client = get_redis_connection('default')
+        self.acquire_script = client.register_script(ACQUIRE_SCRIPT)
+        self.success_script = client.register_script(SUCCESS_SCRIPT)
+        self.failure_script = client.register_script(FAILURE_SCRIPT)
+
+    def try_acquire(self, key: str, now: float, max_rate: float, expire: int
+                    ) -> float:
+        return float(self.acquire_script(
+            keys=[key], args=[repr(now), repr(max_rate), expire]))
+
+    def report_success(self, key: str, max_rate: float, rate_increase: float,
+                       expire: int) -> None:
+        self.success_script(
+            keys=[key], args=[repr(max_rate), repr(rate_increase), expire])
+
+    def report_failure(self, key: str, now: float, max_rate: float,
+                       throttled: bool, min_rate: float,
+                       rate_decrease: float, jitter: float,
+                       base_backoff: float, max_backoff: float, expire: int
+                       ) -> None:
+        self.failure_script(keys=[key], args=[
+            repr(now), repr(max_rate), int(throttled), repr(min_rate),
+            repr(rate_decrease), repr(jitter), repr(base_backoff),
+            repr(max_backoff), expire
+        ])
+
+
+@lru_cache(maxsize=None)
+def get_rate_limit_stores() -> Tuple[Optional[RedisRateLimitStore],
+                                     LocalRateLimitStore]:
+    """
+    Returns the Redis store of the worker process, or None if the cache is
+    not Redis, and the local store used as a fallback.
+    """
+    try:
+        redis_store = RedisRateLimitStore()
+    except NotImplementedError:
+        redis_store = None
+    return redis_store, LocalRateLimitStore()
+
+
+class RateLimiter:
+    """
+    A token bucket rate limiter of the requests to one upstream API, whose
+    state is stored in Redis, so that all parsing worker processes respect
+    it. Before each request, the caller takes a token, waiting while there is
+    none, so that a lowered rate or a backoff also applies to the requests
+    that are already waiting. The rate adapts to the API: it is decreased
+    multiplicatively on each 429 or 403 response and increased additively on
+    each success up to max_rate. After a failure, the requests to the API
+    back off exponentially with full jitter, so the other APIs are not
+    affected. The failures of the requests sent before the backoff started
+    are ignored, so that a burst of concurrent failures counts once.
+
+    Attributes:
+        api (str): The name of the API, usually the host of the endpoint.
+        max_rate (float): The maximum rate of requests per second.
+        min_rate (float): The minimum rate of requests per second.
+        rate_increase (float): The rate added after each success.
+        rate_decrease (float): The factor of the rate after each 429 or 403
+            response.
+        base_backoff (float): The maximum backoff in seconds after the first
+            failure, doubled after each next one.
+        max_backoff (float): The maximum backoff in seconds.
+        throttling_statuses (tuple): The response statuses by which the API
+            signals that the requests are too frequent.
+        expire (int): The time in seconds after which the state of an unused
+            API is removed.
+        KEY_PREFIX (str): The prefix of the Redis keys.
+    """
+    min_rate: float = 0.2
+    rate_increase: float = 0.1
+    rate_decrease: float = 0.5
+    base_backoff: float = 1
+    max_backoff: float = 60
+    throttling_statuses: Tuple[int] = (HTTPStatus.TOO_MANY_REQUESTS,
+                                       HTTPStatus.FORBIDDEN)
+    expire: int = 3600
+    KEY_PREFIX: str = 'parsing_rate_limit'
+
+    def __init__(self, api: str, max_rate: float) -> None:
+        self.api = api
+        self.max_rate = max_rate
+        self.key = f'{self.KEY_PREFIX}:{api}'
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def __call_store(self, method: str, *args) -> Optional[float]:
+        """
+        Calls the method of the Redis store, or of the local store if Redis
+        is not used or fails.
+        """
+        redis_store, local_store = get_rate_limit_stores()
+        if redis_store is not None:
+            try:
+                return getattr(redis_store, method)(self.key, *args)
+            except RedisError as error:
+                message = (f'Rate limiter of {self.api} falls back to the '
+                           f'local state: {error}')
+                self.logger.error(message)
+        return getattr(local_store, method)(self.key, *args)
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token for a request if there is one and the API is not backed
+        off, returning 0, otherwise returns the time in seconds to wait
+        before trying again.
+        """
+        return self.__call_store(
+            'try_acquire', time.time(), self.max_rate, self.expire)
+
+    def acquire(self) -> None:
+        """
+        Waits until a token for a request is taken.
+        """
+        wait = self.try_acquire()
+        while wait > 0:
+            time.sleep(wait)
+            wait = self.try_acquire()
+
+    def report_success(self) -> None:
+        """
+        Increases the rate after a successful response and resets the
+        backoff.
+        """
+        self.__call_store('report_success', self.max_rate,
+                          self.rate_increase, self.expire)
+
+    def report_failure(self, status_code: int = None) -> None:
+        """
+        Backs off the requests to the API after a failed request, and
+        decreases the rate if the API throttled it.
+        """
+        self.__call_store(
+            'report_failure', time.time(), self.max_rate,
+            status_code in self.throttling_statuses, self.min_rate,
+            self.rate_decrease, random.random(), self.base_backoff,
+            self.max_backoff, self.expire
+        )
@@ -1,6 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
+from typing import Dict
 
 from arbitration.settings import (LOGLEVEL_CALCULATING_END,
                                   LOGLEVEL_CALCULATING_START,
@@ -175,12 +176,15 @@ class CalculatingLogger(BaseLogger, ABC):
             complex.
         international (bool): Specifies the list of output banks, only
             international or only local.
+        pruned_candidates (Dict[str, int]): The count of candidates discarded
+            by branch and bound at each level of the chain enumeration.
     """
     loglevel_start: str = LOGLEVEL_CALCULATING_START
     loglevel_end: str = LOGLEVEL_CALCULATING_END
     simpl: bool
     international: bool
     full_update: bool
+    pruned_candidates: Dict[str, int] = None
 
     def _logger_queue_overflowing(self):
         """
@@ -193,3 +197,22 @@ class CalculatingLogger(BaseLogger, ABC):
             f'{self.international}, full_update: {self.full_update}. '
         )
         self.logger.error(message)
+
+    def __logger_pruned_candidates(self) -> str:
+        """
+        Adds a message to the logger about the count of pruned candidates at
+        each level of the chain enumeration.
+        """
+        message = ''
+        if self.pruned_candidates and any(self.pruned_candidates.values()):
+            message += 'Pruned candidates: ' + ', '.join(
+                f'{level}: {count}'
+                for level, count in self.pruned_candidates.items()
+            ) + '. '
+        return message
+
+    def _logger_end(self, *args) -> None:
+        """
+        Logs the end of the calculating logger.
+        """
+        super()._logger_end(*args, self.__logger_pruned_candidates())
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
+import asyncio
+import copy
 import json
 import random
-import time
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from http import HTTPStatus
 from itertools import combinations, permutations, product
-from typing import Any, Dict, List, Optional, Tuple, Union
+from queue import SimpleQueue
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+from urllib.parse import urlparse
 
+import aiohttp
 import requests
-from fake_useragent import UserAgent
-
-from arbitration.settings import DATA_OBSOLETE_IN_MINUTES
+from aiohttp_socks import ProxyConnector
+from django.db import connection, models
+from django.db.models import Q, QuerySet
+
+from arbitration.settings import (CRYPTO_EXCHANGES_BATCH_PRICES,
+                                  DATA_OBSOLETE_IN_MINUTES,
+                                  PARSING_ASYNC_REQUESTS,
+                                  PARSING_CONCURRENT_REQUESTS,
+                                  PARSING_MAX_WORKERS,
+                                  PARSING_REQUESTS_PER_SECOND)
 from banks.models import (Banks, BanksExchangeRates, BanksExchangeRatesUpdates,
                           CurrencyMarkets)
 from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
@@ -20,14 +33,16 @@ from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
                                      IntraCryptoExchangesRates,
                                      IntraCryptoExchangesRatesUpdates,
                                      ListsFiatCrypto, ListsFiatCryptoUpdates)
-from parsers.connection_types.direct import Direct
-from parsers.connection_types.proxy import Proxy
-from parsers.connection_types.tor import Tor
-from parsers.cookie import Cookie
+from parsers.changes import ChangedRatesRecorder
+from parsers.connection_types.registry import (Connection,
+                                               get_connection_registry,
+                                               get_user_agent)
+from parsers.cookie import Cookie, get_cookie_store
+from parsers.limiter import RateLimiter
 from parsers.loggers import ParsingLogger
 
 
-class BaseParser(ParsingLogger, ABC):
+class BaseParser(ParsingLogger, ChangedRatesRecorder, ABC):
     """
     This is the base class for all parsers. BaseParser inherits from
     ParsingLogger and is an abstract class. It allows you to make requests to
@@ -38,8 +53,8 @@ class BaseParser(ParsingLogger, ABC):
         endpoint (str):  API endpoint URL
         updated_fields (List[str]):  List of fields to update
         bank_name (str): Placeholder for the bank name
-        connection_type (str): The type of the connection. Either Tor, Proxy
-            or Direct.
+        connection_type (str): The type of the connection. Either Tor,
+            TorPool, Proxy or Direct.
         request_method (str): The type of the request method. POST or GET.
         need_cookies (bool): A boolean indicating if cookies are needed.
         cookies_names (Tuple[str]): A tuple of cookie names.
@@ -49,12 +64,28 @@ class BaseParser(ParsingLogger, ABC):
         headers (Dict[str, Any]): A dictionary containing the headers.
         custom_user_agent (Tuple[str]): A tuple of custom user agent strings.
         user_agent_browser (str): The browser to use for fake user agent.
-        waiting_time (int): The amount of time to wait.
         fake_useragent (bool): A boolean indicating if a fake user agent is
             needed.
         content_type (str): The content type.
         request_timeout (int): The request timeout.
         connection_start_time (datetime): Time to start connecting to the API.
+        async_requests (bool): If True, the requests of _send_requests are
+            sent concurrently with asyncio instead of one after another.
+        concurrent_requests (int): The maximum number of simultaneous
+            requests to the endpoint in the async mode.
+        requests_per_second (float): The maximum rate of requests to the host
+            of the endpoint, shared by all worker processes. The rate limiter
+            lowers it while the API throttles the requests.
+        max_workers (int): If more than 1, the requests of _send_requests are
+            spread among this number of threads, each with its own connection.
+        batch_size (int): The number of records written in one statement.
+        compare_stored_records (bool): If False, the records are upserted
+            by the unique constraint without loading the stored ones first,
+            so the unchanged records are rewritten too.
+        confirmation_interval (timedelta): The updated_at of an unchanged
+            record is moved to the start of the run only once it is older
+            than this interval, so that the record stays up to date without
+            being written on every run.
 
         LIMIT_TRY (int): Maximum number of tries to make a request.
         CURRENCY_PAIR: Representing the number of currencies to combine.
@@ -71,43 +102,71 @@ class BaseParser(ParsingLogger, ABC):
     headers: Dict[str, Any] = None
     custom_user_agent: Tuple[str] = [None]
     user_agent_browser: str = 'chrome'
-    waiting_time: int = 0
     fake_useragent: bool = True
     content_type: str = 'application/json'
     request_timeout: int = None
     connection_start_time: datetime
+    async_requests: bool = PARSING_ASYNC_REQUESTS
+    concurrent_requests: int = PARSING_CONCURRENT_REQUESTS
+    requests_per_second: float = PARSING_REQUESTS_PER_SECOND
+    max_workers: int = PARSING_MAX_WORKERS
+    batch_size: int = 1000
+    compare_stored_records: bool = True
+    confirmation_interval: timedelta = timedelta(
+        minutes=DATA_OBSOLETE_IN_MINUTES / 2)
     LIMIT_TRY: int = 3
     CURRENCY_PAIR: int = 2
 
     def __init__(self) -> None:
         super().__init__()
         from banks.banks_config import BANKS_CONFIG
+        self.records_to_write = {}
         self.records_to_update = []
         self.records_to_create = []
+        self.unchanged_records = []
+        self.stored_records: Optional[Dict[tuple, tuple]] = None
+        self.unique_fields = self.__get_unique_constraint().fields
+        self.key_fields = tuple(
+            self.model._meta.get_field(name).attname
+            for name in self.unique_fields
+        )
+        self.compared_fields = [
+            field for field in self.updated_fields
+            if field not in ('update', 'updated_at')
+        ]
+        self.confirmed_fields = [
+            field for field in ('updated_at',) if field in self.updated_fields
+        ]
         self.first_request = True
         self.banks_config = BANKS_CONFIG
         self.connection = self.__choose_connection_type()
-        self.cookie = Cookie(
-            self.endpoint, self.connection.session, self.cookies_names
-        ) if self.need_cookies else None
-        self.user_agent = UserAgent()
+        self.user_agent = get_user_agent()
         self.count_try = 0
         self.request_value = {}
+        self.rate_limiter = RateLimiter(
+            urlparse(self.endpoint).netloc, self.requests_per_second)
+
+    def __get_unique_constraint(self) -> models.UniqueConstraint:
+        """
+        This private method returns the unique constraint of the model, by
+        which the stored record of a written one is found and upserted.
+        """
+        return next(
+            constraint for constraint in self.model._meta.constraints
+            if isinstance(constraint, models.UniqueConstraint)
+        )
 
-    def __choose_connection_type(self) -> Union[Tor, Proxy, Direct]:
+    def __choose_connection_type(self, index: int = 0) -> Connection:
         """
-        This private method creates an instance of the class to connect to the
-        request session via: Tor network or Proxy or Direct, depending on the
-        connection_type setting declared in the child class.
+        This private method returns the connection to the request session via:
+        Tor network, a pool of Tor circuits, Proxy or Direct, depending on the
+        connection_type setting declared in the child class. The warm
+        connection of the worker process to the host of the endpoint is taken
+        from the registry, the index distinguishes the connections of
+        parallel threads.
         """
-        self.connection_type.capitalize()
-        if self.connection_type == 'Tor':
-            return Tor()
-        if self.connection_type == 'Proxy':
-            return Proxy()
-        if self.connection_type == 'Direct':
-            return Direct()
-        raise ValueError(f'Invalid connection type: {self.connection_type}')
+        return get_connection_registry().get(
+            self.connection_type, self.endpoint, index)
 
     def __choose_request_method(self, body=None, params=None) -> str:
         """
@@ -176,9 +235,17 @@ class BaseParser(ParsingLogger, ABC):
     def __renew_connection(self, body: dict | None) -> None:
         """
         This private method runs all the necessary methods to renew connect.
+        The cookies of the connection are considered rejected by the endpoint.
         """
         start_time_renew_connection = datetime.now(timezone.utc)
-        self.connection.renew_connection()
+        if self.need_cookies:
+            get_cookie_store().invalidate(self.endpoint,
+                                          self.connection.session)
+        try:
+            self.connection.renew_connection()
+        except Exception:
+            get_connection_registry().invalidate(self.connection)
+            raise
         renew_connections_duration = (
             datetime.now(timezone.utc) - start_time_renew_connection
         ).seconds
@@ -189,6 +256,146 @@ class BaseParser(ParsingLogger, ABC):
         self.user_agent_spoiled = True
         self.count_try += 1
 
+    def _add_to_bulk_upsert(self, values: Dict[str, Any]) -> None:
+        """
+        Adds a record with the given values and the update of the run to be
+        written. A record with the same values of the unique constraint
+        replaces the one added before.
+        """
+        record = self.model(**values, update=self.new_update)
+        key = tuple(getattr(record, field) for field in self.key_fields)
+        self.records_to_write[key] = record
+
+    def _load_stored_records(self, records: QuerySet = None
+                             ) -> Dict[tuple, tuple]:
+        """
+        Loads the id, the update date and the values of the compared fields
+        of the stored records as named tuples keyed by the values of the
+        unique constraint in a single values_list query. Unless the stored
+        records are given, it selects the records whose value of each field
+        of the constraint is among the values of that field in the records to
+        write.
+        """
+        if records is None:
+            query = Q()
+            for index, field in enumerate(self.key_fields):
+                values = {key[index] for key in self.records_to_write}
+                field_query = Q(**{f'{field}__in': values - {None}})
+                if None in values:
+                    field_query |= Q(**{f'{field}__isnull': True})
+                query &= field_query
+            records = self.model.objects.filter(query)
+        key_length = len(self.key_fields)
+        return {
+            tuple(stored_record[:key_length]): stored_record
+            for stored_record in records.values_list(
+                *self.key_fields, 'id', *self.confirmed_fields,
+                *self.compared_fields, named=True
+            )
+        }
+
+    def _split_records_to_write(self) -> None:
+        """
+        Sets the ids of the stored records to the records to write with the
+        same values of the unique constraint and splits them into the records
+        to create and the records to update. The records whose compared
+        fields are equal to the stored ones are not written: they are only
+        confirmed if their updated_at is older than the confirmation
+        interval. The stored records are loaded unless the parser has already
+        loaded them. If the stored records are not compared and all records
+        can be upserted by the unique constraint, they are all written as the
+        records to update without any query.
+        """
+        if not self.records_to_write:
+            return
+        if not self.compare_stored_records and (
+                connection.features.supports_update_conflicts_with_target
+        ) and not any(None in key for key in self.records_to_write):
+            self.records_to_update = list(self.records_to_write.values())
+            return
+        if self.stored_records is None:
+            self.stored_records = self._load_stored_records()
+        confirmed_before = self.start_time - self.confirmation_interval
+        for key, record in self.records_to_write.items():
+            stored_record = self.stored_records.get(key)
+            if stored_record is None:
+                self.records_to_create.append(record)
+                continue
+            record.id = stored_record.id
+            stored_values = [
+                getattr(stored_record, field) for field in self.compared_fields
+            ]
+            values = [getattr(record, field) for field in self.compared_fields]
+            if values != stored_values or not self.confirmed_fields:
+                self.records_to_update.append(record)
+            elif stored_record.updated_at < confirmed_before:
+                self.unchanged_records.append(record)
+
+    def _bulk_upsert(self) -> None:
+        """
+        Writes the records with INSERT ... ON CONFLICT DO UPDATE, one
+        statement per batch_size records, updating the updated_fields of the
+        stored ones. The conflict target is the unique constraint of the
+        model, so the ids of the stored records are not needed. The nullable
+        columns of the constraint are never equal to each other in a unique
+        index, so the records to update with a null value in it are upserted
+        by the primary key instead. If the database does not support conflict
+        targets, the records are created and updated with separate statements.
+        """
+        if connection.features.supports_update_conflicts_with_target:
+            records_by_constraint = list(self.records_to_create)
+            records_by_id = []
+            for record in self.records_to_update:
+                if any(getattr(record, field) is None
+                       for field in self.key_fields):
+                    records_by_id.append(record)
+                else:
+                    records_by_constraint.append(record)
+            for records, unique_fields in (
+                    (records_by_constraint, self.unique_fields),
+                    (records_by_id, ['id'])
+            ):
+                self.model.objects.bulk_create(
+                    records, update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=self.updated_fields,
+                    batch_size=self.batch_size
+                )
+            return
+        self.model.objects.bulk_create(self.records_to_create,
+                                       batch_size=self.batch_size)
+        self.model.objects.bulk_update(
+            self.records_to_update, self.updated_fields,
+            batch_size=self.batch_size
+        )
+
+    def _confirm_unchanged_records(self) -> None:
+        """
+        Moves the updated_at of the unchanged records to be confirmed to the
+        start of the run, one statement per batch_size records, without
+        rewriting their values and update.
+        """
+        for index in range(0, len(self.unchanged_records), self.batch_size):
+            self.model.objects.filter(id__in=[
+                record.id for record in
+                self.unchanged_records[index:index + self.batch_size]
+            ]).update(updated_at=self.start_time)
+
+    def _get_stored_prices(self, rate_ids: List[int]
+                           ) -> List[Tuple[int, float]]:
+        """
+        Returns the saved prices of the rates from the stored records loaded
+        for the split, so that they are not queried again.
+        """
+        if self.stored_records is None:
+            return super()._get_stored_prices(rate_ids)
+        rate_ids = set(rate_ids)
+        return [
+            (stored_record.id, stored_record.price)
+            for stored_record in self.stored_records.values()
+            if stored_record.id in rate_ids
+        ]
+
     def _get_count_created_objects(self) -> None:
         """
         Sets the count of created objects to the count of records to create.
@@ -209,6 +416,7 @@ class BaseParser(ParsingLogger, ABC):
         """
         self.__start_request_handler(body, params)
         while self.count_try < self.LIMIT_TRY:
+            self.rate_limiter.acquire()
             try:
                 response = getattr(
                     self.connection.session,
@@ -226,6 +434,229 @@ class BaseParser(ParsingLogger, ABC):
             return response.json()
         return False
 
+    def _send_requests(self, requests_kwargs: List[Dict[str, Any]]
+                       ) -> List[dict | bool]:
+        """
+        Sends requests with the given keyword arguments of _send_request and
+        returns the responses in the same order. In the async mode all of them
+        are scheduled at once, with max_workers they are spread among threads,
+        otherwise they are sent one after another.
+        """
+        if len(requests_kwargs) < 2:
+            return [
+                self._send_request(**request_kwargs)
+                for request_kwargs in requests_kwargs
+            ]
+        if self.async_requests:
+            return asyncio.run(self.__send_async_requests(requests_kwargs))
+        if self.max_workers > 1:
+            return self.__send_threaded_requests(requests_kwargs)
+        return [
+            self._send_request(**request_kwargs)
+            for request_kwargs in requests_kwargs
+        ]
+
+    def __create_worker(self, connection: Connection) -> BaseParser:
+        """
+        This private method creates a copy of the parser with its own
+        connection and request state, which sends requests in one thread of
+        __send_threaded_requests.
+        """
+        worker = copy.copy(self)
+        worker.connection = connection
+        worker.headers = None
+        worker.request_value = {}
+        worker.count_try = 0
+        worker.cookie_spoiled = True
+        worker.user_agent_spoiled = True
+        worker.connections_duration = 0
+        worker.renew_connections_duration = 0
+        return worker
+
+    def __send_threaded_requests(self, requests_kwargs: List[Dict[str, Any]]
+                                 ) -> List[dict | bool]:
+        """
+        This private method sends the requests in a thread pool. Each request
+        borrows a worker from a pool of workers with their own connections,
+        the first of which reuses the connection of the parser, so that a slow
+        request does not stall the others. The durations of the workers are
+        added to the parser at the end.
+        """
+        workers_count = min(self.max_workers, len(requests_kwargs))
+        workers = [self.__create_worker(self.connection)] + [
+            self.__create_worker(self.__choose_connection_type(index))
+            for index in range(1, workers_count)
+        ]
+        idle_workers = SimpleQueue()
+        for worker in workers:
+            idle_workers.put(worker)
+
+        def send_request(request_kwargs: Dict[str, Any]) -> dict | bool:
+            worker = idle_workers.get()
+            try:
+                return worker._send_request(**request_kwargs)
+            finally:
+                idle_workers.put(worker)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers_count) as executor:
+                return list(executor.map(send_request, requests_kwargs))
+        finally:
+            for worker in workers:
+                self.connections_duration += worker.connections_duration
+                self.renew_connections_duration += (
+                    worker.renew_connections_duration)
+            self.connection = workers[0].connection
+
+    async def __send_async_requests(
+            self, requests_kwargs: List[Dict[str, Any]]
+    ) -> List[dict | bool]:
+        """
+        This private method sends the requests concurrently in one aiohttp
+        session built from the current connection and closes the sessions
+        when all the responses are received.
+        """
+        self._create_headers()
+        if self.need_cookies and self.cookie_spoiled:
+            self.__create_cookies()
+        self.__semaphore = asyncio.Semaphore(self.concurrent_requests)
+        self.__renew_lock = asyncio.Lock()
+        self.__connection_generation = 0
+        self.__async_sessions = [self.__create_async_session()]
+        try:
+            return await asyncio.gather(*(
+                self.__send_async_request(**request_kwargs)
+                for request_kwargs in requests_kwargs
+            ))
+        finally:
+            for async_session in self.__async_sessions:
+                await async_session.close()
+
+    def __create_async_session(self) -> aiohttp.ClientSession:
+        """
+        This private method creates an aiohttp session with the headers and
+        the SOCKS proxy of the current connection. HTTP proxies are passed
+        with each request instead.
+        """
+        headers = dict(self.connection.session.headers)
+        headers.pop('Content-Length', None)
+        proxy_url = self.__get_proxy_url()
+        if proxy_url is not None and proxy_url.startswith('socks'):
+            connector = ProxyConnector.from_url(
+                proxy_url.replace('socks5h://', 'socks5://'),
+                rdns=proxy_url.startswith('socks5h://'),
+                limit=self.concurrent_requests
+            )
+        else:
+            connector = aiohttp.TCPConnector(limit=self.concurrent_requests)
+        return aiohttp.ClientSession(connector=connector, headers=headers)
+
+    def __get_proxy_url(self) -> str | None:
+        """
+        This private method returns the proxy that the requests session of the
+        connection uses for the scheme of the endpoint, if any.
+        """
+        proxies = self.connection.session.proxies or {}
+        return proxies.get(urlparse(self.endpoint).scheme)
+
+    async def __wait_for_rate_limit(self) -> None:
+        """
+        This private method waits until a token of the rate limiter is taken.
+        The rate limiter is called in a thread, so that the event loop is not
+        blocked by Redis.
+        """
+        loop = asyncio.get_running_loop()
+        wait = await loop.run_in_executor(None, self.rate_limiter.try_acquire)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = await loop.run_in_executor(
+                None, self.rate_limiter.try_acquire)
+
+    async def __renew_async_connection(self, connection_generation: int,
+                                       body: dict | None) -> None:
+        """
+        This private method renews the connection once for all requests that
+        failed on the same connection. The blocking renew runs in a thread so
+        that the other requests are not stalled, and a new aiohttp session is
+        created for the renewed connection.
+        """
+        async with self.__renew_lock:
+            if connection_generation != self.__connection_generation:
+                return
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.__renew_connection, body)
+            if self.need_cookies:
+                await loop.run_in_executor(None, self.__create_cookies)
+            self.__async_sessions.append(self.__create_async_session())
+            self.__connection_generation += 1
+
+    async def __send_async_request(self, body=None, params=None, link_end=''
+                                   ) -> dict | bool:
+        """
+        Sends one request of __send_async_requests with the same retries,
+        renews and logging as _send_request and returns the response or False.
+        """
+        self.__give_more_tries_if_first_request()
+        count_try = self.count_try
+        request_value = {
+            'timeout': aiohttp.ClientTimeout(
+                total=self.request_timeout or self.connection.request_timeout
+            ),
+            'proxy': self.__get_proxy_url()
+        }
+        if request_value['proxy'] is not None and (
+                request_value['proxy'].startswith('socks')):
+            request_value['proxy'] = None
+        if self.request_method == 'get' or body is None:
+            request_value['params'] = params
+        else:
+            request_value['json'] = body
+        method = self.__choose_request_method(body=body, params=params)
+        while count_try < self.LIMIT_TRY:
+            connection_generation = self.__connection_generation
+            async_session = self.__async_sessions[-1]
+            await self.__wait_for_rate_limit()
+            connection_start_time = datetime.now(timezone.utc)
+            try:
+                async with self.__semaphore:
+                    async with async_session.request(
+                            method.upper(), self.endpoint + link_end,
+                            **request_value
+                    ) as response:
+                        status_code = response.status
+                        response_json = (
+                            await response.json(content_type=None)
+                            if status_code == HTTPStatus.OK else None
+                        )
+            except Exception as error:
+                message = (f'{error} with response, class: '
+                           f'{self.__class__.__name__}, count try: '
+                           f'{count_try}')
+                self.logger.error(message)
+                self.rate_limiter.report_failure()
+                await self.__renew_async_connection(connection_generation,
+                                                    body)
+                count_try += 1
+                continue
+            finally:
+                connections_duration = (
+                    datetime.now(timezone.utc) - connection_start_time
+                ).seconds
+                self.connections_duration += round(connections_duration, 2)
+            if status_code != HTTPStatus.OK:
+                message = (f'{status_code} status code with response, class: '
+                           f'{self.__class__.__name__}, count try: '
+                           f'{count_try}')
+                self.logger.error(message)
+                self.rate_limiter.report_failure(status_code)
+                await self.__renew_async_connection(connection_generation,
+                                                    body)
+                count_try += 1
+                continue
+            self._successful_response_handler()
+            return response_json
+        return False
+
     def _create_headers(self, body=None) -> None:
         """
         Method that create headers for request.
@@ -242,30 +673,37 @@ class BaseParser(ParsingLogger, ABC):
 
     def _successful_response_handler(self) -> None:
         """
-        Logs a message when a response is successfully handled.
+        Logs a message when a response is successfully handled and lets the
+        rate limiter raise the rate.
         """
         message = (f'Successful response with class: '
                    f'{self.__class__.__name__}')
         self.logger.info(message)
+        self.rate_limiter.report_success()
 
     def _unsuccessful_response_handler(self, error: Exception,
                                        body: dict | None) -> None:
         """
-        Logs an error message when a response cannot be handled.
+        Logs an error message when a response cannot be handled and backs off
+        the requests to the API.
         """
         message = (f'{error} with response, class: '
                    f'{self.__class__.__name__}, count try: {self.count_try}')
         self.logger.error(message)
+        self.rate_limiter.report_failure()
         self.__renew_connection(body)
 
     def _negative_response_status_handler(self, response: requests.Response,
                                           body: dict | None) -> None:
         """
-        Logs an error message when the response status code is not OK.
+        Logs an error message when the response status code is not OK and
+        backs off the requests to the API, lowering their rate if the API
+        throttled them.
         """
         message = (f'{response.status_code} status code with response, class: '
                    f'{self.__class__.__name__}, count try: {self.count_try}')
         self.logger.error(message)
+        self.rate_limiter.report_failure(response.status_code)
         self.__renew_connection(body)
 
     def _finally_response_handler(self) -> None:
@@ -276,7 +714,6 @@ class BaseParser(ParsingLogger, ABC):
             datetime.now(timezone.utc) - self.connection_start_time
         ).seconds
         self.connections_duration += round(connections_duration, 2)
-        time.sleep(self.waiting_time)
 
     @abstractmethod
     def _get_all_api_answers(self) -> None:
@@ -291,26 +728,33 @@ class BaseParser(ParsingLogger, ABC):
         """
         This method is the main method of the class and is responsible for
         running the entire process. It calls the _get_all_api_answers method to
-        generate the data, then bulk creates or updates the records in the
-        model. After that, it calculates the duration of the process and saves
-        it to the database. If an error occurs during the process, it logs the
-        error and raises an exception.
+        generate the data, then bulk upserts the changed records in the model
+        and confirms the unchanged ones. After that, it
+        calculates the duration of the process and saves it to the database.
+        If an error occurs during the process, it logs the error and
+        raises an exception.
         """
         try:
             self._logger_start()
             self._get_all_api_answers()
-            self.model.objects.bulk_create(self.records_to_create)
-            self.model.objects.bulk_update(
-                self.records_to_update, self.updated_fields
-            )
+            self._split_records_to_write()
+            self._record_changed_rates()
+            self._bulk_upsert()
+            self._confirm_unchanged_records()
             self.duration = datetime.now(timezone.utc) - self.start_time
-            self.new_update.duration = self.duration
-            self.new_update.save()
+            self._save_updates()
             self._logger_end()
         except Exception as error:
             self._logger_error(error)
             raise Exception
 
+    def _save_updates(self) -> None:
+        """
+        Saves the duration of the run to the update.
+        """
+        self.new_update.duration = self.duration
+        self.new_update.save()
+
 
 class BaseCryptoParser(BaseParser, ABC):
     """
@@ -365,7 +809,7 @@ class BankParser(BaseParser, ABC):
     """
     model = BanksExchangeRates
     model_update = BanksExchangeRatesUpdates
-    updated_fields: List[str] = ['price', 'update']
+    updated_fields: List[str] = ['price', 'update', 'updated_at']
     request_method: str = 'get'
     bank_name: str
     buy_and_sell: bool
@@ -424,16 +868,19 @@ class BankParser(BaseParser, ABC):
         """
         pass
 
-    def _calculates_buy_and_sell_data(self, params: Dict[str]
-                                      ) -> tuple[dict, dict] | None:
+    def _calculates_buy_and_sell_data(
+            self, params: Dict[str], response_json: dict | bool = None
+    ) -> tuple[dict, dict] | None:
         """
         Calculates the buy and sell data for a given set of
         parameters. It gets the API response using the _send_request
-        method, extracts the buy and sell data using the
-        _extract_buy_and_sell_from_json method, and returns a tuple of
-        dictionaries containing the calculated buy and sell data.
+        method, unless it has already been received, extracts the buy and
+        sell data using the _extract_buy_and_sell_from_json method, and
+        returns a tuple of dictionaries containing the calculated buy and sell
+        data.
         """
-        response_json = self._send_request(params=params)
+        if response_json is None:
+            response_json = self._send_request(params=params)
         if response_json is False:
             return None
         buy_and_sell = self._extract_buy_and_sell_from_json(response_json)
@@ -449,15 +896,18 @@ class BankParser(BaseParser, ABC):
         }
         return buy_data, sell_data
 
-    def _calculates_price_data(self, params: Dict[str]
-                               ) -> list[dict[str, Any]] | None:
+    def _calculates_price_data(
+            self, params: Dict[str], response_json: dict | bool = None
+    ) -> list[dict[str, Any]] | None:
         """
         Calculates the price data for a given set of parameters.
-        It gets the API response using the _send_request method, extracts
-        the price data using the _extract_price_from_json method, and returns a
-        list of dictionaries containing the calculated price data.
+        It gets the API response using the _send_request method, unless it
+        has already been received, extracts the price data using the
+        _extract_price_from_json method, and returns a list of dictionaries
+        containing the calculated price data.
         """
-        response_json = self._send_request(params=params)
+        if response_json is None:
+            response_json = self._send_request(params=params)
         if response_json is False:
             return None
         price = self._extract_price_from_json(response_json)
@@ -482,7 +932,7 @@ class BankParser(BaseParser, ABC):
         return self._extract_all_values_from_json(response_json)
 
     def _choice_buy_and_sell_or_price(
-            self, params=None
+            self, params=None, response_json: dict | bool = None
     ) -> Union[tuple[dict, dict], list[dict], None]:
         """
         Chooses whether to calculate buy and sell data, price data, or all
@@ -493,44 +943,31 @@ class BankParser(BaseParser, ABC):
         if self.all_values:
             return self._calculates_all_values_data()
         if self.buy_and_sell:
-            return self._calculates_buy_and_sell_data(params)
-        return self._calculates_price_data(params)
+            return self._calculates_buy_and_sell_data(params, response_json)
+        return self._calculates_price_data(params, response_json)
 
-    def _add_to_bulk_update_or_create(self, value_dict: dict, price: float
-                                      ) -> None:
+    def _add_rate(self, value_dict: dict) -> None:
         """
-        Adds a record to the list of records to update or create. It checks if
-        a record with the same parameters already exists in the database, and
-        updates it with the new price and update record, or creates a new
-        record if it does not exist.
+        Adds the rate of the bank to be written, unless it has no price.
         """
-        target_object = self.model.objects.filter(
-            bank=self.bank, from_fiat=value_dict['from_fiat'],
-            to_fiat=value_dict['to_fiat'], currency_market__isnull=True
-        )
-        if target_object.exists():
-            updated_object = target_object.get()
-            updated_object.price = price
-            updated_object.update = self.new_update
-            self.records_to_update.append(updated_object)
-        else:
-            created_object = self.model(
-                bank=self.bank, from_fiat=value_dict['from_fiat'],
-                to_fiat=value_dict['to_fiat'], price=price,
-                update=self.new_update
-            )
-            self.records_to_create.append(created_object)
+        if value_dict['price'] is None:
+            return
+        self._add_to_bulk_upsert({
+            'bank': self.bank, 'from_fiat': value_dict['from_fiat'],
+            'to_fiat': value_dict['to_fiat'], 'price': value_dict['price']
+        })
 
     def _get_all_api_answers(self) -> None:
-        for params in self._generate_unique_params():
-            values = self._choice_buy_and_sell_or_price(params)
+        unique_params = self._generate_unique_params()
+        responses = self._send_requests(
+            [{'params': params} for params in unique_params]
+        )
+        for params, response_json in zip(unique_params, responses):
+            values = self._choice_buy_and_sell_or_price(params, response_json)
             if not values:
                 continue
             for value_dict in values:
-                price = value_dict.pop('price')
-                if price is None:
-                    continue
-                self._add_to_bulk_update_or_create(value_dict, price)
+                self._add_rate(value_dict)
 
 
 class BankInvestParser(BaseParser, ABC):
@@ -552,7 +989,7 @@ class BankInvestParser(BaseParser, ABC):
     """
     model = BanksExchangeRates
     model_update = BanksExchangeRatesUpdates
-    updated_fields: List[str] = ['price', 'update']
+    updated_fields: List[str] = ['price', 'update', 'updated_at']
     request_method: str = 'get'
     currency_markets_name: str
     link_ends: str
@@ -564,13 +1001,11 @@ class BankInvestParser(BaseParser, ABC):
         self.new_update = self.model_update.objects.create(
             currency_market=self.currency_market
         )
-
-    def _get_api_answer(self, link_end: str) -> dict | None:
-        """
-        Makes a GET request to the Bank Invest API and returns the response
-        data as a dictionary.
-        """
-        return self._send_request(link_end=link_end)
+        self.banks = [
+            Banks.objects.get(name=name)
+            for name, value in self.banks_config.items()
+            if self.currency_markets_name in value['bank_invest_exchanges']
+        ]
 
     @staticmethod
     @abstractmethod
@@ -601,48 +1036,29 @@ class BankInvestParser(BaseParser, ABC):
         }
         return buy_data, sell_data
 
-    def _add_to_bulk_update_or_create(self, value_dict: dict) -> None:
-        """
-        Adds the given data dictionary to the bulk update list or bulk
-        create list depending on whether the object already exists.
-        """
-        bank_names = []
-        for name, value in self.banks_config.items():
-            if self.currency_markets_name in value['bank_invest_exchanges']:
-                bank_names.append(name)
-        for bank_name in bank_names:
-            bank = Banks.objects.get(name=bank_name)
-            target_object = self.model.objects.filter(
-                bank=bank,
-                currency_market=self.currency_market,
-                from_fiat=value_dict['from_fiat'],
-                to_fiat=value_dict['to_fiat']
-            )
-            if target_object.exists():
-                updated_object = target_object.get()
-                updated_object.price = value_dict['price']
-                updated_object.update = self.new_update
-                self.records_to_update.append(updated_object)
-            else:
-                created_object = self.model(
-                    bank=bank,
-                    currency_market=self.currency_market,
-                    from_fiat=value_dict['from_fiat'],
-                    to_fiat=value_dict['to_fiat'],
-                    price=value_dict['price'],
-                    update=self.new_update
-                )
-                self.records_to_create.append(created_object)
+    def _add_rates(self, value_dict: dict) -> None:
+        """
+        Adds the rate of the currency market to be written for each bank that
+        uses it.
+        """
+        for bank in self.banks:
+            self._add_to_bulk_upsert({
+                'bank': bank, 'currency_market': self.currency_market,
+                'from_fiat': value_dict['from_fiat'],
+                'to_fiat': value_dict['to_fiat'], 'price': value_dict['price']
+            })
 
     def _get_all_api_answers(self) -> None:
-        for link_end in self.link_ends:
-            answer = self._get_api_answer(link_end)
+        answers = self._send_requests(
+            [{'link_end': link_end} for link_end in self.link_ends]
+        )
+        for link_end, answer in zip(self.link_ends, answers):
             if answer is False:
                 continue
             buy_and_sell_data = self._calculates_buy_and_sell_data(link_end,
                                                                    answer)
             for buy_or_sell_data in buy_and_sell_data:
-                self._add_to_bulk_update_or_create(buy_or_sell_data)
+                self._add_rates(buy_or_sell_data)
 
 
 class P2PParser(BaseCryptoParser, ABC):
@@ -665,7 +1081,7 @@ class P2PParser(BaseCryptoParser, ABC):
     """
     model = CryptoExchangesRates
     model_update = CryptoExchangesRatesUpdates
-    updated_fields: List[str] = ['price', 'update']
+    updated_fields: List[str] = ['price', 'update', 'updated_at']
     request_method: str = 'post'
     bank_name: str
     page: int
@@ -700,7 +1116,7 @@ class P2PParser(BaseCryptoParser, ABC):
         pass
 
     @abstractmethod
-    def _create_body(self, asset: str, trade_type: str, fiat: str) -> dict:
+    def _create_body(self, asset: str, fiat: str, trade_type: str) -> dict:
         """
         An abstract method that creates the request body for fetching exchange
         rates.
@@ -716,38 +1132,60 @@ class P2PParser(BaseCryptoParser, ABC):
         """
         pass
 
-    def _get_api_answer(self, asset: str, trade_type: str, fiat: str) -> dict:
+    def _create_request_kwargs(self, asset: str, fiat: str, trade_type: str
+                               ) -> Dict[str, dict]:
         """
-        Fetches the API response for a given asset, trade type, and fiat.
+        Creates the keyword arguments of _send_request for a given asset,
+        fiat and trade type.
         """
-        body = self._create_body(asset, trade_type, fiat)
-        return self._send_request(body=body)
+        return {'body': self._create_body(asset, fiat, trade_type)}
 
-    def _add_to_bulk_update_or_create(self, asset: str, trade_type: str,
-                                      fiat: str, price: float) -> None:
+    def _add_rate(self, asset: str, trade_type: str, fiat: str,
+                  price: float) -> None:
         """
-        Adds the exchange rate to be bulk updated or created.
+        Adds the exchange rate to be written.
         """
-        target_object = self.model.objects.filter(
-            crypto_exchange=self.crypto_exchange, asset=asset,
-            trade_type=trade_type, fiat=fiat, bank=self.bank,
-            payment_channel=self.payment_channel
-        )
-        if target_object.exists():
-            updated_object = target_object.get()
-            updated_object.price = price
-            updated_object.update = self.new_update
-            self.records_to_update.append(updated_object)
-        else:
-            created_object = self.model(
-                crypto_exchange=self.crypto_exchange, asset=asset,
-                trade_type=trade_type, fiat=fiat, bank=self.bank,
-                price=price, update=self.new_update,
+        self._add_to_bulk_upsert({
+            'crypto_exchange': self.crypto_exchange, 'asset': asset,
+            'trade_type': trade_type, 'fiat': fiat, 'bank': self.bank,
+            'price': price, 'payment_channel': self.payment_channel
+        })
+
+    def _load_existing_rates(self) -> None:
+        """
+        Loads the stored rates of the bank in one query at the start of the
+        run. The same index finds the combinations to skip and splits the
+        records to write, so neither needs a query per combination.
+        """
+        self.stored_records = self._load_stored_records(
+            self.model.objects.filter(
+                crypto_exchange=self.crypto_exchange, bank=self.bank,
                 payment_channel=self.payment_channel
             )
-            self.records_to_create.append(created_object)
+        )
 
-    def _get_all_api_answers(self) -> None:
+    def _get_rate_key(self, asset: str, trade_type: str, fiat: str
+                      ) -> tuple:
+        """
+        Returns the values of the unique constraint of the rate of the bank
+        for the given asset, trade type and fiat.
+        """
+        values = {
+            'crypto_exchange_id': self.crypto_exchange.id,
+            'bank_id': self.bank.id, 'asset': asset,
+            'trade_type': trade_type, 'fiat': fiat,
+            'transaction_method': None,
+            'payment_channel': self.payment_channel
+        }
+        return tuple(values[field] for field in self.key_fields)
+
+    def _generate_unique_params(self) -> List[Tuple[str, str, str]]:
+        """
+        Generates the combinations of asset, trade type and fiat to request.
+        Unless it is a full update, the combinations whose stored rate has no
+        price are skipped.
+        """
+        unique_params = []
         for fiat in self.fiats:
             if not self._check_supports_fiat(fiat):
                 continue
@@ -758,22 +1196,164 @@ class P2PParser(BaseCryptoParser, ABC):
                                                        ]['all']
             for trade_type, asset in product(self.trade_types, set(assets)):
                 if not self.full_update:
-                    target_rates = self.model.objects.filter(
-                        crypto_exchange=self.crypto_exchange,
-                        asset=asset, trade_type=trade_type, fiat=fiat,
-                        bank=self.bank, payment_channel=self.payment_channel
-                    )
-                    if target_rates.exists() and not target_rates.get().price:
+                    stored_rate = self.stored_records.get(
+                        self._get_rate_key(asset, trade_type, fiat))
+                    if stored_rate is not None and not stored_rate.price:
                         continue
-                response = self._get_api_answer(asset, fiat, trade_type)
-                if response is False:
+                unique_params.append((asset, trade_type, fiat))
+        return unique_params
+
+    def _get_all_api_answers(self) -> None:
+        unique_params = self._generate_unique_params()
+        responses = self._send_requests([
+            self._create_request_kwargs(asset, fiat, trade_type)
+            for asset, trade_type, fiat in unique_params
+        ])
+        for (asset, trade_type, fiat), response in zip(unique_params,
+                                                       responses):
+            if response is False:
+                continue
+            price = self._extract_price_from_json(response)
+            if price is not None:
+                price = 1 / price if trade_type == 'BUY' else price
+            self._add_rate(asset, trade_type, fiat, price)
+
+    def main(self) -> None:
+        self._load_existing_rates()
+        super().main()
+
+
+class MultiBankP2PParser(BaseCryptoParser, ABC):
+    """
+    A parser of the peer-to-peer exchange rates of several banks at once.
+    For each asset, trade type and fiat it sends one request with the payment
+    methods of all banks that need it and assigns to each bank the best
+    advert that accepts its payment method, instead of sending a request per
+    bank. The banks whose payment method is not among the received adverts
+    are requested separately, unless all adverts were received. The rates of
+    all banks are written in one bulk upsert, each with the update of its
+    bank.
+
+    Attributes:
+        model: A Django model representing the exchange rates to be parsed.
+        updated_fields (list): A list of fields to be updated in the model
+            when new exchange rates are fetched.
+        request_method (str): The type of the request method.
+        rows (int): The number of adverts requested at once.
+        bank_parsers (list): The P2PParser of each bank, which select the
+            combinations to request and store the rates of their bank.
+    """
+    model = CryptoExchangesRates
+    updated_fields: List[str] = ['price', 'update', 'updated_at']
+    request_method: str = 'post'
+    rows: int
+
+    def __init__(self, bank_parsers: Tuple[Type[P2PParser]]) -> None:
+        super().__init__()
+        self.bank_parsers: List[P2PParser] = [
+            bank_parser() for bank_parser in bank_parsers
+        ]
+
+    @abstractmethod
+    def _create_body(self, asset: str, fiat: str, trade_type: str,
+                     banks: List[Banks]) -> dict:
+        """
+        An abstract method that creates the request body for fetching the
+        adverts that accept the payment method of any of the banks.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _get_pay_type(bank: Banks) -> str:
+        """
+        An abstract method that returns the payment method of the bank on the
+        crypto exchange.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _extract_prices_from_json(json_data: dict) -> Dict[str, float]:
+        """
+        An abstract method that extracts the price of the best advert of each
+        payment method, keyed by payment method, from the JSON response.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _extract_adverts_count(json_data: dict) -> int:
+        """
+        An abstract method that extracts the number of adverts in the JSON
+        response.
+        """
+        pass
+
+    @staticmethod
+    def _add_price(bank_parser: P2PParser, asset: str, trade_type: str,
+                   fiat: str, price: float | None) -> None:
+        """
+        Adds the price of the best advert to the rates of the bank.
+        """
+        if price is not None:
+            price = 1 / price if trade_type == 'BUY' else price
+        bank_parser._add_rate(asset, trade_type, fiat, price)
+
+    def _get_all_api_answers(self) -> None:
+        bank_parsers_by_params = defaultdict(list)
+        self.stored_records = {}
+        for bank_parser in self.bank_parsers:
+            bank_parser._load_existing_rates()
+            self.stored_records.update(bank_parser.stored_records)
+            for params in bank_parser._generate_unique_params():
+                bank_parsers_by_params[params].append(bank_parser)
+        unique_params = list(bank_parsers_by_params)
+        responses = self._send_requests([
+            {'body': self._create_body(
+                asset, fiat, trade_type, [
+                    bank_parser.bank for bank_parser
+                    in bank_parsers_by_params[(asset, trade_type, fiat)]
+                ]
+            )} for asset, trade_type, fiat in unique_params
+        ])
+        missing_params = []
+        for params, response in zip(unique_params, responses):
+            if response is False:
+                prices, all_adverts = {}, False
+            else:
+                prices = self._extract_prices_from_json(response)
+                all_adverts = self._extract_adverts_count(response) < self.rows
+            for bank_parser in bank_parsers_by_params[params]:
+                price = prices.get(self._get_pay_type(bank_parser.bank))
+                if price is None and not all_adverts:
+                    missing_params.append((bank_parser, params))
                     continue
-                price = self._extract_price_from_json(response)
-                if price is not None:
-                    price = 1 / price if trade_type == 'BUY' else price
-                self._add_to_bulk_update_or_create(
-                    asset, trade_type, fiat, price
-                )
+                self._add_price(bank_parser, *params, price)
+        responses = self._send_requests([
+            bank_parser._create_request_kwargs(asset, fiat, trade_type)
+            for bank_parser, (asset, trade_type, fiat) in missing_params
+        ])
+        for (bank_parser, params), response in zip(missing_params, responses):
+            if response is False:
+                continue
+            self._add_price(bank_parser, *params,
+                            bank_parser._extract_price_from_json(response))
+        for bank_parser in self.bank_parsers:
+            self.records_to_write.update(bank_parser.records_to_write)
+
+    def _record_changed_rates(self) -> None:
+        for bank_parser in self.bank_parsers:
+            bank_parser.records_to_update = [
+                record for record in self.records_to_update
+                if record.update is bank_parser.new_update
+            ]
+            bank_parser._record_changed_rates()
+
+    def _save_updates(self) -> None:
+        for bank_parser in self.bank_parsers:
+            bank_parser.duration = self.duration
+            bank_parser._save_updates()
 
 
 class CryptoExchangesParser(BaseCryptoParser, ABC):
@@ -793,22 +1373,45 @@ class CryptoExchangesParser(BaseCryptoParser, ABC):
             selling.
         zero_fees (dict): Dictionary of our assets pairs in which the
             commission is zero.
+        zero_fee_pairs (frozenset): The pairs of assets with zero commission
+            in both directions, built from zero_fees.
+        invalid_params (frozenset): The pairs of assets that are not traded
+            on the crypto exchange.
+        batch_prices (bool): If True, the prices of all symbols are fetched
+            in one request to the endpoint without a symbol, and requests by
+            symbol are only sent if it fails.
+        prices (dict): The prices keyed by symbol received from a price
+            stream. If set, no requests are sent and only the symbols in it
+            are updated.
+        reused_update (bool): If True, the update was created by an earlier
+            run of a price stream and is written to again.
     """
     model = IntraCryptoExchangesRates
     model_update = IntraCryptoExchangesRatesUpdates
-    updated_fields: List[str] = ['price', 'update']
+    updated_fields: List[str] = ['price', 'update', 'updated_at']
     request_method: str = 'get'
     exceptions: tuple = tuple()
     name_from: str
     base_spot_fee: float
     zero_fees: Dict[str, Tuple[str]]
+    batch_prices: bool = CRYPTO_EXCHANGES_BATCH_PRICES
+    prices: Dict[str, float] | None = None
 
-    def __init__(self) -> None:
+    def __init__(self, update: IntraCryptoExchangesRatesUpdates = None
+                 ) -> None:
         super().__init__()
-        self.new_update = self.model_update.objects.create(
+        self.reused_update = update is not None
+        self.new_update = update or self.model_update.objects.create(
             crypto_exchange=self.crypto_exchange
         )
         self.crypto_fiats = self.crypto_exchanges_configs.get('crypto_fiats')
+        self.zero_fee_pairs = frozenset(
+            pair for asset, zero_fee_assets in self.zero_fees.items()
+            for zero_fee_asset in zero_fee_assets
+            for pair in ((asset, zero_fee_asset), (zero_fee_asset, asset))
+        )
+        self.invalid_params = frozenset(
+            self.crypto_exchanges_configs.get('invalid_params_list'))
 
     def _create_params(self, assets_combinations: tuple
                        ) -> List[dict[str, str]]:
@@ -823,13 +1426,15 @@ class CryptoExchangesParser(BaseCryptoParser, ABC):
         ]
 
     def _get_api_answer(
-            self, params: dict[str, str]
+            self, params: dict[str, str], response: dict | bool = None
     ) -> Union[tuple[Dict[str, Any], dict[str, str]], bool]:
         """
         Method that sends a request to the cryptocurrency exchange API
-        endpoint and returns the response.
+        endpoint, unless the response has already been received, and returns
+        the response.
         """
-        response = self._send_request(params=params)
+        if response is None:
+            response = self._send_request(params=params)
         if not response:
             message = f'Unsuccessful response with params: {params}'
             self.logger.error(message)
@@ -845,17 +1450,53 @@ class CryptoExchangesParser(BaseCryptoParser, ABC):
         """
         pass
 
-    def _calculates_buy_and_sell_data(self, params: dict[str, str]
-                                      ) -> tuple[dict, dict] | None:
+    @staticmethod
+    def _extract_prices_from_json(json_data: dict | list) -> Dict[str, float]:
+        """
+        Method that extracts the prices of all symbols, keyed by symbol, from
+        the response of the cryptocurrency exchange API endpoint without a
+        symbol. It should be implemented by the subclasses that support
+        batch_prices.
+        """
+        pass
+
+    def _get_batch_prices(self) -> Dict[str, float] | None:
+        """
+        Method that fetches the prices of all symbols in one request and
+        returns them keyed by symbol, or None if the request failed. The
+        prices received from a price stream are returned without a request.
+        """
+        if self.prices is not None:
+            return self.prices
+        response = self._send_request()
+        if response is False:
+            message = ('Unsuccessful response without params, the prices are '
+                       'requested by symbol.')
+            self.logger.error(message)
+            return None
+        return self._extract_prices_from_json(response)
+
+    def _calculates_buy_and_sell_data(
+            self, params: dict[str, str], response: dict | bool = None
+    ) -> tuple[dict, dict] | None:
         """
         Method that calculates the buy and sell data for each cryptocurrency
         asset pair.
         """
-        answer = self._get_api_answer(params)
+        answer = self._get_api_answer(params, response)
         if not answer:
             return None
         json_data, valid_params = answer
         price = self._extract_price_from_json(json_data)
+        return self._calculates_buy_and_sell_from_price(valid_params, price)
+
+    def _calculates_buy_and_sell_from_price(
+            self, valid_params: dict[str, str], price: float
+    ) -> tuple[dict, dict] | None:
+        """
+        Method that calculates the buy and sell data of the asset pair of the
+        params from its price, taking into account the spot fee.
+        """
         for from_asset in self.assets + self.crypto_fiats:
             if from_asset in valid_params['symbol'][0:4]:
                 for to_asset in self.assets + self.crypto_fiats:
@@ -884,14 +1525,8 @@ class CryptoExchangesParser(BaseCryptoParser, ABC):
         This method calculates the commission for the exchange within the
         crypto exchange.
         """
-        from_asset_fee_list = self.zero_fees.get(from_asset)
-        if from_asset_fee_list is not None:
-            if to_asset in from_asset_fee_list:
-                return 0
-        to_asset_fee_list = self.zero_fees.get(to_asset)
-        if to_asset_fee_list is not None:
-            if from_asset in to_asset_fee_list:
-                return 0
+        if (from_asset, to_asset) in self.zero_fee_pairs:
+            return 0
         return self.base_spot_fee
 
     def _generate_unique_params(self) -> List[dict[str, str]]:
@@ -901,57 +1536,81 @@ class CryptoExchangesParser(BaseCryptoParser, ABC):
         """
         currencies_combinations = list(combinations(self.assets,
                                                     self.CURRENCY_PAIR))
-        invalid_params_list = self.crypto_exchanges_configs.get(
-            'invalid_params_list')
         for crypto_fiat in self.crypto_fiats:
             for asset in self.assets:
                 currencies_combinations.append((asset, crypto_fiat))
         currencies_combinations = tuple(
             currencies_combination for currencies_combination
             in currencies_combinations
-            if currencies_combination not in invalid_params_list
+            if currencies_combination not in self.invalid_params
         )
         return self._create_params(currencies_combinations)
 
-    def _add_to_bulk_update_or_create(self, value_dict: dict, price: float
-                                      ) -> None:
+    def _add_rate(self, value_dict: dict) -> None:
         """
-        Adds the given data dictionary to the bulk update list or bulk
-        create list depending on whether the object already exists.
+        Adds the rate of the pair of assets to be written.
         """
-        target_object = self.model.objects.filter(
-            crypto_exchange=self.crypto_exchange,
-            from_asset=value_dict['from_asset'],
-            to_asset=value_dict['to_asset']
-        )
-        if target_object.exists():
-            updated_object = self.model.objects.get(
-                crypto_exchange=self.crypto_exchange,
-                from_asset=value_dict['from_asset'],
-                to_asset=value_dict['to_asset']
-            )
-            updated_object.price = price
-            updated_object.update = self.new_update
-            self.records_to_update.append(updated_object)
-        else:
-            created_object = self.model(
-                crypto_exchange=self.crypto_exchange,
-                from_asset=value_dict['from_asset'],
-                to_asset=value_dict['to_asset'],
-                price=price, spot_fee=value_dict['spot_fee'],
-                update=self.new_update
-            )
-            self.records_to_create.append(created_object)
+        self._add_to_bulk_upsert({
+            'crypto_exchange': self.crypto_exchange, **value_dict
+        })
+
+    def _get_all_batch_values(self, unique_params: List[dict[str, str]]
+                              ) -> List[tuple[dict, dict] | None] | None:
+        """
+        Method that calculates the buy and sell data of all unique params from
+        the prices fetched in one request, or returns None if they could not be
+        fetched.
+        """
+        prices = self._get_batch_prices()
+        if prices is None:
+            return None
+        all_values = []
+        for params in unique_params:
+            price = prices.get(params[self.name_from])
+            if price is None:
+                message = f'No price in the batch response for: {params}'
+                self.logger.error(message)
+                all_values.append(None)
+                continue
+            all_values.append(
+                self._calculates_buy_and_sell_from_price(params, price))
+        return all_values
 
     def _get_all_api_answers(self) -> None:
         unique_params = self._generate_unique_params()
-        for params in unique_params:
-            values = self._calculates_buy_and_sell_data(params)
+        if self.prices is not None:
+            unique_params = [
+                params for params in unique_params
+                if params[self.name_from] in self.prices
+            ]
+        all_values = (
+            self._get_all_batch_values(unique_params)
+            if self.batch_prices or self.prices is not None else None
+        )
+        if all_values is None:
+            responses = self._send_requests(
+                [{'params': params} for params in unique_params]
+            )
+            all_values = [
+                self._calculates_buy_and_sell_data(params, response)
+                for params, response in zip(unique_params, responses)
+            ]
+        for values in all_values:
             if values is None:
                 continue
             for value_dict in values:
-                price = value_dict.pop('price')
-                self._add_to_bulk_update_or_create(value_dict, price)
+                self._add_rate(value_dict)
+
+    def _save_updates(self) -> None:
+        """
+        Saves the duration of the run to the update. The duration of a reused
+        update spans from its creation to the end of this run, so that the
+        calculations see the rates changed by any of its runs.
+        """
+        if self.reused_update:
+            self.duration = (
+                datetime.now(timezone.utc) - self.new_update.updated)
+        super()._save_updates()
 
 
 class ListsFiatCryptoParser(BaseCryptoParser, ABC):
@@ -970,15 +1629,19 @@ class ListsFiatCryptoParser(BaseCryptoParser, ABC):
         request_method (str): The type of the request method.
         endpoint_sell (str): the API endpoint for fetching the sell rates.
         endpoint_buy (str): the API endpoint for fetching the buy rates.
+        compare_stored_records (bool): The lists are upserted without
+            loading the stored ones, since the whole list is rewritten anyway.
     """
     model = ListsFiatCrypto
     model_update = ListsFiatCryptoUpdates
     updated_fields: List[str] = ['list_fiat_crypto', 'update']
+    compare_stored_records: bool = False
     request_method: str = 'post'
     endpoint_sell: str
     endpoint_buy: str
 
     def __init__(self) -> None:
+        self.endpoint = self.endpoint_sell
         super().__init__()
         self.new_update = self.model_update.objects.create(
             crypto_exchange=self.crypto_exchange
@@ -1022,31 +1685,14 @@ class ListsFiatCryptoParser(BaseCryptoParser, ABC):
             self.endpoint = self.endpoint_buy
         return self._send_request(body=body)
 
-    def _add_to_update_or_create(self, list_fiat_crypto: dict, trade_type: str
-                                 ) -> None:
+    def _add_list(self, list_fiat_crypto: dict, trade_type: str) -> None:
         """
-        A method that adds the fetched data to the update model or creates a
-        new entry in the model, depending on whether the data for the
-        specific exchange already exists.
+        A method that adds the fetched list of the trade type to be written.
         """
-        target_object = self.model.objects.filter(
-            crypto_exchange=self.crypto_exchange, trade_type=trade_type
-        )
-        if target_object.exists():
-            updated_object = self.model.objects.get(
-                crypto_exchange=self.crypto_exchange, trade_type=trade_type
-            )
-            updated_object.list_fiat_crypto = list_fiat_crypto
-            updated_object.update = self.new_update
-            self.records_to_update.append(updated_object)
-        else:
-            created_object = self.model(
-                crypto_exchange=self.crypto_exchange,
-                list_fiat_crypto=list_fiat_crypto,
-                trade_type=trade_type,
-                update=self.new_update
-            )
-            self.records_to_create.append(created_object)
+        self._add_to_bulk_upsert({
+            'crypto_exchange': self.crypto_exchange,
+            'list_fiat_crypto': list_fiat_crypto, 'trade_type': trade_type
+        })
 
     def _get_all_api_answers(self) -> None:
         sell_dict = {}
@@ -1071,8 +1717,8 @@ class ListsFiatCryptoParser(BaseCryptoParser, ABC):
                     buy_dict[asset_info[0]] = fiat_list
                 buy_dict[asset_info[0]].append([fiat, asset_info[1]])
 
-        self._add_to_update_or_create(sell_dict, trade_type='SELL')
-        self._add_to_update_or_create(buy_dict, trade_type='BUY')
+        self._add_list(sell_dict, trade_type='SELL')
+        self._add_list(buy_dict, trade_type='BUY')
 
 
 class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
@@ -1102,13 +1748,15 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
     payment_channel: str = 'Card2CryptoExchange'
     transaction_method: str = 'Bank Card (Visa/MC)'
     updated_fields: List[str] = [
-        'price', 'pre_price', 'transaction_fee', 'update'
+        'price', 'pre_price', 'transaction_fee', 'update', 'updated_at'
     ]
     endpoint_sell: str
     endpoint_buy: str
     data_obsolete_in_minutes: int = DATA_OBSOLETE_IN_MINUTES
 
     def __init__(self, trade_type: str) -> None:
+        self.endpoint = (
+            self.endpoint_sell if trade_type == 'SELL' else self.endpoint_buy)
         super().__init__()
         self.new_update = self.model_update.objects.create(
             crypto_exchange=self.crypto_exchange,
@@ -1127,6 +1775,11 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
         self.update_time = datetime.now(timezone.utc) - timedelta(
             minutes=self.data_obsolete_in_minutes
         )
+        self.banks = [
+            Banks.objects.get(name=name)
+            for name, value in self.banks_config.items()
+            if self.payment_channel in value['payment_channels']
+        ]
 
     @staticmethod
     def _create_body_sell(fiat: str, asset: str, amount: int) -> dict:
@@ -1160,18 +1813,17 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
         """
         pass
 
-    def _get_api_answer(self, asset: str, fiat: str, amount: int
-                        ) -> dict | bool:
+    def _create_request_kwargs(self, asset: str, fiat: str, amount: int
+                               ) -> Dict[str, dict]:
         """
-        Returns the API response for a given asset, fiat and amount.
+        Sets the endpoint of the trade type and creates the keyword arguments
+        of _send_request for a given asset, fiat and amount.
         """
         if self.trade_type == 'SELL':
-            body = self._create_body_sell(fiat, asset, amount)
             self.endpoint = self.endpoint_sell
-            return self._send_request(body=body)
-        params = self._create_params_buy(fiat, asset)
+            return {'body': self._create_body_sell(fiat, asset, amount)}
         self.endpoint = self.endpoint_buy
-        return self._send_request(params=params)
+        return {'params': self._create_params_buy(fiat, asset)}
 
     def __check_p2p_exchange_is_better(self, asset: str, fiat: str,
                                        price: float, bank: Banks) -> bool:
@@ -1179,10 +1831,10 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
         Checks if a P2P exchange offers a better price than the current
         exchange.
         """
-        p2p_exchange = self.model.objects.select_related('update').filter(
+        p2p_exchange = self.model.objects.filter(
             crypto_exchange=self.crypto_exchange, bank=bank, asset=asset,
             trade_type=self.trade_type, fiat=fiat, payment_channel='P2P',
-            price__isnull=False, update__updated__gte=self.update_time
+            price__isnull=False, updated_at__gte=self.update_time
         )
         if p2p_exchange.exists():
             p2p_price = p2p_exchange.get().price
@@ -1194,46 +1846,31 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
                 return True
         return False
 
-    def _add_to_bulk_update_or_create(self, asset: str, fiat: str,
-                                      price: float, pre_price: float,
-                                      transaction_fee: float) -> None:
-        """
-        Updates or creates an exchange rate object in the database based on the
-        given parameters.
-        """
-        bank_names = []
-        for name, value in self.banks_config.items():
-            if self.payment_channel in value['payment_channels']:
-                bank_names.append(name)
-        for bank_name in bank_names:
-            bank = Banks.objects.get(name=bank_name)
-            target_object = self.model.objects.filter(
-                crypto_exchange=self.crypto_exchange, bank=bank, asset=asset,
-                trade_type=self.trade_type, fiat=fiat,
-                transaction_method=self.transaction_method,
-                payment_channel=self.payment_channel
-            )
+    def _add_rates(self, asset: str, fiat: str, price: float,
+                   pre_price: float, transaction_fee: float) -> None:
+        """
+        Adds the exchange rate to be written for each bank of the payment
+        channel, until a bank has a better P2P exchange.
+        """
+        for bank in self.banks:
             if self.__check_p2p_exchange_is_better(asset, fiat, price, bank):
                 return
-            if target_object.exists():
-                updated_object = target_object.get()
-                updated_object.price = price
-                updated_object.pre_price = pre_price
-                updated_object.transaction_fee = transaction_fee
-                updated_object.update = self.new_update
-                self.records_to_update.append(updated_object)
-            else:
-                created_object = self.model(
-                    crypto_exchange=self.crypto_exchange, bank=bank,
-                    asset=asset, trade_type=self.trade_type, fiat=fiat,
-                    price=price, pre_price=pre_price,
-                    transaction_fee=transaction_fee, update=self.new_update,
-                    payment_channel=self.payment_channel,
-                    transaction_method=self.transaction_method,
-                )
-                self.records_to_create.append(created_object)
-
-    def _get_all_api_answers(self) -> None:
+            self._add_to_bulk_upsert({
+                'crypto_exchange': self.crypto_exchange, 'bank': bank,
+                'asset': asset, 'trade_type': self.trade_type, 'fiat': fiat,
+                'price': price, 'pre_price': pre_price,
+                'transaction_fee': transaction_fee,
+                'payment_channel': self.payment_channel,
+                'transaction_method': self.transaction_method
+            })
+
+    def _generate_unique_params(self) -> List[Tuple[str, str, int]]:
+        """
+        Generates the combinations of asset, fiat and amount to request from
+        the list of fiats and cryptocurrencies of the trade type. Unless it is
+        a full update, the combinations without a stored rate are skipped.
+        """
+        unique_params = []
         list_fiat_crypto = ListsFiatCrypto.objects.get(
             crypto_exchange=self.crypto_exchange, trade_type=self.trade_type
         ).list_fiat_crypto
@@ -1253,13 +1890,20 @@ class Card2CryptoExchangesParser(BaseCryptoParser, ABC):
                     )
                     if not target_rates.exists():
                         continue
-                response = self._get_api_answer(asset, fiat, amount)
-                if response is False:
-                    continue
-                values = self._extract_values_from_json(response, amount)
-                if values is None:
-                    continue
-                price, pre_price, commission = values
-                self._add_to_bulk_update_or_create(
-                    asset, fiat, price, pre_price, commission
-                )
+                unique_params.append((asset, fiat, amount))
+        return unique_params
+
+    def _get_all_api_answers(self) -> None:
+        unique_params = self._generate_unique_params()
+        responses = self._send_requests([
+            self._create_request_kwargs(asset, fiat, amount)
+            for asset, fiat, amount in unique_params
+        ])
+        for (asset, fiat, amount), response in zip(unique_params, responses):
+            if response is False:
+                continue
+            values = self._extract_values_from_json(response, amount)
+            if values is None:
+                continue
+            price, pre_price, commission = values
+            self._add_rates(asset, fiat, price, pre_price, commission)
@@ -0,0 +1,267 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from arbitration.settings import BASE_ASSET
+from banks.models import Banks, BanksExchangeRates
+from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
+                                     IntraCryptoExchangesRates)
+from parsers.symbols import SymbolTable, get_symbol_table
+
+
+class CryptoExchangeRate(NamedTuple):
+    """
+    A lightweight record of a deposit or withdrawal rate of a crypto exchange
+    with only the fields used in the calculations.
+    """
+    id: int
+    bank_id: int
+    asset: str
+    fiat: str
+    trade_type: str
+    transaction_method: Optional[str]
+    payment_channel: Optional[str]
+    price: float
+
+
+class IntraCryptoExchangeRate(NamedTuple):
+    """
+    A lightweight record of an exchange rate between assets inside a crypto
+    exchange with only the fields used in the calculations.
+    """
+    id: int
+    from_asset: str
+    to_asset: str
+    price: float
+
+
+class BankExchangeRate(NamedTuple):
+    """
+    A lightweight record of an exchange rate between fiats inside a bank with
+    only the fields used in the calculations.
+    """
+    id: int
+    bank_id: int
+    from_fiat: str
+    to_fiat: str
+    price: float
+    currency_market_name: Optional[str]
+
+
+class RateSnapshot:
+    """
+    An in-memory snapshot of all fresh rates of one crypto exchange. It is
+    loaded in a few bulk queries at the start of a calculation run, after
+    which the transaction chains are enumerated without any round trips to
+    the database. The rates are loaded with values_list into lightweight
+    records instead of model instances.
+
+    Attributes:
+        crypto_exchange (CryptoExchanges): The crypto exchange whose rates are
+            loaded.
+        update_time (datetime): Rates updated before this time are considered
+            out of date and are not loaded.
+        base_asset (str): Preferred cryptocurrency for internal exchanges on a
+            crypto exchanges.
+        banks (dict): Banks by name.
+        crypto_exchanges_rates (dict): Lists of CryptoExchangeRate ordered by
+            id and keyed by (bank_id, trade_type, fiat).
+        intra_crypto_exchanges_rates (dict): IntraCryptoExchangeRate keyed
+            by (from_asset, to_asset).
+        banks_exchange_rates (dict): Lists of BankExchangeRate keyed by
+            (bank_id, from_fiat, to_fiat).
+        assets (set): All assets that have at least one fresh crypto exchange
+            rate.
+        rates_by_id (dict): The records of each rate model keyed by id.
+        symbols (SymbolTable): The frozen ids of the fiats and assets of the
+            snapshot, by which the price tables are indexed.
+        intra_prices (np.ndarray): The asset x asset matrix of the prices of
+            the intra crypto exchanges, NaN where there is no exchange.
+        conversion_factors (np.ndarray): The asset x asset matrix of the
+            factors by which an amount of one asset is multiplied when it is
+            converted to another, directly or through the base asset, NaN
+            where there is no way to convert it.
+    """
+    base_asset: str = BASE_ASSET
+
+    def __init__(self, crypto_exchange: CryptoExchanges,
+                 update_time: datetime) -> None:
+        self.crypto_exchange = crypto_exchange
+        self.update_time = update_time
+        self.banks: Dict[str, Banks] = {}
+        self.crypto_exchanges_rates: Dict[
+            Tuple[int, str, str], List[CryptoExchangeRate]
+        ] = defaultdict(list)
+        self.intra_crypto_exchanges_rates: Dict[
+            Tuple[str, str], IntraCryptoExchangeRate
+        ] = {}
+        self.banks_exchange_rates: Dict[
+            Tuple[int, str, str], List[BankExchangeRate]
+        ] = defaultdict(list)
+        self.assets = set()
+        self.rates_by_id: Dict[type, Dict[int, NamedTuple]] = {
+            CryptoExchangesRates: {}, IntraCryptoExchangesRates: {},
+            BanksExchangeRates: {}
+        }
+        self.__load_banks()
+        self.__load_crypto_exchanges_rates()
+        self.__load_intra_crypto_exchanges_rates()
+        self.__load_banks_exchange_rates()
+        self.symbols: SymbolTable = get_symbol_table().freeze(
+            self.__get_symbols()
+        )
+        self.__build_price_tables()
+
+    def __load_banks(self) -> None:
+        """
+        Loads all banks in a single query.
+        """
+        self.banks = {bank.name: bank for bank in Banks.objects.all()}
+
+    def __load_crypto_exchanges_rates(self) -> None:
+        """
+        Loads all fresh deposit and withdrawal rates of the crypto exchange in
+        a single query and indexes them.
+        """
+        crypto_exchanges_rates = CryptoExchangesRates.objects.filter(
+            crypto_exchange=self.crypto_exchange, price__isnull=False,
+            updated_at__gte=self.update_time
+        ).order_by('id').values_list(*CryptoExchangeRate._fields)
+        for values in crypto_exchanges_rates:
+            rate = CryptoExchangeRate(*values)
+            self.crypto_exchanges_rates[
+                (rate.bank_id, rate.trade_type, rate.fiat)
+            ].append(rate)
+            self.rates_by_id[CryptoExchangesRates][rate.id] = rate
+            self.assets.add(rate.asset)
+
+    def __load_intra_crypto_exchanges_rates(self) -> None:
+        """
+        Loads all fresh intra crypto exchange rates in a single query and
+        indexes them.
+        """
+        rates = IntraCryptoExchangesRates.objects.filter(
+            crypto_exchange=self.crypto_exchange,
+            updated_at__gte=self.update_time
+        ).values_list(*IntraCryptoExchangeRate._fields)
+        for values in rates:
+            rate = IntraCryptoExchangeRate(*values)
+            self.intra_crypto_exchanges_rates[
+                (rate.from_asset, rate.to_asset)
+            ] = rate
+            self.rates_by_id[IntraCryptoExchangesRates][rate.id] = rate
+
+    def __load_banks_exchange_rates(self) -> None:
+        """
+        Loads all fresh bank and currency market exchange rates in a single
+        query and indexes them. The rates are ordered by id after loading, so
+        that the query can select the fresh rates by the updated_at index
+        instead of scanning the table in the order of ids.
+        """
+        banks_exchange_rates = BanksExchangeRates.objects.filter(
+            price__isnull=False, updated_at__gte=self.update_time
+        ).values_list(*BankExchangeRate._fields[:-1], 'currency_market__name')
+        for values in sorted(banks_exchange_rates):
+            rate = BankExchangeRate(*values)
+            self.banks_exchange_rates[
+                (rate.bank_id, rate.from_fiat, rate.to_fiat)
+            ].append(rate)
+            self.rates_by_id[BanksExchangeRates][rate.id] = rate
+
+    def __get_symbols(self) -> List[str]:
+        """
+        Returns the assets of the loaded rates and the base asset, whose ids
+        the price tables need.
+        """
+        symbols = [*self.assets, self.base_asset]
+        for from_asset, to_asset in self.intra_crypto_exchanges_rates:
+            symbols.extend((from_asset, to_asset))
+        return symbols
+
+    def __build_price_tables(self) -> None:
+        """
+        Builds the dense price tables of the intra crypto exchanges, indexed
+        by the ids of the assets.
+        """
+        base_asset_id = self.symbols.get_id(self.base_asset)
+        size = len(self.symbols)
+        self.intra_prices = np.full((size, size), np.nan)
+        for (from_asset, to_asset), rate in (
+                self.intra_crypto_exchanges_rates.items()
+        ):
+            self.intra_prices[
+                self.symbols.ids[from_asset], self.symbols.ids[to_asset]
+            ] = rate.price
+        self.conversion_factors = np.where(
+            np.isnan(self.intra_prices),
+            np.outer(self.intra_prices[:, base_asset_id],
+                     self.intra_prices[base_asset_id, :]),
+            self.intra_prices
+        )
+        np.fill_diagonal(self.conversion_factors, 1)
+
+    def get_conversion_factors(self, from_assets: Iterable[str],
+                               to_assets: Iterable[str]) -> np.ndarray:
+        """
+        Returns the matrix of the factors by which an amount of each of the
+        from assets is multiplied when it is converted to each of the to
+        assets, the same way as get_two_interim_exchanges converts it. The
+        factor of an asset to itself is 1.
+        """
+        return self.conversion_factors[np.ix_(
+            self.symbols.get_ids(from_assets), self.symbols.get_ids(to_assets)
+        )]
+
+    def get_crypto_exchanges_rates(
+            self, bank: Banks, trade_type: str, fiat: str,
+            transaction_methods: Iterable[str]
+    ) -> List[CryptoExchangeRate]:
+        """
+        Returns the rates of the bank for the given trade type and fiat whose
+        transaction method is one of the given ones or is not set.
+        """
+        allowed_methods = {None, *transaction_methods}
+        return [
+            rate for rate in self.crypto_exchanges_rates.get(
+                (bank.id, trade_type, fiat), ()
+            )
+            if rate.transaction_method in allowed_methods
+        ]
+
+    def get_two_interim_exchanges(
+            self, from_asset: str, to_asset: str
+    ) -> Tuple[Optional[IntraCryptoExchangeRate],
+               Optional[IntraCryptoExchangeRate]]:
+        """
+        Returns a direct intra crypto exchange between the assets, or two
+        exchanges through the base asset, or two Nones if neither exists.
+        """
+        direct_exchange = self.intra_crypto_exchanges_rates.get(
+            (from_asset, to_asset))
+        if direct_exchange is not None:
+            return direct_exchange, None
+        interim_exchange = self.intra_crypto_exchanges_rates.get(
+            (from_asset, self.base_asset))
+        second_interim_exchange = self.intra_crypto_exchanges_rates.get(
+            (self.base_asset, to_asset))
+        if interim_exchange is not None and (
+                second_interim_exchange is not None):
+            return interim_exchange, second_interim_exchange
+        return None, None
+
+    def get_banks_exchange_rates(
+            self, banks: Iterable[Banks], from_fiat: str, to_fiat: str
+    ) -> List[BankExchangeRate]:
+        """
+        Returns the exchange rates from one fiat to another inside any of the
+        given banks.
+        """
+        rates = []
+        for bank_id in {bank.id for bank in banks}:
+            rates.extend(self.banks_exchange_rates.get(
+                (bank_id, from_fiat, to_fiat), ()
+            ))
+        rates.sort(key=lambda rate: rate.id)
+        return rates
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Type
+
+import aiohttp
+from aiohttp import web
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from arbitration.settings import (STREAM_FLUSH_INTERVAL,
+                                  STREAM_FULL_FLUSH_INTERVAL)
+from crypto_exchanges.models import IntraCryptoExchangesRatesUpdates
+from parsers.parsers import CryptoExchangesParser
+
+
+class PriceStream(ABC):
+    """
+    A long-running ingestor of the spot prices of a crypto exchange. It
+    subscribes to the ticker stream of the exchange over a WebSocket for the
+    symbols of the parser, keeps the latest prices in memory and periodically
+    writes the prices that have changed since the last write with the parser,
+    which calculates the rates the same way as from the API responses. All
+    prices are passed to the parser every full_flush_interval, so that the
+    rates whose price does not change are confirmed and are not considered
+    out of date. Each full write creates an update, which the writes of the
+    changed prices until the next full write reuse.
+
+    Attributes:
+        parser (Type[CryptoExchangesParser]): The parser that writes the
+            prices. It should not send requests, so its connection type
+            should be Direct.
+        endpoint (str): The WebSocket URL of the ticker stream.
+        flush_interval (float): The interval in seconds between writes of the
+            changed prices.
+        full_flush_interval (float): The interval in seconds between writes of
+            all prices.
+        reconnect_delay (float): The delay in seconds before reconnecting
+            after the stream is closed or fails.
+        heartbeat (float): The interval in seconds of the WebSocket pings.
+        ping_message (dict): The message that the exchange requires to be
+            sent every ping_interval to keep the stream open, if any.
+        ping_interval (float): The interval in seconds of the ping_message.
+        symbols (set): The symbols of the parser to subscribe to.
+        prices (dict): The latest prices keyed by symbol.
+        changed_symbols (set): The symbols whose price has changed since the
+            last write.
+        update (IntraCryptoExchangesRatesUpdates): The update of the last
+            full write, reused by the writes of the changed prices.
+    """
+    parser: Type[CryptoExchangesParser]
+    endpoint: str
+    flush_interval: float = STREAM_FLUSH_INTERVAL
+    full_flush_interval: float = STREAM_FULL_FLUSH_INTERVAL
+    reconnect_delay: float = 5
+    heartbeat: float = 30
+    ping_message: dict = None
+    ping_interval: float = 20
+
+    def __init__(self, endpoint: str = None) -> None:
+        self.logger = logging.getLogger(self.__class__.__name__)
+        if endpoint is not None:
+            self.endpoint = endpoint
+        self.__next_parser = self.parser()
+        self.symbols: Set[str] = {
+            params[self.parser.name_from]
+            for params in self.__next_parser._generate_unique_params()
+        }
+        self.prices: Dict[str, float] = {}
+        self.changed_symbols: Set[str] = set()
+        self.update: Optional[IntraCryptoExchangesRatesUpdates] = None
+
+    @staticmethod
+    @abstractmethod
+    def _create_subscribe_messages(symbols: List[str]) -> List[dict]:
+        """
+        Abstract method that creates the messages that subscribe the stream
+        to the tickers of the symbols.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _extract_prices_from_message(message: dict) -> Dict[str, float]:
+        """
+        Abstract method that extracts the prices keyed by symbol from a
+        message of the stream. Messages without prices give an empty dict.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _extract_symbols_from_subscribe_message(message: dict) -> List[str]:
+        """
+        Abstract method that extracts the symbols from a subscribe message.
+        It is used by FakePriceStreamServer.
+        """
+        pass
+
+    @staticmethod
+    @abstractmethod
+    def _create_fake_message(symbol: str, price: float) -> dict:
+        """
+        Abstract method that creates a ticker message of the stream with the
+        price of the symbol. It is used by FakePriceStreamServer.
+        """
+        pass
+
+    def __update_prices(self, prices: Dict[str, float]) -> None:
+        """
+        Stores the prices of the subscribed symbols and marks the changed
+        ones.
+        """
+        for symbol, price in prices.items():
+            if symbol in self.symbols and self.prices.get(symbol) != price:
+                self.prices[symbol] = price
+                self.changed_symbols.add(symbol)
+
+    async def __send_pings(self, websocket: aiohttp.ClientWebSocketResponse
+                           ) -> None:
+        """
+        Sends the ping_message every ping_interval until it is cancelled.
+        """
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            await websocket.send_json(self.ping_message)
+
+    async def __consume(self) -> None:
+        """
+        Connects to the stream, subscribes to the symbols and stores the
+        prices of the messages until the stream is closed.
+        """
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect(
+                    self.endpoint, heartbeat=self.heartbeat
+            ) as websocket:
+                for message in self._create_subscribe_messages(
+                        sorted(self.symbols)):
+                    await websocket.send_json(message)
+                message = (f'Subscribed to {len(self.symbols)} symbols at '
+                           f'{self.endpoint}.')
+                self.logger.info(message)
+                ping_task = (
+                    asyncio.create_task(self.__send_pings(websocket))
+                    if self.ping_message is not None else None
+                )
+                try:
+                    async for message in websocket:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        self.__update_prices(self._extract_prices_from_message(
+                            json.loads(message.data)))
+                finally:
+                    if ping_task is not None:
+                        ping_task.cancel()
+
+    def __write_prices(self, prices: Dict[str, float], full: bool) -> None:
+        """
+        Writes the prices with a parser. The parser created for the symbols
+        is used for the first write. A full write creates a new update, the
+        other writes reuse the update of the last full write.
+        """
+        close_old_connections()
+        if self.__next_parser is not None:
+            parser = self.__next_parser
+            self.__next_parser = None
+        else:
+            parser = self.parser(None if full else self.update)
+        self.update = parser.new_update
+        parser.prices = prices
+        parser.main()
+
+    async def __flush(self, full: bool) -> None:
+        """
+        Writes all prices, or only the changed ones, to the database.
+        """
+        if full:
+            prices = dict(self.prices)
+        else:
+            prices = {
+                symbol: self.prices[symbol] for symbol in self.changed_symbols
+            }
+        self.changed_symbols = set()
+        if not prices:
+            return
+        try:
+            await sync_to_async(self.__write_prices)(prices, full)
+        except Exception as error:
+            message = f'Failed to write the prices of the stream: {error}'
+            self.logger.error(message)
+
+    async def __flush_periodically(self) -> None:
+        """
+        Writes the changed prices every flush_interval and all prices every
+        full_flush_interval. The first full write happens as soon as there
+        are prices.
+        """
+        loop = asyncio.get_running_loop()
+        next_full_flush_time = loop.time()
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            full = bool(self.prices) and loop.time() >= next_full_flush_time
+            if full:
+                next_full_flush_time = loop.time() + self.full_flush_interval
+            await self.__flush(full)
+
+    async def run(self) -> None:
+        """
+        Runs the stream, reconnecting whenever it is closed or fails, until
+        it is cancelled.
+        """
+        flush_task = asyncio.create_task(self.__flush_periodically())
+        try:
+            while True:
+                try:
+                    await self.__consume()
+                    message = 'The stream was closed, reconnecting.'
+                    self.logger.warning(message)
+                except (aiohttp.ClientError, asyncio.TimeoutError,
+                        ValueError, KeyError) as error:
+                    message = f'The stream failed: {error}, reconnecting.'
+                    self.logger.error(message)
+                await asyncio.sleep(self.reconnect_delay)
+        finally:
+            flush_task.cancel()
+
+
+class FakePriceStreamServer:
+    """
+    A local WebSocket server that imitates the ticker stream of a crypto
+    exchange, so that a PriceStream can be run without the exchange. After a
+    subscribe message, it sends the prices of the subscribed symbols, which
+    change randomly, in the format of the price stream.
+
+    Attributes:
+        price_stream (Type[PriceStream]): The price stream whose format is
+            imitated.
+        interval (float): The interval in seconds between the messages of
+            each symbol.
+        change_probability (float): The probability that the price of a
+            symbol changes at each interval.
+        volatility (float): The maximum relative change of a price.
+        websockets (set): The open connections of the price streams.
+        connections (int): The number of connections accepted since the
+            start, so that the reconnections of a price stream can be
+            checked.
+    """
+    def __init__(self, price_stream: Type[PriceStream], interval: float = 0.5,
+                 change_probability: float = 0.5, volatility: float = 0.001
+                 ) -> None:
+        self.price_stream = price_stream
+        self.interval = interval
+        self.change_probability = change_probability
+        self.volatility = volatility
+        self.prices: Dict[str, float] = {}
+        self.websockets: Set[web.WebSocketResponse] = set()
+        self.connections = 0
+
+    def __get_next_price(self, symbol: str) -> float:
+        """
+        Returns the price of the symbol at the next interval.
+        """
+        if symbol not in self.prices:
+            self.prices[symbol] = random.uniform(0.5, 2)
+        elif random.random() < self.change_probability:
+            self.prices[symbol] *= 1 + random.uniform(-self.volatility,
+                                                      self.volatility)
+        return self.prices[symbol]
+
+    async def __send_prices(self, websocket: web.WebSocketResponse,
+                            symbols: Set[str]) -> None:
+        """
+        Sends the prices of the subscribed symbols every interval.
+        """
+        while not websocket.closed:
+            for symbol in tuple(symbols):
+                await websocket.send_json(
+                    self.price_stream._create_fake_message(
+                        symbol, self.__get_next_price(symbol)))
+            await asyncio.sleep(self.interval)
+
+    async def handle(self, request: web.Request) -> web.WebSocketResponse:
+        """
+        Handles a WebSocket connection of a price stream.
+        """
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(request)
+        self.websockets.add(websocket)
+        self.connections += 1
+        symbols = set()
+        send_task = asyncio.create_task(self.__send_prices(websocket, symbols))
+        extract_symbols = (
+            self.price_stream._extract_symbols_from_subscribe_message)
+        try:
+            async for message in websocket:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    symbols.update(extract_symbols(json.loads(message.data)))
+        finally:
+            send_task.cancel()
+            self.websockets.discard(websocket)
+        return websocket
+
+    async def close_connections(self) -> None:
+        """
+        Closes all open connections, as the exchange does when it drops a
+        stream.
+        """
+        for websocket in tuple(self.websockets):
+            await websocket.close()
+
+    def create_app(self) -> web.Application:
+        """
+        Creates the application that serves the stream at any path.
+        """
+        app = web.Application()
+        app.router.add_get('/{path:.*}', self.handle)
+        return app
+
+    def run(self, host: str = 'localhost', port: int = 8765) -> None:
+        """
+        Runs the server until it is interrupted.
+        """
+        web.run_app(self.create_app(), host=host, port=port)
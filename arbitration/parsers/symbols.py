@@ -0,0 +1,72 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+
+class SymbolTable:
+    """
+    Maps fiat and asset codes to small integers, so that the prices of a
+    crypto exchange can be stored in dense arrays and looked up by index
+    instead of by string keys. Codes that are not in the configuration, but
+    appear in the database, are added by a snapshot to its own frozen copy of
+    the table, so that the ids never exceed the size of its price tables.
+
+    Attributes:
+        codes (list): The codes in the order of their ids.
+        ids (dict): The ids keyed by code.
+        frozen (bool): If True, no codes are added on lookup.
+    """
+    def __init__(self, codes: Iterable[str], frozen: bool = False) -> None:
+        self.codes: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self.frozen = False
+        for code in codes:
+            self.get_id(code)
+        self.frozen = frozen
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def get_id(self, code: str) -> int:
+        """
+        Returns the id of the code, adding it to the table if needed. A
+        frozen table raises KeyError for an unknown code.
+        """
+        if code not in self.ids:
+            if self.frozen:
+                raise KeyError(f'{code} is not in the frozen symbol table.')
+            self.ids[code] = len(self.codes)
+            self.codes.append(code)
+        return self.ids[code]
+
+    def get_ids(self, codes: Iterable[str]) -> np.ndarray:
+        """
+        Returns the ids of the codes as an array for indexing price tables.
+        """
+        return np.fromiter(
+            (self.get_id(code) for code in codes), dtype=np.intp
+        )
+
+    def freeze(self, codes: Iterable[str]) -> 'SymbolTable':
+        """
+        Returns a frozen copy of the table with the given codes added. The
+        ids of the codes of the table are kept.
+        """
+        return SymbolTable((*self.codes, *codes), frozen=True)
+
+
+@lru_cache(maxsize=None)
+def get_symbol_table() -> SymbolTable:
+    """
+    Returns the frozen symbol table shared by the process, built from the
+    fiats of the banks and the assets and fiats traded on the crypto
+    exchanges.
+    """
+    from crypto_exchanges.crypto_exchanges_config import (
+        ALL_ASSETS, ALL_FIATS, CRYPTO_EXCHANGES_CONFIG)
+    crypto_fiats: Tuple[str] = tuple(
+        fiat for crypto_exchange_info in CRYPTO_EXCHANGES_CONFIG.values()
+        for fiat in crypto_exchange_info.get('crypto_fiats', ())
+    )
+    return SymbolTable(ALL_FIATS + ALL_ASSETS + crypto_fiats, frozen=True)
@@ -0,0 +1,100 @@
+import random
+from itertools import permutations, product
+from unittest import mock
+
+from django.test import TestCase
+
+from banks.banks_config import BANKS_CONFIG
+from banks.models import Banks, BanksExchangeRates, BanksExchangeRatesUpdates
+from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
+                                     CryptoExchangesRatesUpdates,
+                                     InterExchanges, IntraCryptoExchangesRates,
+                                     IntraCryptoExchangesRatesUpdates)
+from parsers.calculations import (ComplexInterExchangesCalculating,
+                                  InterExchangesCalculating,
+                                  SimplInterExchangesCalculating)
+from parsers.loggers import CalculatingLogger
+
+CRYPTO_EXCHANGE_NAME = 'Binance'
+INPUT_BANK_NAME = 'Tinkoff'
+BANK_NAMES = ('Tinkoff', 'Raiffeisen')
+ASSET_PRICES = {'USDT': 1, 'BTC': 30000, 'ETH': 2000}
+FIAT_PRICES = {'USD': 1, 'RUB': 80}
+
+
+@mock.patch.multiple(CalculatingLogger, loglevel_start='debug',
+                     loglevel_end='debug')
+class GraphEngineTests(TestCase):
+    """
+    Checks that the graph engine finds every chain of the loop engine with
+    the same margin percentage on the same rates.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        prices = random.Random(1)
+        crypto_exchange = CryptoExchanges.objects.create(
+            name=CRYPTO_EXCHANGE_NAME)
+        banks = {
+            name: Banks.objects.create(name=name) for name in BANKS_CONFIG
+        }
+        intra_update = IntraCryptoExchangesRatesUpdates.objects.create(
+            crypto_exchange=crypto_exchange)
+        for from_asset, to_asset in permutations(ASSET_PRICES, 2):
+            fair_price = ASSET_PRICES[from_asset] / ASSET_PRICES[to_asset]
+            IntraCryptoExchangesRates.objects.create(
+                crypto_exchange=crypto_exchange, from_asset=from_asset,
+                to_asset=to_asset, spot_fee=0, update=intra_update,
+                price=fair_price * prices.uniform(0.995, 1.005)
+            )
+        for bank_name in BANK_NAMES:
+            bank = banks[bank_name]
+            rates_update = CryptoExchangesRatesUpdates.objects.create(
+                crypto_exchange=crypto_exchange, bank=bank,
+                payment_channel='P2P'
+            )
+            for asset, fiat, trade_type in product(
+                    ASSET_PRICES, FIAT_PRICES, ('BUY', 'SELL')):
+                fair_price = ASSET_PRICES[asset] * FIAT_PRICES[fiat]
+                if trade_type == 'BUY':
+                    fair_price = 1 / fair_price
+                CryptoExchangesRates.objects.create(
+                    crypto_exchange=crypto_exchange, bank=bank, asset=asset,
+                    fiat=fiat, trade_type=trade_type, payment_channel='P2P',
+                    price=fair_price * prices.uniform(0.98, 1.02),
+                    update=rates_update
+                )
+            bank_update = BanksExchangeRatesUpdates.objects.create(bank=bank)
+            for from_fiat, to_fiat in permutations(FIAT_PRICES, 2):
+                fair_price = FIAT_PRICES[to_fiat] / FIAT_PRICES[from_fiat]
+                BanksExchangeRates.objects.create(
+                    bank=bank, from_fiat=from_fiat, to_fiat=to_fiat,
+                    price=fair_price * prices.uniform(0.98, 1.01),
+                    update=bank_update
+                )
+
+    @staticmethod
+    def __calculate(engine):
+        InterExchanges.objects.all().delete()
+        with mock.patch.multiple(InterExchangesCalculating, engine=engine,
+                                 best_chains=10 ** 6):
+            for calculating in (SimplInterExchangesCalculating,
+                                ComplexInterExchangesCalculating):
+                calculating(CRYPTO_EXCHANGE_NAME, INPUT_BANK_NAME, True).main()
+        return {
+            chain[:-1]: chain[-1]
+            for chain in InterExchanges.objects.values_list(
+                'input_bank', 'output_bank', 'input_crypto_exchange',
+                'interim_crypto_exchange', 'second_interim_crypto_exchange',
+                'output_crypto_exchange', 'bank_exchange',
+                'marginality_percentage'
+            )
+        }
+
+    def test_graph_engine_finds_the_chains_of_the_loop_engine(self):
+        loop_chains = self.__calculate('loop')
+        graph_chains = self.__calculate('graph')
+        self.assertTrue(loop_chains)
+        for chain, marginality_percentage in loop_chains.items():
+            self.assertIn(chain, graph_chains)
+            self.assertAlmostEqual(
+                graph_chains[chain], marginality_percentage)
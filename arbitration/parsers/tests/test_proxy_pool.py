@@ -0,0 +1,145 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase
+
+from parsers.connection_types.proxy import Proxy
+from parsers.connection_types.proxy_pool import ProxyPool
+
+
+class FakeUpstreamHandler(BaseHTTPRequestHandler):
+    """
+    Answers every GET request with 200 and the requested path.
+    """
+    def do_GET(self):  # noqa: N802
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeProxyHandler(BaseHTTPRequestHandler):
+    """
+    A forward HTTP proxy that passes the requests to the upstream, after the
+    delay of the server, or answers 502 if the server or the upstream is
+    down. The paths of the passed requests are recorded by the server.
+    """
+    def do_GET(self):  # noqa: N802
+        if self.server.down:
+            self.send_error(502)
+            return
+        time.sleep(self.server.delay)
+        try:
+            response = requests.get(self.path, timeout=5)
+        except requests.RequestException:
+            self.send_error(502)
+            return
+        self.server.requests.append(self.path)
+        self.send_response(response.status_code)
+        self.send_header('Content-Length', str(len(response.content)))
+        self.end_headers()
+        self.wfile.write(response.content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(handler, **attributes):
+    """
+    Starts an HTTP server on a free local port in a daemon thread and
+    returns it with its URL.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    for name, value in attributes.items():
+        setattr(server, name, value)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_port}'
+
+
+class ProxyPoolTests(SimpleTestCase):
+    """
+    Checks the proxy pool against local fake proxies that forward the
+    requests to a fake upstream.
+    """
+    def setUp(self):
+        self.servers = []
+        self.upstream_url = self.__start(FakeUpstreamHandler)
+
+    def tearDown(self):
+        for server in self.servers:
+            server.shutdown()
+            server.server_close()
+
+    def __start(self, handler, **attributes):
+        server, url = start_server(handler, **attributes)
+        self.servers.append(server)
+        return url
+
+    def __start_proxy(self, delay=0.0, down=False):
+        url = self.__start(
+            FakeProxyHandler, delay=delay, down=down, requests=[])
+        return self.servers[-1], url
+
+    def __create_pool(self, candidates):
+        pool = ProxyPool()
+        pool.candidates = candidates
+        pool.probe_url = f'{self.upstream_url}/probe'
+        pool.probe_timeout = 2
+        pool.refresh_interval = 60
+        return pool
+
+    def test_refresh_ranks_live_proxies_by_latency(self):
+        _, fast_url = self.__start_proxy()
+        _, slow_url = self.__start_proxy(delay=0.3)
+        _, down_url = self.__start_proxy(down=True)
+        pool = self.__create_pool([slow_url, down_url, fast_url])
+        pool.refresh()
+        self.assertEqual(pool.ranking, [fast_url, slow_url])
+        self.assertEqual(pool.get(), fast_url)
+        self.assertEqual(pool.get(exclude=fast_url), slow_url)
+
+    def test_proxy_is_evicted_after_max_failures(self):
+        _, proxy_url = self.__start_proxy()
+        pool = self.__create_pool([proxy_url])
+        pool.refresh()
+        for _ in range(pool.max_failures - 1):
+            pool.report_failure(proxy_url)
+        self.assertEqual(pool.ranking, [proxy_url])
+        pool.report_failure(proxy_url)
+        self.assertEqual(pool.ranking, [])
+
+    def test_get_does_not_wait_for_the_first_refresh(self):
+        _, proxy_url = self.__start_proxy(delay=1)
+        pool = self.__create_pool([proxy_url])
+        start_time = time.monotonic()
+        with self.assertRaises(RuntimeError):
+            pool.get()
+        self.assertLess(time.monotonic() - start_time, 0.5)
+        deadline = time.monotonic() + 5
+        while not pool.ranking and time.monotonic() < deadline:
+            time.sleep(0.1)
+        self.assertEqual(pool.get(), proxy_url)
+
+    def test_proxy_connection_sends_requests_through_the_pool(self):
+        first_server, first_url = self.__start_proxy()
+        second_server, second_url = self.__start_proxy(delay=0.3)
+        pool = self.__create_pool([first_url, second_url])
+        pool.refresh()
+        with mock.patch('parsers.connection_types.proxy.get_proxy_pool',
+                        return_value=pool):
+            connection = Proxy()
+        response = connection.session.get(f'{self.upstream_url}/api')
+        self.assertEqual(response.text, '/api')
+        self.assertIn(f'{self.upstream_url}/api', first_server.requests)
+        connection.renew_connection()
+        self.assertEqual(connection.proxy_url, second_url)
+        connection.session.get(f'{self.upstream_url}/retry')
+        self.assertIn(f'{self.upstream_url}/retry', second_server.requests)
@@ -0,0 +1,85 @@
+import asyncio
+from unittest import mock
+
+from aiohttp.test_utils import TestServer
+from django.test import TransactionTestCase
+
+from crypto_exchanges.crypto_exchanges_registration.binance import (
+    BinancePriceStream)
+from crypto_exchanges.models import (CryptoExchanges,
+                                     IntraCryptoExchangesRates,
+                                     IntraCryptoExchangesRatesUpdates)
+from parsers.loggers import ParsingLogger
+from parsers.streams import FakePriceStreamServer
+
+
+class FastPriceStream(BinancePriceStream):
+    flush_interval = 0.1
+    full_flush_interval = 0.5
+    reconnect_delay = 0.1
+
+
+@mock.patch.multiple(ParsingLogger, loglevel_start='debug',
+                     loglevel_end='debug')
+class PriceStreamTests(TransactionTestCase):
+    """
+    Runs a price stream against a FakePriceStreamServer in the event loop of
+    the test and checks the rates it writes.
+    """
+    def setUp(self):
+        CryptoExchanges.objects.create(
+            name=FastPriceStream.parser.crypto_exchange_name)
+        self.server = FakePriceStreamServer(FastPriceStream, interval=0.05)
+        self.stream = FastPriceStream('')
+
+    async def __run_stream(self, duration, during=None):
+        """
+        Runs the stream for the duration in seconds and calls during, if
+        given, halfway through.
+        """
+        server = TestServer(self.server.create_app())
+        await server.start_server()
+        self.stream.endpoint = str(server.make_url('/stream'))
+        task = asyncio.create_task(self.stream.run())
+        try:
+            await asyncio.sleep(duration / 2)
+            if during is not None:
+                await during()
+            await asyncio.sleep(duration / 2)
+            self.server.change_probability = 0
+            await asyncio.sleep(self.stream.flush_interval * 3)
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await server.close()
+
+    def __assert_rates_match_prices(self):
+        parser = self.stream.parser()
+        for params in parser._generate_unique_params():
+            price = self.stream.prices.get(params[parser.name_from])
+            if price is None:
+                continue
+            for values in parser._calculates_buy_and_sell_from_price(
+                    params, price):
+                rate = IntraCryptoExchangesRates.objects.get(
+                    from_asset=values['from_asset'],
+                    to_asset=values['to_asset']
+                )
+                self.assertAlmostEqual(rate.price, values['price'])
+
+    def test_flushes_reuse_the_update_of_the_full_flush(self):
+        duration = 1.2
+        asyncio.run(self.__run_stream(duration))
+        self.assertTrue(self.stream.prices)
+        updates = IntraCryptoExchangesRatesUpdates.objects.count()
+        full_flushes = duration // self.stream.full_flush_interval + 2
+        self.assertLessEqual(updates, full_flushes)
+        self.assertLess(
+            updates, duration // self.stream.flush_interval)
+        self.__assert_rates_match_prices()
+
+    def test_reconnects_after_the_stream_is_closed(self):
+        asyncio.run(self.__run_stream(
+            1.2, during=self.server.close_connections))
+        self.assertGreaterEqual(self.server.connections, 2)
+        self.__assert_rates_match_prices()
@@ -0,0 +1,207 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from django.db import connection
+
+from arbitration.settings import INTER_EXCHANGES_BEGIN_OBSOLETE_MINUTES
+from banks.models import Banks, BanksExchangeRates
+from crypto_exchanges.models import (CryptoExchanges, CryptoExchangesRates,
+                                     InterExchanges, InterExchangesUpdates,
+                                     IntraCryptoExchangesRates)
+
+
+class InterExchangesWriter:
+    """
+    Collects the calculated chains of one input bank on one crypto exchange
+    and writes them to the database in batches. The stored chains are loaded
+    in a single query at the start, so that the dynamics and the novelty of
+    each chain are calculated in memory, and new and changed chains are then
+    flushed with INSERT ... ON CONFLICT DO UPDATE.
+
+    Attributes:
+        model: A Django model of the chains.
+        unique_fields (tuple): The fields of the unique_inter_exchanges
+            constraint.
+        key_fields (tuple): The columns of the unique_inter_exchanges
+            constraint.
+        updated_fields (tuple): The fields overwritten in the stored chains.
+        batch_size (int): The number of chains written in one statement.
+    """
+    model = InterExchanges
+    unique_fields: Tuple[str] = (
+        'crypto_exchange', 'input_bank', 'output_bank',
+        'input_crypto_exchange', 'interim_crypto_exchange',
+        'second_interim_crypto_exchange', 'output_crypto_exchange',
+        'bank_exchange'
+    )
+    key_fields: Tuple[str] = (
+        'crypto_exchange_id', 'input_bank_id', 'output_bank_id',
+        'input_crypto_exchange_id', 'interim_crypto_exchange_id',
+        'second_interim_crypto_exchange_id', 'output_crypto_exchange_id',
+        'bank_exchange_id'
+    )
+    updated_fields: Tuple[str] = (
+        'marginality_percentage', 'dynamics', 'new', 'update'
+    )
+    batch_size: int = 1000
+
+    def __init__(self, crypto_exchange: CryptoExchanges, input_bank: Banks,
+                 new_update: InterExchangesUpdates, start_time: datetime
+                 ) -> None:
+        self.crypto_exchange = crypto_exchange
+        self.input_bank = input_bank
+        self.new_update = new_update
+        self.relevance_time = start_time - timedelta(
+            minutes=INTER_EXCHANGES_BEGIN_OBSOLETE_MINUTES)
+        self.stored_inter_exchanges: Dict[tuple, tuple] = {}
+        self.records_to_write: Dict[tuple, InterExchanges] = {}
+        self.created_objects = 0
+        self.updated_objects = 0
+        self.__load_stored_inter_exchanges()
+
+    def __load_stored_inter_exchanges(self) -> None:
+        """
+        Loads the id, the margin percentage and the update time of all stored
+        chains of the input bank in a single query, keyed by the fields of the
+        unique constraint.
+        """
+        stored_inter_exchanges = self.model.objects.filter(
+            crypto_exchange=self.crypto_exchange, input_bank=self.input_bank
+        ).values_list(
+            *self.key_fields, 'id', 'marginality_percentage', 'update__updated'
+        )
+        for *key, inter_exchange_id, marginality_percentage, updated in (
+                stored_inter_exchanges
+        ):
+            self.stored_inter_exchanges[tuple(key)] = (
+                inter_exchange_id, marginality_percentage, updated
+            )
+
+    def add(self, output_bank: Banks,
+            input_crypto_exchange: CryptoExchangesRates,
+            interim_exchange: Optional[IntraCryptoExchangesRates],
+            interim_second_exchange: Optional[IntraCryptoExchangesRates],
+            output_crypto_exchange: CryptoExchangesRates,
+            bank_exchange: Optional[BanksExchangeRates],
+            marginality_percentage: float, diagram: str) -> None:
+        """
+        Adds a chain to be written.
+        """
+        key = (
+            self.crypto_exchange.id, self.input_bank.id, output_bank.id,
+            input_crypto_exchange.id,
+            None if interim_exchange is None else interim_exchange.id,
+            None if interim_second_exchange is None
+            else interim_second_exchange.id,
+            output_crypto_exchange.id,
+            None if bank_exchange is None else bank_exchange.id
+        )
+        self.add_by_key(key, marginality_percentage, diagram)
+
+    def add_by_key(self, key: tuple, marginality_percentage: float,
+                   diagram: str) -> None:
+        """
+        Adds a chain given by the values of the unique constraint to be
+        written. The dynamics and the novelty are taken from the stored chain
+        with the same key, if there is one.
+        """
+        record = self.model(
+            **dict(zip(self.key_fields, key)),
+            marginality_percentage=marginality_percentage, diagram=diagram,
+            dynamics=None, new=True, update=self.new_update
+        )
+        stored_inter_exchange = self.stored_inter_exchanges.get(key)
+        if stored_inter_exchange is not None:
+            inter_exchange_id, stored_percentage, updated = (
+                stored_inter_exchange)
+            record.id = inter_exchange_id
+            if stored_percentage > marginality_percentage:
+                record.dynamics = 'fall'
+            elif stored_percentage < marginality_percentage:
+                record.dynamics = 'rise'
+            record.new = updated < self.relevance_time
+        self.records_to_write[key] = record
+        if len(self.records_to_write) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the collected chains. New chains are inserted and stored ones
+        are updated in the same statement. The conflict target is the unique
+        constraint, so that a chain stored since the stored chains were loaded
+        is updated instead of failing the statement. The nullable columns of
+        the constraint are never equal to each other in a unique index, so
+        the stored chains with a null value in it are upserted by the primary
+        key instead. If the database does not support conflict targets, new
+        chains are inserted and stored ones are updated with two separate
+        statements.
+        """
+        if not self.records_to_write:
+            return
+        records = self.records_to_write.values()
+        records_to_create = [record for record in records if record.id is None]
+        records_to_update = [
+            record for record in records if record.id is not None
+        ]
+        if connection.features.supports_update_conflicts_with_target:
+            records_by_constraint = list(records_to_create)
+            records_by_id = []
+            for record in records_to_update:
+                if any(getattr(record, field) is None
+                       for field in self.key_fields):
+                    records_by_id.append(record)
+                else:
+                    records_by_constraint.append(record)
+            for records, unique_fields in (
+                    (records_by_constraint, self.unique_fields),
+                    (records_by_id, ['id'])
+            ):
+                self.model.objects.bulk_create(
+                    records, update_conflicts=True,
+                    unique_fields=unique_fields,
+                    update_fields=self.updated_fields
+                )
+        else:
+            self.model.objects.bulk_create(records_to_create)
+            self.model.objects.bulk_update(
+                records_to_update, self.updated_fields
+            )
+        for key, record in self.records_to_write.items():
+            if record.id is not None:
+                self.stored_inter_exchanges[key] = (
+                    record.id, record.marginality_percentage,
+                    self.new_update.updated
+                )
+        self.created_objects += len(records_to_create)
+        self.updated_objects += len(records_to_update)
+        self.records_to_write = {}
+
+
+class InterExchangesCollector(InterExchangesWriter):
+    """
+    Collects the calculated chains in a worker process instead of writing
+    them, so that they can be returned to the parent process and written
+    there by an InterExchangesWriter.
+
+    Attributes:
+        chains (list): The keys of the collected chains with their margin
+            percentages and diagrams.
+    """
+    def __init__(self, crypto_exchange: CryptoExchanges, input_bank: Banks
+                 ) -> None:
+        self.crypto_exchange = crypto_exchange
+        self.input_bank = input_bank
+        self.chains = []
+
+    def add_by_key(self, key: tuple, marginality_percentage: float,
+                   diagram: str) -> None:
+        """
+        Collects a chain given by the values of the unique constraint.
+        """
+        self.chains.append((key, marginality_percentage, diagram))
+
+    def flush(self) -> None:
+        """
+        There is nothing to write in a worker process.
+        """
+        pass